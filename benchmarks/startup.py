@@ -0,0 +1,129 @@
+"""
+Measures how long `python -m pyro` takes to start for commands that do not need the build pipeline
+
+Each scenario is timed over several runs in a fresh interpreter. The budget applies to the median time spent
+beyond starting a bare interpreter, so results are comparable across machines. Scenarios also fail when
+modules reserved for later phases are imported.
+
+Usage: python benchmarks/startup.py [--runs N] [--budget-scale X]
+"""
+import argparse
+import os
+import statistics
+import struct
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    arguments: tuple
+    budget_ms: float
+    deferred_modules: tuple
+
+
+# modules that only the build phases need
+BUILD_MODULES: tuple = ('pyro.BuildFacade', 'pyro.PackageManager', 'pyro.Anonymizer',
+                        'multiprocessing', 'psutil', 'urllib.request', 'zipfile')
+
+# modules that only project resolution and the build phases need
+PROJECT_MODULES: tuple = ('pyro.PapyrusProject', 'lxml', 'wcmatch')
+
+
+class Application:
+    def __init__(self, args: argparse.Namespace) -> None:
+        self.root_path: str = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        self.runs: int = max(1, args.runs)
+        self.budget_scale: float = args.budget_scale
+
+    @staticmethod
+    def _write_pex(path: str) -> None:
+        def pex_str(value: str) -> bytes:
+            data = value.encode('ascii')
+            return struct.pack('<H', len(data)) + data
+
+        with open(path, mode='wb') as f:
+            f.write(struct.pack('<IBBHQ', 0xFA57C0DE, 3, 9, 2, int(time.time())))
+            f.write(pex_str('Benchmark.psc'))
+            f.write(pex_str('user'))
+            f.write(pex_str('machine'))
+
+    @staticmethod
+    def _write_ppj(path: str) -> None:
+        with open(path, mode='w', encoding='utf-8') as f:
+            f.write('<PapyrusProject xmlns="PapyrusProject.xsd" Game="fo4" Output="out" '
+                    'Flags="Institute_Papyrus_Flags.flg"/>\n')
+
+    def _run(self, arguments: tuple, *, import_time: bool = False) -> tuple:
+        """Returns (elapsed seconds, stderr) for one run in a fresh interpreter"""
+        command = [sys.executable, *(('-X', 'importtime') if import_time else ()), *arguments]
+
+        start = time.perf_counter()
+        process = subprocess.run(command, cwd=self.root_path,
+                                 stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, encoding='utf-8')
+        elapsed = time.perf_counter() - start
+
+        return elapsed, process.stderr
+
+    def _median_ms(self, arguments: tuple) -> float:
+        # the first run warms the file system cache and writes any project cache entries
+        self._run(arguments)
+        return statistics.median(self._run(arguments)[0] for _ in range(self.runs)) * 1000
+
+    def _imported_modules(self, arguments: tuple) -> set:
+        _, stderr = self._run(arguments, import_time=True)
+        lines = (line.rsplit('|', 1)[-1].strip() for line in stderr.splitlines() if line.startswith('import time:'))
+        return {line for line in lines if line and line != 'package'}
+
+    def run(self) -> int:
+        with tempfile.TemporaryDirectory() as temp_path:
+            pex_path = os.path.join(temp_path, 'Benchmark.pex')
+            ppj_path = os.path.join(temp_path, 'Benchmark.ppj')
+            cache_path = os.path.join(temp_path, 'cache')
+
+            self._write_pex(pex_path)
+            self._write_ppj(ppj_path)
+
+            scenarios = (
+                Scenario('help', ('-m', 'pyro', '--help'), 100, BUILD_MODULES + PROJECT_MODULES),
+                Scenario('pex dump', ('-m', 'pyro', pex_path), 100, BUILD_MODULES + PROJECT_MODULES),
+                Scenario('resolve project', ('-m', 'pyro', ppj_path, '--resolve-project', '--cache-path', cache_path),
+                         300, BUILD_MODULES),
+            )
+
+            baseline_ms = self._median_ms(('-c', 'pass'))
+            print(f'{"interpreter":<16} {baseline_ms:8.1f} ms')
+
+            failed = 0
+
+            for scenario in scenarios:
+                overhead_ms = self._median_ms(scenario.arguments) - baseline_ms
+                budget_ms = scenario.budget_ms * self.budget_scale
+
+                imported = self._imported_modules(scenario.arguments)
+                loaded = sorted(name for name in scenario.deferred_modules
+                                if any(module == name or module.startswith(f'{name}.') for module in imported))
+
+                status = 'ok' if overhead_ms <= budget_ms and not loaded else 'FAIL'
+                print(f'{scenario.name:<16} {overhead_ms:+8.1f} ms (budget {budget_ms:.0f} ms) {status}')
+
+                if loaded:
+                    print(f'{"":<16} imported deferred modules: {", ".join(loaded)}')
+
+                if status != 'ok':
+                    failed += 1
+
+        return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    _parser = argparse.ArgumentParser(description='Startup time benchmark for Pyro')
+    _parser.add_argument('--runs', action='store', type=int, default=10,
+                         help='number of timed runs per scenario')
+    _parser.add_argument('--budget-scale', action='store', type=float, default=1.0,
+                         help='multiply budgets by this factor (e.g., for slow machines)')
+    sys.exit(Application(_parser.parse_args()).run())
@@ -8,6 +8,7 @@ import sys
 import zipfile
 
 from pyro.Comparators import endswith
+from pyro.Constants import ProgramInfo
 
 
 class Application:
@@ -33,7 +34,7 @@ class Application:
 
         self.icon_path: str = os.path.join(self.root_path, 'fire.ico')
 
-        pyro_version: str = '1.0.0.0'
+        pyro_version: str = ProgramInfo.VERSION
 
         self.nuitka_args: list = [
             'python', '-m', 'nuitka',
@@ -2,8 +2,8 @@ import logging
 import os
 import random
 import string
-import sys
 
+from pyro.Exceptions import AnonymizeError
 from pyro.PexHeader import PexHeader
 from pyro.PexReader import PexReader
 
@@ -26,8 +26,7 @@ class Anonymizer:
         try:
             header: PexHeader = PexReader.get_header(path)
         except ValueError:
-            Anonymizer.log.error(f'Cannot anonymize script due to unknown file magic: "{path}"')
-            sys.exit(1)
+            raise AnonymizeError(f'Cannot anonymize script due to unknown file magic: "{path}"')
 
         file_path: str = header.script_path.value
         user_name: str = header.user_name.value
@@ -38,20 +37,16 @@ class Anonymizer:
             return
 
         if not endswith(file_path, '.psc', ignorecase=True):
-            Anonymizer.log.error(f'Cannot anonymize script due to invalid file extension: "{path}"')
-            sys.exit(1)
+            raise AnonymizeError(f'Cannot anonymize script due to invalid file extension: "{path}"')
 
         if not len(file_path) > 0:
-            Anonymizer.log.error(f'Cannot anonymize script due to zero-length file path: "{path}"')
-            sys.exit(1)
+            raise AnonymizeError(f'Cannot anonymize script due to zero-length file path: "{path}"')
 
         if not len(user_name) > 0:
-            Anonymizer.log.error(f'Cannot anonymize script due to zero-length user name: "{path}"')
-            sys.exit(1)
+            raise AnonymizeError(f'Cannot anonymize script due to zero-length user name: "{path}"')
 
         if not len(computer_name) > 0:
-            Anonymizer.log.error(f'Cannot anonymize script due to zero-length computer name: "{path}"')
-            sys.exit(1)
+            raise AnonymizeError(f'Cannot anonymize script due to zero-length computer name: "{path}"')
 
         with open(path, mode='r+b') as f:
             f.seek(header.script_path.offset, os.SEEK_SET)
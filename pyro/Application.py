@@ -1,24 +1,15 @@
 import argparse
+import glob
+import json
 import logging
 import os
 import sys
 
-from pyro.Enums.Event import (BuildEvent,
-                              ImportEvent,
-                              CompileEvent,
-                              AnonymizeEvent,
-                              PackageEvent,
-                              ZipEvent)
-from pyro.BuildFacade import BuildFacade
-from pyro.Comparators import startswith
-from pyro.PapyrusProject import PapyrusProject
-from pyro.PathHelper import PathHelper
-from pyro.PexReader import PexReader
-from pyro.ProjectOptions import ProjectOptions
+from pyro.Comparators import (endswith,
+                              startswith)
 
 
 class Application:
-    logging.basicConfig(stream=sys.stdout, level=logging.DEBUG, format='%(asctime)s [%(levelname).4s] %(message)s')
     log = logging.getLogger('pyro')
 
     args: argparse.Namespace
@@ -28,6 +19,15 @@ class Application:
 
         self.args = self.parser.parse_args()
 
+        input_path = self.args.input_path or self.args.input_path_deprecated
+
+        # pex batches and package listings write records to stdout, so log messages must not be mixed in
+        self.is_pex_batch: bool = bool(input_path) and self._is_pex_batch(input_path)
+        self.is_package: bool = bool(input_path) and endswith(input_path, ('.bsa', '.ba2'), ignorecase=True)
+
+        logging.basicConfig(stream=sys.stderr if self.is_pex_batch or self.is_package else sys.stdout,
+                            level=logging.DEBUG, format='%(asctime)s [%(levelname).4s] %(message)s')
+
         if self.args.show_help:
             self.parser.print_help()
             sys.exit(1)
@@ -41,10 +41,17 @@ class Application:
 
         self.args.input_path = self._try_fix_input_path(self.args.input_path or self.args.input_path_deprecated)
 
-        if not self.args.create_project and not os.path.isfile(self.args.input_path):
+        if not self.args.create_project and not self.is_pex_batch and not os.path.isfile(self.args.input_path):
             Application.log.error(f'Cannot load nonexistent PPJ at given path: "{self.args.input_path}"')
             sys.exit(1)
 
+    @staticmethod
+    def _is_pex_batch(input_path: str) -> bool:
+        """Returns True if input path is a folder or glob pattern rather than a single file"""
+        if os.path.isfile(input_path):
+            return False
+        return os.path.isdir(input_path) or glob.has_magic(input_path)
+
     @staticmethod
     def _try_fix_input_path(input_path: str) -> str:
         if not input_path:
@@ -52,6 +59,7 @@ class Application:
             sys.exit(1)
 
         if startswith(input_path, 'file:', ignorecase=True):
+            from pyro.PathHelper import PathHelper
             full_path = PathHelper.url2pathname(input_path)
             input_path = os.path.normpath(full_path)
 
@@ -65,162 +73,101 @@ class Application:
 
         return input_path
 
-    @staticmethod
-    def _validate_project_file(ppj: PapyrusProject) -> None:
-        if ppj.imports_node is None and \
-                (ppj.scripts_node is not None or ppj.folders_node is not None):
-            Application.log.error('Cannot proceed without imports defined in project')
-            sys.exit(1)
-
-        if ppj.options.package and ppj.packages_node is None:
-            Application.log.error('Cannot proceed with Package enabled without Packages defined in project')
-            sys.exit(1)
-
-        if ppj.options.zip and ppj.zip_files_node is None:
-            Application.log.error('Cannot proceed with Zip enabled without ZipFile defined in project')
-            sys.exit(1)
-
-    @staticmethod
-    def _validate_project_paths(ppj: PapyrusProject) -> None:
-        compiler_path = ppj.get_compiler_path()
-        if not compiler_path or not os.path.isfile(compiler_path):
-            Application.log.error('Cannot proceed without compiler path')
-            sys.exit(1)
-
-        flags_path = ppj.get_flags_path()
-        if not flags_path:
-            Application.log.error('Cannot proceed without flags path')
-            sys.exit(1)
-
-        if not ppj.options.game_type:
-            Application.log.error('Cannot determine game type from arguments or Papyrus Project')
-            sys.exit(1)
-
-        if not os.path.isabs(flags_path) and \
-                not any([os.path.isfile(os.path.join(import_path, flags_path)) for import_path in ppj.import_paths]):
-            Application.log.error('Cannot proceed without flags file in any import folder')
-            sys.exit(1)
-
-    def run(self) -> int:
-        """
-        Entry point
+    def _dump_pex_batch(self) -> int:
         """
-        _, extension = os.path.splitext(os.path.basename(self.args.input_path).casefold())
+        Writes one compact JSON record per pex file in folder or matching glob pattern to stdout
 
-        if extension == '.pex':
-            header = PexReader.dump(self.args.input_path)
-            Application.log.info(f'Dumping: "{self.args.input_path}"\n{header}')
-            sys.exit(0)
-        elif extension not in ('.ppj', '.pyroproject'):
-            Application.log.error('Cannot proceed without PPJ file path')
-            sys.exit(1)
-
-        options = ProjectOptions(self.args.__dict__)
-        ppj = PapyrusProject(options)
-
-        self._validate_project_file(ppj)
-
-        if ppj.scripts_node is not None or ppj.folders_node is not None or ppj.remote_paths:
-            ppj.try_initialize_remotes()
-
-            if ppj.use_pre_import_event:
-                ppj.try_run_event(ImportEvent.PRE)
-
-            ppj.try_populate_imports()
-
-            if ppj.use_post_import_event:
-                ppj.try_run_event(ImportEvent.POST)
-
-            ppj.try_set_game_type()
-            ppj.find_missing_scripts()
-            ppj.try_set_game_path()
+        Returns the number of files that could not be read.
+        """
+        from pyro.PexReader import PexReader
 
-            self._validate_project_paths(ppj)
+        if self.args.no_parallel:
+            worker_limit = 1
+        else:
+            worker_limit = self.args.worker_limit or os.cpu_count() or 2
 
-            Application.log.info('Imports found:')
-            for path in ppj.import_paths:
-                Application.log.info(f'+ "{path}"')
+        Application.log.info(f'Dumping pex files in: "{self.args.input_path}"')
 
-            Application.log.info('Scripts found:')
-            for _, path in ppj.psc_paths.items():
-                Application.log.info(f'+ "{path}"')
+        file_count, failed_count = 0, 0
 
-        build = BuildFacade(ppj)
+        pex_paths = PexReader.find_pex_paths(self.args.input_path)
 
-        # bsarch path is not set until BuildFacade initializes
-        if ppj.options.package and not os.path.isfile(ppj.options.bsarch_path):
-            Application.log.error('Cannot proceed with Package enabled without valid BSArch path')
-            sys.exit(1)
+        for record in PexReader.iter_records(pex_paths, worker_limit):
+            file_count += 1
+            if 'error' in record:
+                failed_count += 1
+            sys.stdout.write(json.dumps(record, separators=(',', ':')) + '\n')
 
-        if ppj.use_pre_build_event:
-            ppj.try_run_event(BuildEvent.PRE)
+        sys.stdout.flush()
 
-        if build.scripts_count > 0:
-            if ppj.use_pre_compile_event:
-                ppj.try_run_event(CompileEvent.PRE)
+        Application.log.info(f'Dumped {file_count - failed_count} pex files ({failed_count} failed)')
 
-            build.try_compile()
+        return failed_count
 
-            if ppj.use_post_compile_event:
-                ppj.try_run_event(CompileEvent.POST)
+    def _dump_package(self) -> int:
+        """
+        Writes one compact JSON record per file in package to stdout
 
-            if ppj.options.anonymize:
-                if build.get_compile_data().failed_count == 0 or ppj.options.ignore_errors:
-                    if ppj.use_pre_anonymize_event:
-                        ppj.try_run_event(AnonymizeEvent.PRE)
+        Returns 1 if the package cannot be read, otherwise 0.
+        """
+        from pyro.Archives.ArchiveReader import ArchiveReader
+        from pyro.Exceptions import PackageError
 
-                    build.try_anonymize()
+        try:
+            with ArchiveReader(self.args.input_path) as archive:
+                for record in sorted(archive.records, key=lambda r: r.path.casefold()):
+                    sys.stdout.write(json.dumps(record.to_dict(), separators=(',', ':')) + '\n')
 
-                    if ppj.use_post_anonymize_event:
-                        ppj.try_run_event(AnonymizeEvent.POST)
-                else:
-                    Application.log.error(f'Cannot anonymize scripts because {build.get_compile_data().failed_count} scripts failed to compile')
-                    sys.exit(build.get_compile_data().failed_count)
-            else:
-                Application.log.info('Cannot anonymize scripts because Anonymize is disabled in project')
+                archive_flags = f' (archive flags: 0x{archive.archive_flags:x})' if archive.format == 'bsa' else ''
+                Application.log.info(f'Dumped {len(archive.records)} files from {archive.format.upper()} '
+                                     f'version {archive.version}{archive_flags}')
+        except PackageError as e:
+            Application.log.error(e)
+            return 1
 
-        if ppj.options.package:
-            if build.get_compile_data().failed_count == 0 or ppj.options.ignore_errors:
-                if ppj.use_pre_package_event:
-                    ppj.try_run_event(PackageEvent.PRE)
+        sys.stdout.flush()
 
-                build.try_pack()
+        return 0
 
-                if ppj.use_post_package_event:
-                    ppj.try_run_event(PackageEvent.POST)
-            else:
-                Application.log.error(f'Cannot create Packages because {build.get_compile_data().failed_count} scripts failed to compile')
-                sys.exit(build.get_compile_data().failed_count)
-        elif ppj.packages_node is not None:
-            Application.log.info('Cannot create Packages because Package is disabled in project')
+    def run(self) -> int:
+        """
+        Entry point
+        """
+        if self.is_pex_batch:
+            sys.exit(1 if self._dump_pex_batch() > 0 else 0)
 
-        if ppj.options.zip:
-            if build.get_compile_data().failed_count == 0 or ppj.options.ignore_errors:
-                if ppj.use_pre_zip_event:
-                    ppj.try_run_event(ZipEvent.PRE)
+        _, extension = os.path.splitext(os.path.basename(self.args.input_path).casefold())
 
-                build.try_zip()
+        # modules for later phases are imported when those phases run, so that pex dumps and help start quickly
+        if extension in ('.bsa', '.ba2'):
+            sys.exit(self._dump_package())
+        elif extension == '.pex':
+            from pyro.PexReader import PexReader
+            header = PexReader.dump(self.args.input_path)
+            Application.log.info(f'Dumping: "{self.args.input_path}"\n{header}')
+            sys.exit(0)
+        elif extension not in ('.ppj', '.pyroproject'):
+            Application.log.error('Cannot proceed without PPJ file path')
+            sys.exit(1)
 
-                if ppj.use_post_zip_event:
-                    ppj.try_run_event(ZipEvent.POST)
-            else:
-                Application.log.error(f'Cannot create ZipFile because {build.get_compile_data().failed_count} scripts failed to compile')
-                sys.exit(build.get_compile_data().failed_count)
-        elif ppj.zip_files_node is not None:
-            Application.log.info('Cannot create ZipFile because Zip is disabled in project')
+        from pyro.Exceptions import PyroError
+        from pyro.ProjectOptions import ProjectOptions
 
-        if build.scripts_count > 0:
-            Application.log.info(build.get_compile_data().to_string() if build.get_compile_data().success_count > 0 else 'No scripts were compiled.')
+        options = ProjectOptions(self.args.__dict__)
 
-        if ppj.packages_node is not None:
-            Application.log.info(build.package_data.to_string() if build.package_data.file_count > 0 else 'No files were packaged.')
+        try:
+            if options.resolve_project:
+                from pyro.PapyrusProject import PapyrusProject
 
-        if ppj.zip_files_node is not None:
-            Application.log.info(build.zipping_data.to_string() if build.zipping_data.file_count > 0 else 'No files were zipped.')
+                ppj = PapyrusProject(options)
+                Application.log.debug(f'Resolved PPJ. Text output:{os.linesep * 2}{ppj.get_resolved_text()}')
+                sys.exit(1)
 
-        Application.log.info('DONE!')
+            from pyro.ProjectBuilder import ProjectBuilder
 
-        if ppj.use_post_build_event and build.get_compile_data().failed_count == 0:
-            ppj.try_run_event(BuildEvent.POST)
+            result = ProjectBuilder(options).build()
+        except PyroError as e:
+            Application.log.error(e)
+            sys.exit(e.exit_code)
 
-        return build.get_compile_data().failed_count
+        return result.failed_count
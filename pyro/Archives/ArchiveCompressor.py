@@ -0,0 +1,121 @@
+import importlib.util
+import time
+import typing
+import zlib
+
+from pyro.Exceptions import PackageError
+
+if typing.TYPE_CHECKING:
+    import multiprocessing.pool
+
+
+class ArchiveCompressor:
+    """
+    Compresses blocks of file data for archive writers, in parallel when the worker limit is greater than 1
+
+    Blocks are read and compressed in batches bounded by size, so memory use does not grow with package size.
+    Results are always yielded in input order, so packages are byte-identical regardless of worker count.
+
+    Usage: for tag, data, packed_data, seconds in ArchiveCompressor('zlib', worker_limit=8).imap(blocks): ...
+    """
+    ZLIB: str = 'zlib'
+    LZ4_FRAME: str = 'lz4_frame'
+    LZ4_BLOCK: str = 'lz4_block'
+
+    # raw bytes read ahead per worker before a batch is submitted
+    BATCH_SIZE_PER_WORKER: int = 16 * 1024 * 1024
+
+    # below this size, starting worker processes costs more than compressing in process
+    MIN_PARALLEL_SIZE: int = 4 * 1024 * 1024
+
+    def __init__(self, method: str, *, worker_limit: int = 1) -> None:
+        self.method: str = method
+        self.worker_limit: int = max(1, worker_limit)
+
+        if method in (ArchiveCompressor.LZ4_FRAME, ArchiveCompressor.LZ4_BLOCK):
+            if importlib.util.find_spec('lz4') is None:
+                raise PackageError('Cannot create LZ4 compressed package without the lz4 module')
+
+    @staticmethod
+    def compress(method: str, data: bytes) -> bytes:
+        """Returns data compressed with method"""
+        if method == ArchiveCompressor.ZLIB:
+            return zlib.compress(data)
+
+        if method == ArchiveCompressor.LZ4_BLOCK:
+            import lz4.block
+            return lz4.block.compress(data, store_size=False)
+
+        import lz4.frame
+        return lz4.frame.compress(data)
+
+    @staticmethod
+    def _compress_block(args: tuple) -> tuple:
+        """Returns (compressed data, seconds spent compressing)"""
+        start_time = time.perf_counter()
+        packed_data = ArchiveCompressor.compress(*args)
+        return packed_data, time.perf_counter() - start_time
+
+    def _iter_batches(self, blocks: typing.Iterable) -> typing.Generator:
+        batch_size = ArchiveCompressor.BATCH_SIZE_PER_WORKER * self.worker_limit
+
+        batch: list = []
+        size = 0
+
+        for block in blocks:
+            batch.append(block)
+            size += len(block[1]) if block[2] else 0
+
+            if size >= batch_size:
+                yield batch
+                batch, size = [], 0
+
+        if batch:
+            yield batch
+
+    def imap(self, blocks: typing.Iterable, total_size: int = 0) -> typing.Generator:
+        """
+        Yields (tag, data, packed data, seconds spent compressing) for (tag, data, compress) blocks in order
+
+        Packed data is None for blocks that are not compressed. The total size of all blocks is used to decide
+        whether compressing in parallel is worthwhile.
+        """
+        if self.worker_limit == 1 or total_size < ArchiveCompressor.MIN_PARALLEL_SIZE:
+            for tag, data, compress in blocks:
+                yield (tag, data, *self._compress_block((self.method, data))) if compress else (tag, data, None, 0.0)
+            return
+
+        # imported here because most packages are small enough to compress in process
+        import multiprocessing
+
+        multiprocessing.freeze_support()
+
+        # packages are built on threads, and forking a process while other threads run can deadlock the child
+        context = multiprocessing.get_context('spawn')
+
+        with context.Pool(processes=self.worker_limit) as pool:
+            pending: typing.Optional[tuple] = None
+
+            # the next batch is read while the previous batch is compressed, so at most two batches are in memory
+            for batch in self._iter_batches(blocks):
+                jobs = [(self.method, data) for _, data, compress in batch if compress]
+                result = pool.map_async(ArchiveCompressor._compress_block, jobs, chunksize=1)
+
+                if pending is not None:
+                    yield from self._merge(*pending)
+
+                pending = batch, result
+
+            if pending is not None:
+                yield from self._merge(*pending)
+
+    @staticmethod
+    def _merge(batch: list, result: 'multiprocessing.pool.AsyncResult') -> typing.Generator:
+        packed_blocks: list = result.get()
+        index = 0
+        for tag, data, compress in batch:
+            if compress:
+                yield (tag, data, *packed_blocks[index])
+                index += 1
+            else:
+                yield tag, data, None, 0.0
@@ -0,0 +1,43 @@
+from dataclasses import (dataclass,
+                         field)
+
+from pyro.Archives.ArchiveEntry import ArchiveEntry
+
+
+@dataclass
+class ArchiveContents:
+    """
+    Counts of file types in a package, classified once while includes are resolved
+
+    Archive format flags are decided from these counts, so the files do not need to be walked again.
+    """
+    file_count: int = field(init=False, default_factory=int)
+    texture_count: int = field(init=False, default_factory=int)
+    stored_count: int = field(init=False, default_factory=int)
+
+    def add(self, entry: ArchiveEntry) -> None:
+        self.file_count += 1
+
+        if entry.extension == '.dds':
+            self.texture_count += 1
+
+        if not entry.compress:
+            self.stored_count += 1
+
+    @property
+    def can_compress(self) -> bool:
+        """Returns True if any file is compressed"""
+        return self.stored_count < self.file_count
+
+    @property
+    def can_compress_all(self) -> bool:
+        """Returns True if every file is compressed, which archivers without per-file compression require"""
+        return self.stored_count == 0
+
+    @property
+    def has_textures(self) -> bool:
+        return self.texture_count > 0
+
+    @property
+    def is_textures_only(self) -> bool:
+        return self.file_count > 0 and self.texture_count == self.file_count
@@ -0,0 +1,37 @@
+import os
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class ArchiveEntry:
+    """
+    File added to a package
+
+    The source path is read when the package is written. The archive path is relative to the package root
+    and always uses backslash separators, which is how the games store paths. Files are only compressed when
+    both the entry and the package allow compression.
+    """
+    source_path: str
+    archive_path: str
+    compress: bool = True
+
+    @staticmethod
+    def create(source_path: str, archive_path: str, compress: bool = True) -> 'ArchiveEntry':
+        """Returns entry with archive path normalized to backslash separators"""
+        archive_path = os.path.normpath(archive_path).replace('/', '\\').lstrip('\\')
+        return ArchiveEntry(source_path, archive_path, compress)
+
+    @property
+    def folder_name(self) -> str:
+        """Returns folder part of archive path"""
+        return self.archive_path.rpartition('\\')[0]
+
+    @property
+    def file_name(self) -> str:
+        """Returns file name part of archive path"""
+        return self.archive_path.rpartition('\\')[2]
+
+    @property
+    def extension(self) -> str:
+        """Returns lowercase extension of archive path including the leading dot"""
+        return os.path.splitext(self.file_name)[1].casefold()
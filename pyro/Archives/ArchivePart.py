@@ -0,0 +1,58 @@
+import os
+import typing
+from dataclasses import (dataclass,
+                         field)
+
+from pyro.Archives.ArchiveContents import ArchiveContents
+from pyro.Archives.ArchiveEntry import ArchiveEntry
+
+
+@dataclass
+class ArchivePart:
+    """
+    Archive written for part of a package that is split by file type or size
+
+    The suffix identifies the file type group, like " - Textures". Parts after the first in a group are numbered from 2.
+    """
+    suffix: str
+    number: int = 1
+    entries: list = field(default_factory=list)
+    contents: ArchiveContents = field(default_factory=ArchiveContents)
+    size: int = 0
+
+    def add(self, entry: ArchiveEntry, size: int) -> None:
+        self.entries.append(entry)
+        self.contents.add(entry)
+        self.size += size
+
+    def get_file_name(self, name: str, extension: str) -> str:
+        """Returns file name of part from package name without extension"""
+        number: str = str(self.number) if self.number > 1 else ''
+        return f'{name}{self.suffix}{number}{extension}'
+
+    @staticmethod
+    def split(entries: list, *, texture_suffix: typing.Optional[str] = None, main_suffix: str = '',
+              max_size: int = 0) -> list:
+        """
+        Returns parts for entries, placing textures in separate parts if texture suffix is set
+
+        Parts are filled in archive path order, so that files in the same folder stay together. A new part is started
+        when a part would exceed max size bytes of uncompressed data, unless max size is 0. Files larger than max size
+        are written to parts of their own.
+        """
+        groups: dict = {}
+
+        for entry in sorted(entries, key=lambda e: e.archive_path.casefold()):
+            suffix = texture_suffix if texture_suffix is not None and entry.extension == '.dds' else main_suffix
+
+            parts: list = groups.setdefault(suffix, [ArchivePart(suffix)])
+
+            size = os.path.getsize(entry.source_path)
+
+            if max_size and parts[-1].entries and parts[-1].size + size > max_size:
+                parts.append(ArchivePart(suffix, len(parts) + 1))
+
+            parts[-1].add(entry, size)
+
+        # main files are listed first, so main archives are built first
+        return [part for suffix in sorted(groups, key=lambda s: s != main_suffix) for part in groups[suffix]]
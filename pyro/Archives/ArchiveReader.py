@@ -0,0 +1,286 @@
+import mmap
+import os
+import struct
+import types
+import typing
+import zlib
+
+from pyro.Archives.ArchiveRecord import ArchiveRecord
+from pyro.Archives.Ba2Writer import Ba2Writer
+from pyro.Archives.BsaWriter import BsaWriter
+from pyro.Archives.DdsHeader import DdsHeader
+from pyro.Exceptions import PackageError
+
+
+class ArchiveReader:
+    """
+    Reads file tables from BSA and BA2 archives and extracts files on demand
+
+    The archive is memory-mapped, so only the file table is read when the archive is opened.
+
+    Usage: with ArchiveReader(file_path) as archive: data = archive.extract(archive.records[0])
+    """
+    BSA_VERSIONS: tuple = (104, 105)
+    BA2_VERSIONS: dict = {1: 24, 2: 32, 3: 36, 7: 24, 8: 24}
+
+    # BA2 version 3 compression methods
+    BA2_ZLIB: int = 0
+    BA2_LZ4: int = 3
+
+    def __init__(self, file_path: str) -> None:
+        self.file_path: str = file_path
+        self.format: str = ''
+        self.version: int = 0
+        self.archive_flags: int = 0
+        self.records: list = []
+        self._compression: str = 'zlib'
+        self._paths: dict = {}
+
+        try:
+            with open(file_path, mode='rb') as f:
+                self._data: mmap.mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError) as e:
+            raise PackageError(f'Cannot open package "{file_path}": {e}')
+
+        try:
+            if self._data[:4] == BsaWriter.MAGIC:
+                self._read_bsa()
+            elif self._data[:4] == Ba2Writer.MAGIC:
+                self._read_ba2()
+            else:
+                raise PackageError(f'Cannot read package with unknown format: "{file_path}"')
+        except (struct.error, IndexError, UnicodeDecodeError):
+            self.close()
+            raise PackageError(f'Cannot read package with truncated or corrupt file table: "{file_path}"')
+        except PackageError:
+            self.close()
+            raise
+
+    def __enter__(self) -> 'ArchiveReader':
+        return self
+
+    def __exit__(self, exc_type: typing.Optional[type], exc_value: typing.Optional[BaseException],
+                 traceback: typing.Optional[types.TracebackType]) -> None:
+        self.close()
+
+    def close(self) -> None:
+        if not self._data.closed:
+            self._data.close()
+
+    def _read_bsa(self) -> None:
+        self.format = 'bsa'
+
+        _, self.version, _, self.archive_flags, folder_count, file_count, folder_names_length, file_names_length, _ = \
+            struct.unpack_from('<4s8I', self._data, 0)
+
+        if self.version not in ArchiveReader.BSA_VERSIONS:
+            raise PackageError(f'Cannot read BSA version {self.version}: "{self.file_path}"')
+
+        self._compression = 'lz4' if self.version == 105 else 'zlib'
+
+        has_folder_names = bool(self.archive_flags & BsaWriter.ARCHIVE_DIRECTORY_NAMES)
+        has_file_names = bool(self.archive_flags & BsaWriter.ARCHIVE_FILE_NAMES)
+        has_embedded_names = bool(self.archive_flags & BsaWriter.ARCHIVE_EMBED_NAMES)
+        is_compressed = bool(self.archive_flags & BsaWriter.ARCHIVE_COMPRESSED)
+
+        folder_record_format = '<QIIQ' if self.version == 105 else '<QII'
+        folder_record_size = struct.calcsize(folder_record_format)
+
+        folders: list = []
+        for i in range(folder_count):
+            record = struct.unpack_from(folder_record_format, self._data, BsaWriter.HEADER_SIZE + i * folder_record_size)
+            folders.append((record[0], record[1], record[-1] - file_names_length))
+
+        file_names: list = []
+        if has_file_names:
+            # file names block follows the file record blocks, which start with length-prefixed folder names
+            offset = BsaWriter.HEADER_SIZE + folder_record_size * folder_count + BsaWriter.FILE_RECORD_SIZE * file_count
+            if has_folder_names:
+                offset += folder_names_length + folder_count
+            file_names = bytes(self._data[offset:offset + file_names_length]).split(b'\0')[:file_count]
+
+        file_index = 0
+
+        for folder_hash, count, offset in folders:
+            folder_name = ''
+            if has_folder_names:
+                length = self._data[offset]
+                folder_name = bytes(self._data[offset + 1:offset + length]).rstrip(b'\0').decode('cp1252')
+                offset += length + 1
+
+            for i in range(count):
+                file_hash, size, data_offset = struct.unpack_from('<QII', self._data, offset + i * BsaWriter.FILE_RECORD_SIZE)
+
+                compressed = is_compressed != bool(size & BsaWriter.SIZE_COMPRESSION_TOGGLE)
+                size &= ~(BsaWriter.SIZE_COMPRESSION_TOGGLE | 0x80000000)
+
+                file_name = file_names[file_index].decode('cp1252') if has_file_names else f'{file_hash:016x}'
+                file_index += 1
+
+                if has_embedded_names:
+                    length = self._data[data_offset] + 1
+                    data_offset += length
+                    size -= length
+
+                if compressed:
+                    original_size, = struct.unpack_from('<I', self._data, data_offset)
+                    chunks = ((data_offset + 4, size - 4, original_size),)
+                else:
+                    chunks = ((data_offset, 0, size),)
+
+                path = f'{folder_name}\\{file_name}' if folder_name and folder_name != '.' else file_name
+                self.records.append(ArchiveRecord(path, file_hash, folder_hash, chunks))
+
+    def _read_ba2(self) -> None:
+        self.format = 'ba2'
+
+        _, self.version, archive_type, file_count, name_table_offset = struct.unpack_from('<4sI4sIQ', self._data, 0)
+
+        if self.version not in ArchiveReader.BA2_VERSIONS:
+            raise PackageError(f'Cannot read BA2 version {self.version}: "{self.file_path}"')
+
+        if self.version == 3:
+            compression_method, = struct.unpack_from('<I', self._data, 32)
+            if compression_method not in (ArchiveReader.BA2_ZLIB, ArchiveReader.BA2_LZ4):
+                raise PackageError(f'Cannot read BA2 compression method {compression_method}: "{self.file_path}"')
+            self._compression = 'lz4_block' if compression_method == ArchiveReader.BA2_LZ4 else 'zlib'
+
+        names: list = []
+        offset = name_table_offset
+        for _ in range(file_count):
+            length, = struct.unpack_from('<H', self._data, offset)
+            names.append(bytes(self._data[offset + 2:offset + 2 + length]).decode('utf-8'))
+            offset += 2 + length
+
+        offset = ArchiveReader.BA2_VERSIONS[self.version]
+
+        if archive_type == Ba2Writer.GENERAL_TYPE:
+            for name in names:
+                name_hash, _, folder_hash, _, data_offset, packed_size, size, _ = \
+                    struct.unpack_from('<I4sIIQIII', self._data, offset)
+                offset += 36
+                self.records.append(ArchiveRecord(name, name_hash, folder_hash, ((data_offset, packed_size, size),)))
+
+        elif archive_type == Ba2Writer.TEXTURE_TYPE:
+            for name in names:
+                name_hash, _, folder_hash, _, chunk_count, chunk_header_size, height, width, mip_count, dxgi_format, \
+                    is_cubemap, _ = struct.unpack_from('<I4sIBBHHHBBBB', self._data, offset)
+                offset += 24
+
+                chunks: list = []
+                for _ in range(chunk_count):
+                    data_offset, packed_size, size = struct.unpack_from('<QII', self._data, offset)
+                    chunks.append((data_offset, packed_size, size))
+                    offset += chunk_header_size
+
+                texture = DdsHeader()
+                texture.width, texture.height, texture.mip_count = width, height, mip_count
+                texture.dxgi_format, texture.is_cubemap = dxgi_format, bool(is_cubemap)
+
+                self.records.append(ArchiveRecord(name, name_hash, folder_hash, tuple(chunks), texture))
+
+        else:
+            raise PackageError(f'Cannot read BA2 archive type {archive_type!r}: "{self.file_path}"')
+
+    def _decompress(self, data: bytes, size: int) -> bytes:
+        if self._compression == 'zlib':
+            return zlib.decompress(data)
+
+        try:
+            import lz4.block
+            import lz4.frame
+        except ImportError:
+            raise PackageError(f'Cannot extract LZ4 compressed file without the lz4 module: "{self.file_path}"')
+
+        if self._compression == 'lz4_block':
+            return lz4.block.decompress(data, uncompressed_size=size)
+
+        return lz4.frame.decompress(data)
+
+    def find(self, path: str) -> typing.Optional[ArchiveRecord]:
+        """Returns record for path in archive, or None if archive does not contain path"""
+        if not self._paths:
+            self._paths = {record.path.casefold(): record for record in self.records}
+        return self._paths.get(path.replace('/', '\\').casefold())
+
+    def read_data(self, record: ArchiveRecord) -> bytes:
+        """Returns stored data for record, which is pixel data without the DDS header for BA2 textures"""
+        results: list = []
+
+        for offset, packed_size, size in record.chunks:
+            if packed_size:
+                data = self._decompress(self._data[offset:offset + packed_size], size)
+            else:
+                data = self._data[offset:offset + size]
+
+            if len(data) != size:
+                raise PackageError(f'Cannot extract "{record.path}" with unexpected size from: "{self.file_path}"')
+
+            results.append(data)
+
+        return b''.join(results)
+
+    def extract(self, record: ArchiveRecord) -> bytes:
+        """Returns file data for record, rebuilding the DDS header for BA2 textures"""
+        data = self.read_data(record)
+        return record.texture.to_bytes() + data if record.texture is not None else data
+
+    def _get_expected_hashes(self, path: str) -> tuple:
+        """Returns (name hash, folder hash) that the archive format computes for path"""
+        folder_name, _, file_name = path.rpartition('\\')
+
+        if self.format == 'bsa':
+            return BsaWriter.get_hash(file_name), BsaWriter.get_hash(folder_name or '.', True)
+
+        return Ba2Writer.get_hash(os.path.splitext(file_name)[0]), Ba2Writer.get_hash(folder_name)
+
+    def verify(self, entries: list) -> list:
+        """
+        Returns list of problems found by comparing archive with entries it was built from
+
+        Each entry must be stored exactly once under its archive path with the same size and content,
+        and every stored path must hash to the values in the file table.
+        """
+        problems: list = []
+
+        records: dict = {}
+        for record in self.records:
+            key = record.path.casefold()
+            if key in records:
+                problems.append(f'Duplicate path: "{record.path}"')
+            records[key] = record
+
+            if (record.name_hash, record.folder_hash) != self._get_expected_hashes(record.path):
+                problems.append(f'Hash does not match path: "{record.path}"')
+
+        for entry in entries:
+            record = records.pop(entry.archive_path.casefold(), None)
+
+            if record is None:
+                problems.append(f'Missing path: "{entry.archive_path}"')
+                continue
+
+            with open(entry.source_path, mode='rb') as f:
+                source_data: bytes = f.read()
+
+            if record.texture is not None:
+                header = DdsHeader.read(source_data)
+                source_data = source_data[header.data_offset:] if header else source_data
+
+            if record.size != len(source_data):
+                problems.append(f'Size {record.size} does not match size {len(source_data)} of source: "{entry.archive_path}"')
+                continue
+
+            try:
+                data = self.read_data(record)
+            except (zlib.error, RuntimeError) as e:
+                problems.append(f'Cannot extract "{entry.archive_path}": {e}')
+                continue
+
+            if data != source_data:
+                problems.append(f'Content does not match source: "{entry.archive_path}"')
+
+        for record in records.values():
+            problems.append(f'Unexpected path: "{record.path}"')
+
+        return problems
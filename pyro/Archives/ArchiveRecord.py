@@ -0,0 +1,53 @@
+import typing
+from dataclasses import dataclass
+
+from pyro.Archives.DdsHeader import DdsHeader
+
+
+@dataclass(frozen=True)
+class ArchiveRecord:
+    """
+    File stored in a package
+
+    Chunks are (offset, packed size, size) tuples where a packed size of zero means the chunk is stored uncompressed.
+    Texture records in BA2 archives store pixel data without the DDS header, so their size excludes the header.
+    """
+    path: str
+    name_hash: int
+    folder_hash: int
+    chunks: tuple
+    texture: typing.Optional[DdsHeader] = None
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, _, size in self.chunks)
+
+    @property
+    def packed_size(self) -> int:
+        return sum(packed_size or size for _, packed_size, size in self.chunks)
+
+    @property
+    def is_compressed(self) -> bool:
+        return any(packed_size for _, packed_size, _ in self.chunks)
+
+    def to_dict(self) -> dict:
+        result: dict = {
+            'path': self.path,
+            'name_hash': f'{self.name_hash:x}',
+            'folder_hash': f'{self.folder_hash:x}',
+            'size': self.size,
+            'packed_size': self.packed_size,
+            'compressed': self.is_compressed
+        }
+
+        if self.texture is not None:
+            result['texture'] = {
+                'width': self.texture.width,
+                'height': self.texture.height,
+                'mip_count': self.texture.mip_count,
+                'format': self.texture.dxgi_format,
+                'cubemap': self.texture.is_cubemap,
+                'chunk_count': len(self.chunks)
+            }
+
+        return result
@@ -0,0 +1,270 @@
+import hashlib
+import logging
+import os
+import struct
+import typing
+import zlib
+
+from pyro.Archives.ArchiveCompressor import ArchiveCompressor
+from pyro.Archives.ArchiveEntry import ArchiveEntry
+from pyro.Archives.DdsHeader import DdsHeader
+from pyro.Constants import GameType
+from pyro.Exceptions import PackageError
+from pyro.Performance.CompressionData import CompressionData
+
+
+class Ba2Writer:
+    """
+    Writes Fallout 4 and Starfield BA2 archives in general (GNRL) and texture (DX10) formats
+
+    Files are compressed when the archive is compressed, unless their entries are not compressed.
+
+    Usage: Ba2Writer(game_type, compressed=True, textures=False).write(file_path, entries)
+    """
+    log: logging.Logger = logging.getLogger('pyro')
+
+    MAGIC: bytes = b'BTDX'
+    GENERAL_TYPE: bytes = b'GNRL'
+    TEXTURE_TYPE: bytes = b'DX10'
+
+    GENERAL_FLAGS: int = 0x00100100
+    ALIGNMENT: int = 0xBAADF00D
+    TEXTURE_TILE_MODE: int = 8
+    CHUNK_HEADER_SIZE: int = 24
+
+    # mips at least this large are stored in separate chunks so that the games can stream them
+    MIN_CHUNK_SIZE: int = 0x10000
+    MAX_CHUNK_COUNT: int = 0xFF
+
+    def __init__(self, game_type: str, *, compressed: bool, textures: bool = False, share_data: bool = True,
+                 worker_limit: int = 1) -> None:
+        self.game_type: str = game_type
+        self.compressed: bool = compressed
+        self.worker_limit: int = worker_limit
+        self.textures: bool = textures
+        self.share_data: bool = share_data
+        self.compression_data = CompressionData()
+
+    @staticmethod
+    def get_hash(name: str) -> int:
+        """Returns 32-bit hash of lowercase name"""
+        # crc32 without initial and final inversion
+        return zlib.crc32(name.casefold().replace('/', '\\').encode('utf-8'), 0xFFFFFFFF) ^ 0xFFFFFFFF
+
+    def _get_header(self, archive_type: bytes, file_count: int, name_table_offset: int) -> bytes:
+        if self.game_type != GameType.SF1:
+            return struct.pack('<4sI4sIQ', Ba2Writer.MAGIC, 1, archive_type, file_count, name_table_offset)
+
+        if archive_type == Ba2Writer.GENERAL_TYPE:
+            return struct.pack('<4sI4sIQII', Ba2Writer.MAGIC, 2, archive_type, file_count, name_table_offset, 1, 0)
+
+        # compression method 0 is zlib
+        return struct.pack('<4sI4sIQIII', Ba2Writer.MAGIC, 3, archive_type, file_count, name_table_offset, 1, 0, 0)
+
+    @staticmethod
+    def _get_name_hashes(entry: ArchiveEntry) -> tuple:
+        """Returns (name hash, extension, folder hash) for entry"""
+        stem, extension = os.path.splitext(entry.file_name)
+        extension_data = extension[1:].casefold().encode('utf-8')[:4].ljust(4, b'\0')
+        return Ba2Writer.get_hash(stem), extension_data, Ba2Writer.get_hash(entry.folder_name)
+
+    @staticmethod
+    def _pack(data: bytes, packed_data: typing.Optional[bytes]) -> tuple:
+        """Returns (data block, packed size) for data where packed size is zero when data is stored"""
+        if packed_data is not None and len(packed_data) < len(data):
+            return packed_data, len(packed_data)
+        return data, 0
+
+    @staticmethod
+    def _get_chunk_ranges(header: DdsHeader, data_size: int) -> list:
+        """Returns list of (start mip, end mip, start offset, end offset) for texture data"""
+        mip_sizes: list = header.get_mip_sizes()
+
+        # cubemaps and texture arrays interleave faces, so their mips are not contiguous
+        if header.is_cubemap or sum(mip_sizes) != data_size:
+            return [(0, header.mip_count - 1, 0, data_size)]
+
+        results: list = []
+
+        offset = 0
+        for mip, mip_size in enumerate(mip_sizes):
+            last_chunk = len(results) == Ba2Writer.MAX_CHUNK_COUNT - 1
+            if mip_size < Ba2Writer.MIN_CHUNK_SIZE or mip == len(mip_sizes) - 1 or last_chunk:
+                # remaining small mips are stored together
+                results.append((mip, header.mip_count - 1, offset, data_size))
+                break
+            results.append((mip, mip, offset, offset + mip_size))
+            offset += mip_size
+
+        return results
+
+    def _read_texture_headers(self, entries: list) -> list:
+        """Returns texture headers for entries, or an empty list if any entry is not a supported texture"""
+        results: list = []
+
+        for entry in entries:
+            with open(entry.source_path, mode='rb') as f:
+                header = DdsHeader.read(f.read(DdsHeader.HEADER_SIZE + DdsHeader.DX10_HEADER_SIZE))
+
+            if header is None:
+                Ba2Writer.log.warning(f'Cannot read texture header, writing general archive instead: "{entry.source_path}"')
+                return []
+
+            results.append(header)
+
+        return results
+
+    def _iter_general_blocks(self, entries: list) -> typing.Generator:
+        """Yields ((entry index, digest), data, compress) for entries"""
+        digests: set = set()
+
+        for i, entry in enumerate(entries):
+            with open(entry.source_path, mode='rb') as source:
+                data: bytes = source.read()
+
+            digest = hashlib.sha1(data).digest() if self.share_data else None
+
+            # shared files are not compressed again and have no data of their own
+            if digest in digests:
+                yield (i, digest), None, False
+                continue
+
+            if digest is not None:
+                digests.add(digest)
+
+            yield (i, digest), data, self.compressed and entry.compress
+
+    def _iter_texture_blocks(self, entries: list, headers: list, chunk_ranges: list) -> typing.Generator:
+        """Yields ((entry index, chunk index, digest), data, compress) for each chunk of entries"""
+        digests: set = set()
+
+        for i, (entry, header, ranges) in enumerate(zip(entries, headers, chunk_ranges)):
+            with open(entry.source_path, mode='rb') as source:
+                data: bytes = source.read()[header.data_offset:]
+
+            if len(data) != ranges[-1][3]:
+                raise PackageError(f'Cannot add texture that changed while package was being written: "{entry.source_path}"')
+
+            digest = hashlib.sha1(data).digest() if self.share_data else None
+
+            if digest in digests:
+                yield (i, -1, digest), None, False
+                continue
+
+            if digest is not None:
+                digests.add(digest)
+
+            for j, (_, _, start, end) in enumerate(ranges):
+                yield (i, j, digest), data[start:end], self.compressed and entry.compress
+
+    def _write_general(self, f: typing.BinaryIO, entries: list) -> None:
+        header_size = len(self._get_header(Ba2Writer.GENERAL_TYPE, 0, 0))
+        records_size = 36 * len(entries)
+
+        f.seek(header_size + records_size)
+
+        compressor = ArchiveCompressor(ArchiveCompressor.ZLIB, worker_limit=self.worker_limit)
+        total_size = sum(os.path.getsize(entry.source_path) for entry in entries)
+
+        records: list = []
+        shared_blocks: dict = {}
+
+        for (i, digest), data, packed_data, seconds in compressor.imap(self._iter_general_blocks(entries), total_size):
+            if data is None:
+                offset, packed_size, size = shared_blocks[digest]
+            else:
+                block, packed_size = self._pack(data, packed_data)
+                offset, size = f.tell(), len(data)
+                f.write(block)
+                self.compression_data.add(entries[i].extension, size, len(block), seconds, stored=packed_size == 0)
+                if digest is not None:
+                    shared_blocks[digest] = offset, packed_size, size
+
+            name_hash, extension, folder_hash = self._get_name_hashes(entries[i])
+            records.append(struct.pack('<I4sIIQIII', name_hash, extension, folder_hash, Ba2Writer.GENERAL_FLAGS,
+                                       offset, packed_size, size, Ba2Writer.ALIGNMENT))
+
+        name_table_offset = f.tell()
+        self._write_name_table(f, entries)
+
+        f.seek(0)
+        f.write(self._get_header(Ba2Writer.GENERAL_TYPE, len(entries), name_table_offset))
+        f.write(b''.join(records))
+
+    def _write_textures(self, f: typing.BinaryIO, entries: list, headers: list) -> None:
+        header_size = len(self._get_header(Ba2Writer.TEXTURE_TYPE, 0, 0))
+
+        # chunk layout determines record sizes, so it is computed from file sizes before any data is written
+        chunk_ranges: list = []
+        for entry, header in zip(entries, headers):
+            data_size = os.path.getsize(entry.source_path) - header.data_offset
+            chunk_ranges.append(self._get_chunk_ranges(header, data_size))
+
+        records_size = sum(24 + Ba2Writer.CHUNK_HEADER_SIZE * len(ranges) for ranges in chunk_ranges)
+
+        f.seek(header_size + records_size)
+
+        compressor = ArchiveCompressor(ArchiveCompressor.ZLIB, worker_limit=self.worker_limit)
+        total_size = sum(os.path.getsize(entry.source_path) for entry in entries)
+
+        records: list = []
+        shared_chunks: dict = {}
+        chunks: list = []
+
+        blocks = self._iter_texture_blocks(entries, headers, chunk_ranges)
+
+        for (i, j, digest), data, packed_data, seconds in compressor.imap(blocks, total_size):
+            ranges = chunk_ranges[i]
+
+            if data is None:
+                chunks = shared_chunks[digest]
+            else:
+                start_mip, end_mip, start, end = ranges[j]
+                block, packed_size = self._pack(data, packed_data)
+
+                # textures count as stored when their first chunk is stored
+                self.compression_data.add(entries[i].extension, len(data), len(block), seconds,
+                                          stored=packed_size == 0, new_file=j == 0)
+                chunks.append(struct.pack('<QIIHHI', f.tell(), packed_size, end - start, start_mip, end_mip, Ba2Writer.ALIGNMENT))
+                f.write(block)
+
+                # records are complete when the last chunk of a texture is written
+                if j < len(ranges) - 1:
+                    continue
+
+                if digest is not None:
+                    shared_chunks[digest] = chunks
+
+            header = headers[i]
+            name_hash, extension, folder_hash = self._get_name_hashes(entries[i])
+            records.append(struct.pack('<I4sIBBHHHBBBB', name_hash, extension, folder_hash, 0, len(chunks),
+                                       Ba2Writer.CHUNK_HEADER_SIZE, header.height, header.width, header.mip_count,
+                                       header.dxgi_format, int(header.is_cubemap), Ba2Writer.TEXTURE_TILE_MODE))
+            records.extend(chunks)
+            chunks = []
+
+        name_table_offset = f.tell()
+        self._write_name_table(f, entries)
+
+        f.seek(0)
+        f.write(self._get_header(Ba2Writer.TEXTURE_TYPE, len(entries), name_table_offset))
+        f.write(b''.join(records))
+
+    @staticmethod
+    def _write_name_table(f: typing.BinaryIO, entries: list) -> None:
+        for entry in entries:
+            name = entry.archive_path.encode('utf-8')
+            f.write(struct.pack('<H', len(name)) + name)
+
+    def write(self, file_path: str, entries: list) -> None:
+        """Writes archive containing entries to file path"""
+        headers: list = self._read_texture_headers(entries) if self.textures else []
+
+        with open(file_path, mode='wb') as f:
+            if headers:
+                self._write_textures(f, entries, headers)
+            else:
+                self._write_general(f, entries)
+
+        archive_type = 'texture' if headers else 'general'
+        Ba2Writer.log.debug(f'Wrote {len(entries)} files to {archive_type} archive "{file_path}"')
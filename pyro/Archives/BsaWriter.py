@@ -0,0 +1,248 @@
+import hashlib
+import logging
+import os
+import struct
+import typing
+
+from pyro.Archives.ArchiveCompressor import ArchiveCompressor
+from pyro.Constants import GameType
+from pyro.Exceptions import PackageError
+from pyro.Performance.CompressionData import CompressionData
+
+
+class BsaWriter:
+    """
+    Writes Skyrim (version 104) and Skyrim Special Edition (version 105) BSA archives
+
+    Files are compressed when the archive is compressed, unless their entries are not compressed.
+
+    Usage: BsaWriter(game_type, compressed=True).write(file_path, entries)
+    """
+    log: logging.Logger = logging.getLogger('pyro')
+
+    MAGIC: bytes = b'BSA\0'
+    HEADER_SIZE: int = 36
+    FILE_RECORD_SIZE: int = 16
+
+    ARCHIVE_DIRECTORY_NAMES: int = 0x1
+    ARCHIVE_FILE_NAMES: int = 0x2
+    ARCHIVE_COMPRESSED: int = 0x4
+    ARCHIVE_EMBED_NAMES: int = 0x100
+
+    # set in file record size when a file is not compressed the same way as the archive
+    SIZE_COMPRESSION_TOGGLE: int = 0x40000000
+
+    MAX_ARCHIVE_SIZE: int = 0xFFFFFFFF
+
+    FILE_FLAGS: dict = {
+        '.nif': 0x1,
+        '.dds': 0x2,
+        '.xml': 0x4,
+        '.swf': 0x4,
+        '.wav': 0x8,
+        '.xwm': 0x8,
+        '.mp3': 0x10,
+        '.ogg': 0x10,
+        '.fuz': 0x10,
+        '.lip': 0x10
+    }
+    FILE_FLAGS_MISC: int = 0x100
+
+    EXTENSION_HASHES: dict = {
+        '.kf': 0x80,
+        '.nif': 0x8000,
+        '.dds': 0x8080,
+        '.wav': 0x80000000
+    }
+
+    def __init__(self, game_type: str, *, compressed: bool, embed_names: bool = True, share_data: bool = True,
+                 worker_limit: int = 1) -> None:
+        self.version: int = 105 if game_type == GameType.SSE else 104
+        self.compressed: bool = compressed
+        self.worker_limit: int = worker_limit
+        self.embed_names: bool = embed_names
+        # embedded names are part of the data block, so only files with identical paths could share data
+        self.share_data: bool = share_data and not embed_names
+        self.compression_data = CompressionData()
+
+    @staticmethod
+    def _encode(name: str) -> bytes:
+        try:
+            return name.encode('cp1252')
+        except UnicodeEncodeError:
+            raise PackageError(f'Cannot add path with characters unsupported by BSA archives: "{name}"')
+
+    @staticmethod
+    def get_hash(name: str, is_folder: bool = False) -> int:
+        """Returns 64-bit hash of lowercase folder or file name"""
+        name = name.casefold().replace('/', '\\')
+
+        root, extension = (name, '') if is_folder else os.path.splitext(name)
+        root_data, extension_data = BsaWriter._encode(root), BsaWriter._encode(extension)
+
+        if not root_data:
+            return 0
+
+        hash1 = root_data[-1] | (root_data[-2] << 8 if len(root_data) > 2 else 0) | len(root_data) << 16 | root_data[0] << 24
+        hash1 |= BsaWriter.EXTENSION_HASHES.get(extension, 0)
+
+        hash2 = 0
+        for c in root_data[1:-2]:
+            hash2 = (hash2 * 0x1003F + c) & 0xFFFFFFFF
+
+        hash3 = 0
+        for c in extension_data:
+            hash3 = (hash3 * 0x1003F + c) & 0xFFFFFFFF
+
+        return ((hash2 + hash3) & 0xFFFFFFFF) << 32 | hash1
+
+    def _pack(self, name: bytes, data: bytes, packed_data: typing.Optional[bytes]) -> tuple:
+        """Returns (data block, size field) for file data and its compressed data, if compressed"""
+        prefix: bytes = struct.pack('<B', len(name)) + name if self.embed_names else b''
+
+        if self.compressed:
+            # store files that do not get smaller, such as already compressed audio
+            if packed_data is not None and len(packed_data) + 4 < len(data):
+                block = prefix + struct.pack('<I', len(data)) + packed_data
+                return block, len(block)
+            block = prefix + data
+            return block, len(block) | BsaWriter.SIZE_COMPRESSION_TOGGLE
+
+        block = prefix + data
+        return block, len(block)
+
+    def _iter_blocks(self, ordered_folders: list) -> typing.Generator:
+        """Yields ((file hash, embedded name, digest), data, compress) in file record order"""
+        digests: set = set()
+
+        for _, folder_name, files in ordered_folders:
+            for file_hash in sorted(files):
+                file_name, entry = files[file_hash]
+
+                with open(entry.source_path, mode='rb') as source:
+                    data: bytes = source.read()
+
+                digest = hashlib.sha1(data).digest() if self.share_data else None
+
+                # shared files are not compressed again and have no data of their own
+                if digest in digests:
+                    yield (file_hash, '', digest), None, False
+                    continue
+
+                if digest is not None:
+                    digests.add(digest)
+
+                yield (file_hash, f'{folder_name}\\{file_name}', digest), data, self.compressed and entry.compress
+
+    def _get_flags(self, entries: typing.Iterable) -> tuple:
+        """Returns (archive flags, file flags) for entries"""
+        archive_flags = BsaWriter.ARCHIVE_DIRECTORY_NAMES | BsaWriter.ARCHIVE_FILE_NAMES
+
+        if self.compressed:
+            archive_flags |= BsaWriter.ARCHIVE_COMPRESSED
+
+        if self.embed_names:
+            archive_flags |= BsaWriter.ARCHIVE_EMBED_NAMES
+
+        file_flags = 0
+        for entry in entries:
+            file_flags |= BsaWriter.FILE_FLAGS.get(entry.extension, BsaWriter.FILE_FLAGS_MISC)
+
+        return archive_flags, file_flags
+
+    def write(self, file_path: str, entries: list) -> None:
+        """Writes archive containing entries to file path"""
+        # group files by folder, ordered by hash as the games search folders and files with binary search
+        folders: dict = {}
+
+        for entry in entries:
+            folder_name = entry.folder_name.casefold() or '.'
+            file_name = entry.file_name.casefold()
+
+            if len(self._encode(folder_name)) > 254 or len(self._encode(f'{folder_name}\\{file_name}')) > 255:
+                raise PackageError(f'Cannot add path longer than BSA archives allow: "{entry.archive_path}"')
+
+            folder_hash, file_hash = self.get_hash(folder_name, True), self.get_hash(file_name)
+            folder = folders.setdefault(folder_hash, (folder_name, {}))
+
+            if folder[0] != folder_name or folder[1].get(file_hash, (file_name,))[0] != file_name:
+                raise PackageError(f'Cannot add path whose hash collides with another path: "{entry.archive_path}"')
+
+            folder[1][file_hash] = (file_name, entry)
+
+        ordered_folders: list = [(folder_hash, *folders[folder_hash]) for folder_hash in sorted(folders)]
+
+        file_count = sum(len(files) for _, _, files in ordered_folders)
+        folder_names_length = sum(len(self._encode(folder_name)) + 1 for _, folder_name, _ in ordered_folders)
+        file_names_length = sum(len(self._encode(file_name)) + 1 for _, _, files in ordered_folders for file_name, _ in files.values())
+
+        folder_record_size = 24 if self.version == 105 else 16
+        folder_records_offset = BsaWriter.HEADER_SIZE
+        file_records_offset = folder_records_offset + folder_record_size * len(ordered_folders)
+        file_names_offset = file_records_offset + folder_names_length + len(ordered_folders) + BsaWriter.FILE_RECORD_SIZE * file_count
+        data_offset = file_names_offset + file_names_length
+
+        archive_flags, file_flags = self._get_flags(entries)
+
+        compressor = ArchiveCompressor(ArchiveCompressor.LZ4_FRAME if self.version == 105 else ArchiveCompressor.ZLIB,
+                                       worker_limit=self.worker_limit)
+        total_size = sum(os.path.getsize(entry.source_path) for entry in entries)
+
+        shared_blocks: dict = {}
+        file_records: list = []
+
+        with open(file_path, mode='wb') as f:
+            f.write(struct.pack('<4s8I', BsaWriter.MAGIC, self.version, BsaWriter.HEADER_SIZE, archive_flags,
+                                len(ordered_folders), file_count, folder_names_length, file_names_length, file_flags))
+
+            # file data is written first so that records can be written with final offsets and sizes
+            f.seek(data_offset)
+
+            blocks = compressor.imap(self._iter_blocks(ordered_folders), total_size)
+
+            for (file_hash, name, digest), data, packed_data, seconds in blocks:
+                if data is None:
+                    offset, size = shared_blocks[digest]
+                else:
+                    block, size = self._pack(self._encode(name), data, packed_data)
+                    offset = f.tell()
+
+                    is_compressed = self.compressed and not size & BsaWriter.SIZE_COMPRESSION_TOGGLE
+                    # embedded names are not file data, so they are not counted
+                    written_size = len(block) - (len(self._encode(name)) + 1 if self.embed_names else 0)
+                    self.compression_data.add(os.path.splitext(name)[1].casefold(), len(data), written_size, seconds,
+                                              stored=not is_compressed)
+
+                    if offset + len(block) > BsaWriter.MAX_ARCHIVE_SIZE:
+                        raise PackageError(f'Cannot create BSA archive larger than 4 GiB: "{file_path}"')
+
+                    f.write(block)
+
+                    if digest is not None:
+                        shared_blocks[digest] = offset, size
+
+                file_records.append(struct.pack('<QII', file_hash, size, offset))
+
+            f.seek(folder_records_offset)
+
+            offset = file_records_offset
+            for folder_hash, folder_name, files in ordered_folders:
+                # offsets of file record blocks include total length of file names for historical reasons
+                if self.version == 105:
+                    f.write(struct.pack('<QIIQ', folder_hash, len(files), 0, offset + file_names_length))
+                else:
+                    f.write(struct.pack('<QII', folder_hash, len(files), offset + file_names_length))
+                offset += len(self._encode(folder_name)) + 2 + BsaWriter.FILE_RECORD_SIZE * len(files)
+
+            index = 0
+            for _, folder_name, files in ordered_folders:
+                folder_name_data = self._encode(folder_name)
+                f.write(struct.pack('<B', len(folder_name_data) + 1) + folder_name_data + b'\0')
+                f.write(b''.join(file_records[index:index + len(files)]))
+                index += len(files)
+
+            for _, _, files in ordered_folders:
+                for file_hash in sorted(files):
+                    f.write(self._encode(files[file_hash][0]) + b'\0')
+
+        BsaWriter.log.debug(f'Wrote {file_count} files in {len(ordered_folders)} folders to "{file_path}"')
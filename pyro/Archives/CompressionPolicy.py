@@ -0,0 +1,23 @@
+from wcmatch import glob
+
+
+class CompressionPolicy:
+    """
+    Decides which files in a package are compressed from wildcard patterns for files that are stored
+
+    Patterns are separated by "|" and matched case-insensitively against archive paths. Patterns without
+    separators match file names in any folder, so "*.fuz" stores all voice files.
+    """
+    # voices and sounds bad because bethesda no likey, strings bad because wrye bash no likey
+    DEFAULT_PATTERNS: str = '*.fuz|*.wav|*.xwm|*.strings|*.dlstrings|*.ilstrings'
+
+    FLAGS: int = glob.GLOBSTAR | glob.MATCHBASE | glob.SPLIT | glob.IGNORECASE | glob.MINUSNEGATE
+
+    def __init__(self, patterns: str = DEFAULT_PATTERNS) -> None:
+        self.patterns: str = patterns.strip()
+
+    def should_compress(self, archive_path: str) -> bool:
+        """Returns False if archive path matches any pattern"""
+        if not self.patterns:
+            return True
+        return not glob.globmatch(archive_path.replace('\\', '/'), self.patterns, flags=CompressionPolicy.FLAGS)
@@ -0,0 +1,148 @@
+import struct
+import typing
+from dataclasses import (dataclass,
+                         field)
+
+
+@dataclass
+class DdsHeader:
+    """
+    Texture properties read from the header of a DDS file
+
+    BA2 texture archives store these properties in the file record and the pixel data without the header.
+    """
+    width: int = field(init=False, default_factory=int)
+    height: int = field(init=False, default_factory=int)
+    mip_count: int = field(init=False, default_factory=int)
+    dxgi_format: int = field(init=False, default_factory=int)
+    is_cubemap: bool = field(init=False, default_factory=bool)
+    data_offset: int = field(init=False, default_factory=int)
+
+    MAGIC: typing.ClassVar[bytes] = b'DDS '
+    HEADER_SIZE: typing.ClassVar[int] = 128
+    DX10_HEADER_SIZE: typing.ClassVar[int] = 20
+
+    DDPF_FOURCC: typing.ClassVar[int] = 0x4
+    DDPF_RGB: typing.ClassVar[int] = 0x40
+    DDPF_LUMINANCE: typing.ClassVar[int] = 0x20000
+    DDSCAPS2_CUBEMAP: typing.ClassVar[int] = 0x200
+    RESOURCE_MISC_TEXTURECUBE: typing.ClassVar[int] = 0x4
+
+    # legacy four character codes and their DXGI formats
+    FOURCC_FORMATS: typing.ClassVar[dict] = {
+        b'DXT1': 71,  # BC1_UNORM
+        b'DXT3': 74,  # BC2_UNORM
+        b'DXT5': 77,  # BC3_UNORM
+        b'ATI1': 80,  # BC4_UNORM
+        b'BC4U': 80,
+        b'BC4S': 81,  # BC4_SNORM
+        b'ATI2': 83,  # BC5_UNORM
+        b'BC5U': 83,
+        b'BC5S': 84   # BC5_SNORM
+    }
+
+    # bytes per 4x4 block for block-compressed DXGI formats
+    BLOCK_SIZES: typing.ClassVar[dict] = {
+        **dict.fromkeys((70, 71, 72, 79, 80, 81), 8),
+        **dict.fromkeys((73, 74, 75, 76, 77, 78, 82, 83, 84, 94, 95, 96, 97, 98, 99), 16)
+    }
+
+    # bytes per pixel for uncompressed DXGI formats
+    PIXEL_SIZES: typing.ClassVar[dict] = {
+        **dict.fromkeys((1, 2, 3, 4), 16),
+        **dict.fromkeys((9, 10, 11, 12, 13, 14), 8),
+        **dict.fromkeys((23, 24, 25, 26, 27, 28, 29, 30, 31, 32, 87, 88, 90, 91), 4),
+        **dict.fromkeys((48, 49, 50, 51, 52, 85, 86, 115), 2),
+        **dict.fromkeys((60, 61, 62, 63, 64, 65), 1)
+    }
+
+    @staticmethod
+    def _get_uncompressed_format(flags: int, bit_count: int, masks: tuple) -> int:
+        r_mask, g_mask, b_mask, a_mask = masks
+
+        if flags & DdsHeader.DDPF_RGB and bit_count == 32:
+            if (r_mask, g_mask, b_mask) == (0x000000FF, 0x0000FF00, 0x00FF0000):
+                return 28  # R8G8B8A8_UNORM
+            if (r_mask, g_mask, b_mask) == (0x00FF0000, 0x0000FF00, 0x000000FF):
+                return 87 if a_mask else 88  # B8G8R8A8_UNORM or B8G8R8X8_UNORM
+
+        if flags & DdsHeader.DDPF_LUMINANCE and bit_count == 8:
+            return 61  # R8_UNORM
+
+        if flags & DdsHeader.DDPF_RGB and bit_count == 16 and (r_mask, g_mask, b_mask) == (0xF800, 0x07E0, 0x001F):
+            return 85  # B5G6R5_UNORM
+
+        return 0
+
+    @staticmethod
+    def read(data: bytes) -> typing.Optional['DdsHeader']:
+        """Returns header from start of DDS file data, or None if the data is not a supported DDS texture"""
+        if len(data) < DdsHeader.HEADER_SIZE or data[:4] != DdsHeader.MAGIC:
+            return None
+
+        height, width, _, _, mip_count = struct.unpack_from('<5I', data, 12)
+        pf_flags, four_cc, bit_count = struct.unpack_from('<I4sI', data, 80)
+        masks = struct.unpack_from('<4I', data, 92)
+        caps2, = struct.unpack_from('<I', data, 112)
+
+        header = DdsHeader()
+        header.width = width
+        header.height = height
+        header.mip_count = max(1, mip_count)
+        header.is_cubemap = bool(caps2 & DdsHeader.DDSCAPS2_CUBEMAP)
+        header.data_offset = DdsHeader.HEADER_SIZE
+
+        if pf_flags & DdsHeader.DDPF_FOURCC and four_cc == b'DX10':
+            if len(data) < DdsHeader.HEADER_SIZE + DdsHeader.DX10_HEADER_SIZE:
+                return None
+            header.dxgi_format, _, misc_flag = struct.unpack_from('<3I', data, DdsHeader.HEADER_SIZE)
+            header.is_cubemap = header.is_cubemap or bool(misc_flag & DdsHeader.RESOURCE_MISC_TEXTURECUBE)
+            header.data_offset += DdsHeader.DX10_HEADER_SIZE
+        elif pf_flags & DdsHeader.DDPF_FOURCC:
+            header.dxgi_format = DdsHeader.FOURCC_FORMATS.get(four_cc, 0)
+        else:
+            header.dxgi_format = DdsHeader._get_uncompressed_format(pf_flags, bit_count, masks)
+
+        if not header.dxgi_format or header.width == 0 or header.height == 0:
+            return None
+
+        if header.dxgi_format not in DdsHeader.BLOCK_SIZES and header.dxgi_format not in DdsHeader.PIXEL_SIZES:
+            return None
+
+        return header
+
+    def to_bytes(self) -> bytes:
+        """Returns DDS header with DX10 extension for texture properties"""
+        mip_sizes: list = self.get_mip_sizes()
+
+        # caps, height, width, pitch or linear size, mipmap count, linear size
+        flags = 0x1 | 0x2 | 0x4 | 0x1000 | 0x20000 | 0x80000
+        caps = 0x1000 | 0x8 | 0x400000 if self.mip_count > 1 else 0x1000
+        caps2 = 0xFE00 if self.is_cubemap else 0
+
+        data = bytearray(DdsHeader.HEADER_SIZE + DdsHeader.DX10_HEADER_SIZE)
+        data[:4] = DdsHeader.MAGIC
+        struct.pack_into('<7I', data, 4, 124, flags, self.height, self.width, mip_sizes[0], 0, self.mip_count)
+        struct.pack_into('<2I4s', data, 76, 32, DdsHeader.DDPF_FOURCC, b'DX10')
+        struct.pack_into('<2I', data, 108, caps, caps2)
+
+        # resource dimension 3 is a 2D texture
+        misc_flag = DdsHeader.RESOURCE_MISC_TEXTURECUBE if self.is_cubemap else 0
+        struct.pack_into('<5I', data, DdsHeader.HEADER_SIZE, self.dxgi_format, 3, misc_flag, 1, 0)
+
+        return bytes(data)
+
+    def get_mip_sizes(self) -> list:
+        """Returns size in bytes of each mip level of one face"""
+        results: list = []
+
+        for level in range(self.mip_count):
+            width = max(1, self.width >> level)
+            height = max(1, self.height >> level)
+
+            if self.dxgi_format in DdsHeader.BLOCK_SIZES:
+                results.append(max(1, (width + 3) // 4) * max(1, (height + 3) // 4) * DdsHeader.BLOCK_SIZES[self.dxgi_format])
+            else:
+                results.append(width * height * DdsHeader.PIXEL_SIZES[self.dxgi_format])
+
+        return results
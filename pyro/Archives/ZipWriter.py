@@ -0,0 +1,344 @@
+import collections
+import concurrent.futures
+import logging
+import os
+import struct
+import time
+import typing
+import zipfile
+import zlib
+
+from pyro.Exceptions import PackageError
+from pyro.Performance.CompressionData import CompressionData
+
+
+class ZipWriter:
+    """
+    Writes ZIP files, compressing members on a thread pool when the worker limit is greater than 1
+
+    Members are deflated in chunks. Each chunk is primed with the 32 KiB of data before it and ends on a byte
+    boundary, so chunks compressed independently join into one deflate stream, and the output does not depend
+    on the worker count. zlib releases the GIL while compressing, so threads compress chunks in parallel.
+
+    Members unchanged since a previous ZIP file are copied from it without being compressed again.
+
+    Usage: ZipWriter(zipfile.ZIP_DEFLATED, worker_limit=8).write(file_path, [(source_path, arcname), ...])
+    """
+    log: logging.Logger = logging.getLogger('pyro')
+
+    LOCAL_HEADER: struct.Struct = struct.Struct('<IHHHHHIIIHH')
+    CENTRAL_HEADER: struct.Struct = struct.Struct('<IHHHHHHIIIHHHHHII')
+    END_RECORD: struct.Struct = struct.Struct('<IHHHHIIH')
+    ZIP64_END_RECORD: struct.Struct = struct.Struct('<IQHHIIQQQQ')
+    ZIP64_END_LOCATOR: struct.Struct = struct.Struct('<IIQI')
+
+    LOCAL_HEADER_SIGNATURE: int = 0x04034B50
+    CENTRAL_HEADER_SIGNATURE: int = 0x02014B50
+    END_RECORD_SIGNATURE: int = 0x06054B50
+    ZIP64_END_RECORD_SIGNATURE: int = 0x06064B50
+    ZIP64_END_LOCATOR_SIGNATURE: int = 0x07064B50
+    ZIP64_EXTRA_ID: int = 0x0001
+
+    VERSION: int = 20
+    ZIP64_VERSION: int = 45
+
+    FLAG_ENCRYPTED: int = 0x1
+    FLAG_UTF8: int = 0x800
+
+    ZIP64_LIMIT: int = 0xFFFFFFFF
+    ZIP64_COUNT_LIMIT: int = 0xFFFF
+
+    CHUNK_SIZE: int = 1024 * 1024
+    WINDOW_SIZE: int = 32 * 1024
+
+    # chunks read ahead per worker, which bounds memory use for large members
+    CHUNKS_PER_WORKER: int = 4
+
+    def __init__(self, compress_type: int, *, level: int = zlib.Z_DEFAULT_COMPRESSION, worker_limit: int = 1) -> None:
+        if compress_type not in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED):
+            raise PackageError(f'Cannot write ZIP file with compression type: {compress_type}')
+
+        self.compress_type: int = compress_type
+        self.level: int = level
+        self.worker_limit: int = max(1, worker_limit)
+        self.compression_data = CompressionData()
+        self.reused_count: int = 0
+
+    @staticmethod
+    def _deflate(data: bytes, zdict: bytes, final: bool, level: int) -> tuple:
+        """Returns (raw deflate data, seconds spent compressing) for chunk primed with the data before it"""
+        start_time = time.perf_counter()
+
+        if zdict:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zlib.DEF_MEM_LEVEL, zlib.Z_DEFAULT_STRATEGY, zdict)
+        else:
+            compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+
+        # sync flush ends the chunk on a byte boundary without marking the last block
+        packed_data = compressor.compress(data) + compressor.flush(zlib.Z_FINISH if final else zlib.Z_SYNC_FLUSH)
+
+        return packed_data, time.perf_counter() - start_time
+
+    @staticmethod
+    def _get_dos_time(info: zipfile.ZipInfo) -> tuple:
+        year, month, day, hour, minute, second = info.date_time
+        return (hour << 11) | (minute << 5) | (second // 2), ((year - 1980) << 9) | (month << 5) | day
+
+    @staticmethod
+    def _encode_name(info: zipfile.ZipInfo) -> tuple:
+        """Returns (encoded file name, flags) where names that are not ASCII are encoded as UTF-8"""
+        try:
+            return info.filename.encode('ascii'), 0
+        except UnicodeEncodeError:
+            return info.filename.encode('utf-8'), ZipWriter.FLAG_UTF8
+
+    def _get_local_header(self, info: zipfile.ZipInfo, zip64: bool) -> bytes:
+        name, flags = self._encode_name(info)
+        dos_time, dos_date = self._get_dos_time(info)
+
+        if zip64:
+            extra = struct.pack('<HHQQ', ZipWriter.ZIP64_EXTRA_ID, 16, info.file_size, info.compress_size)
+            compress_size = file_size = ZipWriter.ZIP64_LIMIT
+        else:
+            extra = b''
+            compress_size, file_size = info.compress_size, info.file_size
+
+        version = ZipWriter.ZIP64_VERSION if zip64 else ZipWriter.VERSION
+
+        return ZipWriter.LOCAL_HEADER.pack(ZipWriter.LOCAL_HEADER_SIGNATURE, version, flags, info.compress_type,
+                                           dos_time, dos_date, info.CRC, compress_size, file_size,
+                                           len(name), len(extra)) + name + extra
+
+    def _get_central_header(self, info: zipfile.ZipInfo) -> bytes:
+        name, flags = self._encode_name(info)
+        dos_time, dos_date = self._get_dos_time(info)
+
+        # only values that do not fit are stored in the zip64 extra field, in this order
+        values: list = []
+        file_size, compress_size, header_offset = info.file_size, info.compress_size, info.header_offset
+
+        if file_size >= ZipWriter.ZIP64_LIMIT:
+            values.append(file_size)
+            file_size = ZipWriter.ZIP64_LIMIT
+        if compress_size >= ZipWriter.ZIP64_LIMIT:
+            values.append(compress_size)
+            compress_size = ZipWriter.ZIP64_LIMIT
+        if header_offset >= ZipWriter.ZIP64_LIMIT:
+            values.append(header_offset)
+            header_offset = ZipWriter.ZIP64_LIMIT
+
+        extra = struct.pack(f'<HH{len(values)}Q', ZipWriter.ZIP64_EXTRA_ID, 8 * len(values), *values) if values else b''
+
+        version = ZipWriter.ZIP64_VERSION if values else ZipWriter.VERSION
+
+        return ZipWriter.CENTRAL_HEADER.pack(ZipWriter.CENTRAL_HEADER_SIGNATURE, info.create_system << 8 | version,
+                                             version, flags, info.compress_type, dos_time, dos_date, info.CRC,
+                                             compress_size, file_size, len(name), len(extra), 0, 0, 0,
+                                             info.external_attr, header_offset) + name + extra
+
+    def _write_end_records(self, f: typing.BinaryIO, infos: list) -> None:
+        central_directory_offset = f.tell()
+
+        for info in infos:
+            f.write(self._get_central_header(info))
+
+        central_directory_size = f.tell() - central_directory_offset
+
+        count = len(infos)
+
+        if count > ZipWriter.ZIP64_COUNT_LIMIT or central_directory_offset >= ZipWriter.ZIP64_LIMIT \
+                or central_directory_size >= ZipWriter.ZIP64_LIMIT:
+            zip64_end_record_offset = f.tell()
+
+            f.write(ZipWriter.ZIP64_END_RECORD.pack(ZipWriter.ZIP64_END_RECORD_SIGNATURE, 44,
+                                                    ZipWriter.ZIP64_VERSION, ZipWriter.ZIP64_VERSION, 0, 0,
+                                                    count, count, central_directory_size, central_directory_offset))
+            f.write(ZipWriter.ZIP64_END_LOCATOR.pack(ZipWriter.ZIP64_END_LOCATOR_SIGNATURE, 0, zip64_end_record_offset, 1))
+
+            count = min(count, ZipWriter.ZIP64_COUNT_LIMIT)
+            central_directory_size = min(central_directory_size, ZipWriter.ZIP64_LIMIT)
+            central_directory_offset = min(central_directory_offset, ZipWriter.ZIP64_LIMIT)
+
+        f.write(ZipWriter.END_RECORD.pack(ZipWriter.END_RECORD_SIGNATURE, 0, 0, count, count,
+                                          central_directory_size, central_directory_offset, 0))
+
+    def _iter_chunks(self, source_path: str) -> typing.Generator:
+        """Yields (data, data before chunk up to window size, whether chunk is last) for file"""
+        with open(source_path, mode='rb') as source:
+            data = source.read(ZipWriter.CHUNK_SIZE)
+            window = b''
+
+            while True:
+                next_data = source.read(ZipWriter.CHUNK_SIZE)
+                yield data, window, not next_data
+
+                if not next_data:
+                    return
+
+                window = (window + data)[-ZipWriter.WINDOW_SIZE:]
+                data = next_data
+
+    @staticmethod
+    def _get_crc(source_path: str) -> int:
+        crc = 0
+        with open(source_path, mode='rb') as source:
+            for data in iter(lambda: source.read(ZipWriter.CHUNK_SIZE), b''):
+                crc = zlib.crc32(data, crc)
+        return crc
+
+    @staticmethod
+    def _read_previous(previous_path: str) -> dict:
+        """Returns ZipInfo of members in previous ZIP file by name, or an empty dict if the file cannot be read"""
+        if not previous_path or not os.path.isfile(previous_path):
+            return {}
+
+        try:
+            with zipfile.ZipFile(previous_path) as z:
+                return {info.filename: info for info in z.infolist()}
+        except (OSError, zipfile.BadZipFile) as e:
+            ZipWriter.log.debug(f'Cannot reuse members of previous ZIP file "{previous_path}": {e}')
+            return {}
+
+    def _is_reusable(self, info: zipfile.ZipInfo, previous_info: zipfile.ZipInfo) -> bool:
+        """Returns True if member of previous ZIP file may hold data for file, before comparing CRCs"""
+        return previous_info.compress_type == self.compress_type \
+            and previous_info.file_size == info.file_size \
+            and ZipWriter._get_dos_time(previous_info) == ZipWriter._get_dos_time(info) \
+            and not previous_info.flag_bits & ZipWriter.FLAG_ENCRYPTED
+
+    @staticmethod
+    def _copy_member(previous: typing.BinaryIO, previous_info: zipfile.ZipInfo, f: typing.BinaryIO) -> int:
+        """Copies compressed data of member from previous ZIP file and returns number of bytes copied"""
+        previous.seek(previous_info.header_offset)
+
+        header = previous.read(ZipWriter.LOCAL_HEADER.size)
+        if len(header) != ZipWriter.LOCAL_HEADER.size:
+            raise PackageError(f'Cannot read member of previous ZIP file: "{previous_info.filename}"')
+
+        signature, *_, name_length, extra_length = ZipWriter.LOCAL_HEADER.unpack(header)
+        if signature != ZipWriter.LOCAL_HEADER_SIGNATURE:
+            raise PackageError(f'Cannot read member of previous ZIP file: "{previous_info.filename}"')
+
+        previous.seek(name_length + extra_length, os.SEEK_CUR)
+
+        size = previous_info.compress_size
+        while size > 0:
+            data = previous.read(min(size, ZipWriter.CHUNK_SIZE))
+            if not data:
+                raise PackageError(f'Cannot read member of previous ZIP file: "{previous_info.filename}"')
+            f.write(data)
+            size -= len(data)
+
+        return previous_info.compress_size
+
+    def write(self, file_path: str, members: list, *, previous_path: str = '') -> list:
+        """
+        Writes ZIP file containing (source path, archive name) members and returns their ZipInfo in member order
+
+        Member data is compressed when the compression type is deflate and stored otherwise. Members of the
+        previous ZIP file with the same name, compression type, size, modified time, and CRC are copied as is.
+        """
+        previous_infos: dict = self._read_previous(previous_path)
+
+        infos: list = []
+        seconds_by_member: list = []
+
+        # actions are completed in order, so data is written in member order however chunks finish
+        pending: collections.deque = collections.deque()
+        max_pending = self.worker_limit * ZipWriter.CHUNKS_PER_WORKER
+
+        with open(file_path, mode='wb') as f, \
+                open(previous_path if previous_infos else os.devnull, mode='rb') as previous, \
+                concurrent.futures.ThreadPoolExecutor(max_workers=self.worker_limit) as executor:
+
+            def _complete(limit: int) -> None:
+                while len(pending) > limit:
+                    action, index, zip64, value = pending.popleft()
+                    info = infos[index]
+
+                    if action == 'start':
+                        info.header_offset = f.tell()
+                        f.write(self._get_local_header(info, zip64))
+
+                    elif action == 'data':
+                        packed_data, seconds = value.result() if isinstance(value, concurrent.futures.Future) else value
+                        f.write(packed_data)
+                        info.compress_size += len(packed_data)
+                        seconds_by_member[index] += seconds
+
+                    elif action == 'copy':
+                        info.compress_size += self._copy_member(previous, value, f)
+
+                    else:
+                        if not zip64 and info.compress_size >= ZipWriter.ZIP64_LIMIT:
+                            raise PackageError(f'Cannot write compressed member larger than expected: "{info.filename}"')
+
+                        # the local header is rewritten with the final CRC and compressed size
+                        end_offset = f.tell()
+                        f.seek(info.header_offset)
+                        f.write(self._get_local_header(info, zip64))
+                        f.seek(end_offset)
+
+                        extension = os.path.splitext(info.filename)[1].casefold()
+                        self.compression_data.add(extension, info.file_size, info.compress_size, seconds_by_member[index],
+                                                  stored=info.compress_type == zipfile.ZIP_STORED)
+
+            for source_path, arcname in members:
+                info = zipfile.ZipInfo.from_file(source_path, arcname)
+                info.compress_type = self.compress_type
+                info.compress_size = 0
+                info.CRC = 0
+
+                index = len(infos)
+                infos.append(info)
+                seconds_by_member.append(0.0)
+
+                # same margin as zipfile, since deflated data can be larger than its input
+                zip64 = info.file_size * 1.05 > ZipWriter.ZIP64_LIMIT
+
+                pending.append(('start', index, zip64, None))
+
+                previous_info = previous_infos.get(info.filename)
+
+                if previous_info is not None and self._is_reusable(info, previous_info):
+                    crc = self._get_crc(source_path)
+
+                    if crc == previous_info.CRC:
+                        info.CRC = crc
+                        pending.append(('copy', index, zip64, previous_info))
+                        pending.append(('end', index, zip64, None))
+                        self.reused_count += 1
+                        _complete(max_pending)
+                        continue
+
+                crc = 0
+                file_size = 0
+
+                for data, window, final in self._iter_chunks(source_path):
+                    crc = zlib.crc32(data, crc)
+                    file_size += len(data)
+
+                    if self.compress_type == zipfile.ZIP_STORED:
+                        value: typing.Union[tuple, concurrent.futures.Future] = (data, 0.0)
+                    elif self.worker_limit == 1:
+                        value = self._deflate(data, window, final, self.level)
+                    else:
+                        value = executor.submit(ZipWriter._deflate, data, window, final, self.level)
+
+                    pending.append(('data', index, zip64, value))
+
+                    _complete(max_pending)
+
+                if file_size != info.file_size:
+                    raise PackageError(f'Cannot add file that changed while ZIP file was being written: "{source_path}"')
+
+                info.CRC = crc
+                pending.append(('end', index, zip64, None))
+
+            _complete(0)
+
+            self._write_end_records(f, infos)
+
+        ZipWriter.log.debug(f'Wrote {len(infos)} files to "{file_path}"')
+
+        return infos
@@ -0,0 +1,73 @@
+import dataclasses
+import json
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True, slots=True)
+class BuildConfig:
+    """
+    Paths and settings resolved once before the build phases run
+
+    Every phase reads the same snapshot, so paths are not resolved again inside per-script loops.
+    """
+    # project
+    input_path: str
+    project_path: str
+    program_path: str
+
+    # game
+    game_type: str
+    game_path: str
+    registry_path: str
+
+    # compiler
+    compiler_path: str
+    compiler_config_path: str
+    flags_path: str
+    output_path: str
+    import_paths: tuple
+    using_caprica: bool
+    optimize: bool
+    release: bool
+    final: bool
+
+    # build
+    worker_limit: int
+    ignore_errors: bool
+    no_incremental_build: bool
+    no_parallel: bool
+    anonymize: bool
+    package: bool
+    zip: bool
+
+    # bsarch
+    bsarch_path: str
+    native_packager: bool
+    verify_packages: bool
+    package_path: str
+    temp_path: str
+
+    # zip
+    zip_compression: str
+    zip_output_path: str
+
+    # remote
+    remote_temp_path: str
+
+    # program
+    cache_path: str
+    log_path: str
+    report_path: str
+
+    def to_dict(self) -> dict:
+        return dataclasses.asdict(self)
+
+    def to_json(self) -> str:
+        """Returns resolved configuration as JSON with stable key order for diffing between runs"""
+        return json.dumps(self.to_dict(), indent=2)
+
+    def dump(self, path: str) -> None:
+        """Writes resolved configuration to path as JSON"""
+        with open(path, mode='w', encoding='utf-8') as f:
+            f.write(self.to_json())
+            f.write('\n')
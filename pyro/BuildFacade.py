@@ -4,11 +4,13 @@ import os
 import sys
 import time
 from typing import Union
-from copy import deepcopy
 
 import psutil
 
 from pyro.Anonymizer import Anonymizer
+from pyro.BuildConfig import BuildConfig
+from pyro.Exceptions import AnonymizeError
+from pyro.IncludeCache import IncludeCache
 from pyro.PackageManager import PackageManager
 from pyro.PapyrusProject import PapyrusProject
 from pyro.PathHelper import PathHelper
@@ -20,36 +22,40 @@ from pyro.PexReader import PexReader
 from pyro.ProcessManager import ProcessManager
 from pyro.Enums.ProcessState import ProcessState
 
-from pyro.Comparators import (endswith,
-                              startswith)
+from pyro.Comparators import endswith
 
 
 class BuildFacade:
     log: logging.Logger = logging.getLogger('pyro')
 
     ppj: PapyrusProject
+    config: BuildConfig
 
-    compile_data: CompileData = CompileData()
-    compile_data_caprica: CompileData = CompileDataCaprica()
-    package_data: PackageData = PackageData()
-    zipping_data: ZippingData = ZippingData()
+    compile_data: CompileData
+    compile_data_caprica: CompileDataCaprica
+    package_data: PackageData
+    zipping_data: ZippingData
+
+    include_cache: IncludeCache
+    reports: list
 
     def __init__(self, ppj: PapyrusProject) -> None:
         self.ppj = ppj
 
-        self.scripts_count = len(self.ppj.psc_paths)
+        self.compile_data = CompileData()
+        self.compile_data_caprica = CompileDataCaprica()
+        self.package_data = PackageData()
+        self.zipping_data = ZippingData()
 
-        # WARN: if methods are renamed and their respective option names are not, this will break.
-        options: dict = deepcopy(self.ppj.options.__dict__)
+        # files matched by include patterns are shared by the packaging and zipping phases
+        self.include_cache = IncludeCache()
 
-        for key in options:
-            if key in ('args', 'input_path', 'anonymize', 'package', 'zip', 'zip_compression'):
-                continue
-            if startswith(key, ('ignore_', 'no_', 'force_', 'create_', 'resolve_'), ignorecase=True):
-                continue
-            if endswith(key, '_token', ignorecase=True):
-                continue
-            setattr(self.ppj.options, key, getattr(self.ppj, f'get_{key}')())
+        # payload reports of packages and zip files, in the order that they were written
+        self.reports = []
+
+        self.scripts_count = len(self.ppj.psc_paths)
+
+        self.config = self.ppj.get_build_config()
 
     def _find_modified_scripts(self) -> list:
         pex_paths: list = []
@@ -70,8 +76,7 @@ class BuildFacade:
             try:
                 header = PexReader.get_header(pex_path)
             except ValueError:
-                BuildFacade.log.error(f'Cannot determine compilation time due to unknown magic: "{pex_path}"')
-                sys.exit(1)
+                raise AnonymizeError(f'Cannot determine compilation time due to unknown magic: "{pex_path}"')
 
             psc_last_modified: float = os.path.getmtime(script_path)
             pex_last_compiled: float = float(header.compilation_time.value)
@@ -88,20 +93,19 @@ class BuildFacade:
         process.nice(psutil.BELOW_NORMAL_PRIORITY_CLASS if sys.platform == 'win32' else 19)
 
     def get_compile_data(self) -> Union[CompileData, CompileDataCaprica]:
-        using_caprica = endswith(self.ppj.get_compiler_path(), 'Caprica.exe', ignorecase=True)
-        return self.compile_data_caprica if using_caprica else self.compile_data
+        return self.compile_data_caprica if self.config.using_caprica else self.compile_data
 
     def try_compile(self) -> None:
         """Builds and passes commands to Papyrus Compiler"""
-        using_caprica = endswith(self.ppj.get_compiler_path(), 'Caprica.exe', ignorecase=True)
+        using_caprica = self.config.using_caprica
 
         compile_data = self.get_compile_data()
 
-        compile_data.command_count, commands = self.ppj.build_commands()
+        compile_data.command_count, commands = self.ppj.build_commands(self.config)
 
         compile_data.time.start_time = time.time()
 
-        if using_caprica or self.ppj.options.no_parallel or compile_data.command_count == 1:
+        if using_caprica or self.config.no_parallel or compile_data.command_count == 1:
             for command in commands:
                 BuildFacade.log.debug(f'Command: {command}')
                 if ProcessManager.run_compiler(command) == ProcessState.SUCCESS:
@@ -109,7 +113,7 @@ class BuildFacade:
 
         elif compile_data.command_count > 0:
             multiprocessing.freeze_support()
-            worker_limit = min(compile_data.command_count, self.ppj.options.worker_limit)
+            worker_limit = min(compile_data.command_count, self.config.worker_limit)
             with multiprocessing.Pool(processes=worker_limit,
                                       initializer=BuildFacade._limit_priority) as pool:
                 for state in pool.imap(ProcessManager.run_compiler, commands):
@@ -120,6 +124,9 @@ class BuildFacade:
 
         compile_data.time.end_time = time.time()
 
+        # compiled scripts may be included by packages and zip files
+        self.include_cache.invalidate(self.config.output_path)
+
         # caprica success = all files compiled
         if using_caprica and compile_data.success_count > 0:
             compile_data.scripts_count = compile_data.command_count
@@ -129,29 +136,33 @@ class BuildFacade:
         """Obfuscates identifying metadata in compiled scripts"""
         scripts: list = self._find_modified_scripts()
 
-        if not scripts and not self.ppj.missing_scripts and not self.ppj.options.no_incremental_build:
+        if not scripts and not self.ppj.missing_scripts and not self.config.no_incremental_build:
             BuildFacade.log.error('Cannot anonymize compiled scripts because no source scripts were modified')
         else:
             # these are absolute paths. there's no reason to manipulate them.
             for pex_path in self.ppj.pex_paths:
                 if not os.path.isfile(pex_path):
-                    BuildFacade.log.error(f'Cannot locate file to anonymize: "{pex_path}"')
-                    sys.exit(1)
+                    raise AnonymizeError(f'Cannot locate file to anonymize: "{pex_path}"')
 
                 Anonymizer.anonymize_script(pex_path)
 
     def try_pack(self) -> None:
         """Generates BSA/BA2 packages for project"""
         self.package_data.time.start_time = time.time()
-        package_manager = PackageManager(self.ppj)
+        package_manager = PackageManager(self.ppj, self.config, self.include_cache)
         package_manager.create_packages()
         self.package_data.time.end_time = time.time()
         self.package_data.file_count = package_manager.includes
+        self.package_data.rebuilt_count = package_manager.rebuilt_count
+        self.package_data.skipped_count = package_manager.skipped_count
+        self.package_data.compression = package_manager.compression_data
+        self.reports.extend(package_manager.reports)
 
     def try_zip(self) -> None:
         """Generates ZIP file for project"""
         self.zipping_data.time.start_time = time.time()
-        package_manager = PackageManager(self.ppj)
+        package_manager = PackageManager(self.ppj, self.config, self.include_cache)
         package_manager.create_zip()
         self.zipping_data.time.end_time = time.time()
         self.zipping_data.file_count = package_manager.includes
+        self.reports.extend(package_manager.reports)
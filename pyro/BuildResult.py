@@ -0,0 +1,28 @@
+from dataclasses import (dataclass,
+                         field)
+from typing import (Optional,
+                    Union)
+
+from pyro.BuildConfig import BuildConfig
+from pyro.Performance.CompileData import (CompileData,
+                                          CompileDataCaprica)
+from pyro.Performance.PackageData import PackageData
+from pyro.Performance.ZippingData import ZippingData
+
+
+@dataclass
+class BuildResult:
+    input_path: str
+    config: Optional[BuildConfig] = field(init=False, default=None)
+    scripts_count: int = field(init=False, default_factory=int)
+    compile_data: Union[CompileData, CompileDataCaprica] = field(init=False, default_factory=CompileData)
+    package_data: PackageData = field(init=False, default_factory=PackageData)
+    zipping_data: ZippingData = field(init=False, default_factory=ZippingData)
+
+    @property
+    def failed_count(self) -> int:
+        return self.compile_data.failed_count
+
+    @property
+    def succeeded(self) -> bool:
+        return self.failed_count == 0
@@ -1,7 +1,8 @@
 import os
-from typing import Optional, Union
+from typing import TYPE_CHECKING, Optional, Union
 
-from lxml import etree
+if TYPE_CHECKING:
+    from lxml import etree
 
 
 def startswith(a_source: str, a_prefix: Union[str, tuple],
@@ -44,41 +45,45 @@ def endswith(a_source: str, a_suffix: Union[str, tuple],
     return False
 
 
-def is_command_node(node: etree.ElementBase) -> bool:
+def is_command_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Command') and node.text is not None
 
 
-def is_folder_node(node: etree.ElementBase) -> bool:
+def is_exclude_node(node: 'etree.ElementBase') -> bool:
+    return node is not None and endswith(node.tag, 'Exclude') and node.text is not None
+
+
+def is_folder_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Folder') and node.text is not None
 
 
-def is_import_node(node: etree.ElementBase) -> bool:
+def is_import_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Import') and node.text is not None
 
 
-def is_include_node(node: etree.ElementBase) -> bool:
+def is_include_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Include') and node.text is not None
 
 
-def is_match_node(node: etree.ElementBase) -> bool:
+def is_match_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Match') and node.text is not None
 
 
-def is_package_node(node: etree.ElementBase) -> bool:
+def is_package_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Package')
 
 
-def is_script_node(node: etree.ElementBase) -> bool:
+def is_script_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Script') and node.text is not None
 
 
-def is_variable_node(node: etree.ElementBase) -> bool:
+def is_variable_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'Variable')
 
 
-def is_zipfile_node(node: etree.ElementBase) -> bool:
+def is_zipfile_node(node: 'etree.ElementBase') -> bool:
     return node is not None and endswith(node.tag, 'ZipFile')
 
 
-def is_namespace_path(node: etree.ElementBase) -> bool:
+def is_namespace_path(node: 'etree.ElementBase') -> bool:
     return not os.path.isabs(node.text) and ':' in node.text
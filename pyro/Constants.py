@@ -15,6 +15,11 @@ class GameName(Constant):
     TES5: str = 'Skyrim'
 
 
+class ProgramInfo(Constant):
+    NAME: str = 'Pyro'
+    VERSION: str = '1.0.0.0'
+
+
 class GameType(Constant):
     FO4: str = 'fo4'
     SF1: str = 'sf1'
@@ -31,7 +36,9 @@ class XmlAttributeName(Constant):
     FLAGS: str = 'Flags'
     GAME: str = 'Game'
     IN: str = 'In'
+    MAX_SIZE: str = 'MaxSize'
     NAME: str = 'Name'
+    NO_COMPRESS: str = 'NoCompress'
     NO_RECURSE: str = 'NoRecurse'
     OPTIMIZE: str = 'Optimize'
     OUTPUT: str = 'Output'
@@ -39,12 +46,15 @@ class XmlAttributeName(Constant):
     PATH: str = 'Path'
     RELEASE: str = 'Release'
     ROOT_DIR: str = 'RootDir'
+    SPLIT: str = 'Split'
     USE_IN_BUILD: str = 'UseInBuild'
     VALUE: str = 'Value'
     ZIP: str = 'Zip'
 
 
 class XmlTagName(Constant):
+    EXCLUDE: str = 'Exclude'
+    EXCLUDES: str = 'Excludes'
     FOLDER: str = 'Folder'
     FOLDERS: str = 'Folders'
     IMPORT: str = 'Import'
@@ -72,4 +82,4 @@ class XmlTagName(Constant):
     ZIP_FILES: str = 'ZipFiles'
 
 
-__all__ = ['FlagsName', 'GameName', 'GameType', 'XmlAttributeName', 'XmlTagName']
+__all__ = ['FlagsName', 'GameName', 'GameType', 'ProgramInfo', 'XmlAttributeName', 'XmlTagName']
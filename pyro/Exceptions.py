@@ -0,0 +1,29 @@
+class PyroError(Exception):
+    """
+    Base class for errors that stop a build
+
+    The exit code is returned to the shell when the error reaches the command line interface.
+    """
+    def __init__(self, message: str, *, exit_code: int = 1) -> None:
+        super().__init__(message)
+        self.exit_code: int = exit_code
+
+
+class ProjectError(PyroError):
+    """Raised when a project file, its variables, or the paths it references are invalid"""
+
+
+class RemoteError(PyroError):
+    """Raised when remote imports cannot be configured or downloaded"""
+
+
+class CompileError(PyroError):
+    """Raised when later phases cannot proceed because scripts failed to compile"""
+
+
+class AnonymizeError(PyroError):
+    """Raised when compiled scripts cannot be anonymized"""
+
+
+class PackageError(PyroError):
+    """Raised when packages or zip files cannot be created"""
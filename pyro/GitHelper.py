@@ -0,0 +1,45 @@
+import os
+import subprocess
+
+from pyro.PathHelper import PathHelper
+
+
+class GitHelper:
+    @staticmethod
+    def _run(arguments: list, cwd: str) -> str:
+        """Returns output of git command, raising OSError or subprocess.CalledProcessError on failure"""
+        process = subprocess.run(['git', *arguments],
+                                 cwd=cwd,
+                                 stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE,
+                                 encoding='utf-8',
+                                 check=True)
+        return process.stdout
+
+    @staticmethod
+    def get_toplevel_path(path: str) -> str:
+        """Returns absolute path to root of working tree containing path"""
+        return os.path.normpath(GitHelper._run(['rev-parse', '--show-toplevel'], path).strip())
+
+    @staticmethod
+    def get_changed_paths(path: str, ref: str) -> list:
+        """
+        Returns absolute paths to existing files changed since ref in working tree containing path
+
+        Includes committed, staged, unstaged, and untracked files. Deleted files are excluded.
+        """
+        toplevel_path = GitHelper.get_toplevel_path(path)
+
+        changed_files: str = GitHelper._run(['diff', '--name-only', '-z', ref, '--'], toplevel_path)
+        untracked_files: str = GitHelper._run(['ls-files', '--others', '--exclude-standard', '-z'], toplevel_path)
+
+        results: list = []
+
+        for relpath in (changed_files + untracked_files).split('\0'):
+            if not relpath:
+                continue
+            file_path = os.path.normpath(os.path.join(toplevel_path, relpath))
+            if os.path.isfile(file_path):
+                results.append(file_path)
+
+        return PathHelper.uniqify(results)
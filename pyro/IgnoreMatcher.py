@@ -0,0 +1,30 @@
+import os
+from typing import Any
+
+from wcmatch import wcmatch
+
+from pyro.IgnoreRules import IgnoreRules
+
+
+class IgnoreMatcher(wcmatch.WcMatch):
+    """
+    Directory walker that prunes ignored folders before descending into them
+
+    Usage: IgnoreMatcher(root_dir, file_pattern, flags=flags, ignore_rules=rules)
+    """
+    ignore_rules: IgnoreRules
+
+    def on_init(self, **kwargs: Any) -> None:  # type: ignore
+        self.ignore_rules = kwargs.get('ignore_rules') or IgnoreRules('')
+
+    def on_validate_directory(self, base: str, name: str) -> bool:
+        return not self.ignore_rules.is_excluded(os.path.join(base, name), True, root_path=self._root_dir)
+
+    def on_validate_file(self, base: str, name: str) -> bool:
+        return not self.ignore_rules.is_excluded(os.path.join(base, name), False, root_path=self._root_dir)
+
+    def imatch(self) -> Any:  # type: ignore
+        # the root folder itself may be ignored
+        if self.ignore_rules.is_ignored(self._root_dir, True):
+            return
+        yield from super().imatch()
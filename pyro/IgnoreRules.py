@@ -0,0 +1,187 @@
+import os
+import re
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class IgnoreRule:
+    pattern: re.Pattern
+    negate: bool
+    dir_only: bool
+    anchored: bool
+
+
+class IgnoreRules:
+    """
+    Ordered list of patterns with gitignore semantics
+
+    Anchored patterns (patterns containing a separator before the last character) are relative to the base path.
+    Other patterns match at any depth. The last matching pattern wins. Matching is case-insensitive.
+    """
+    def __init__(self, base_path: str) -> None:
+        self.base_path: str = os.path.normpath(base_path)
+        self.rules: list = []
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    @staticmethod
+    def _translate(pattern: str) -> str:
+        """Returns regular expression from gitignore-style wildcard pattern"""
+        results: list = []
+
+        i, n = 0, len(pattern)
+
+        while i < n:
+            c = pattern[i]
+
+            if c == '*':
+                # '**' is only special when it is an entire path component
+                if pattern[i:i + 2] == '**' and (i == 0 or pattern[i - 1] == '/') and (i + 2 == n or pattern[i + 2] == '/'):
+                    if i + 2 == n:
+                        results.append('.*')
+                        i += 2
+                    else:
+                        results.append('(?:.*/)?')
+                        i += 3
+                    continue
+                results.append('[^/]*')
+
+            elif c == '?':
+                results.append('[^/]')
+
+            elif c == '[':
+                j = i + 1
+                if j < n and pattern[j] in '!^':
+                    j += 1
+                if j < n and pattern[j] == ']':
+                    j += 1
+                while j < n and pattern[j] != ']':
+                    j += 1
+
+                if j >= n:
+                    results.append(re.escape(c))
+                else:
+                    chars = pattern[i + 1:j].replace('\\', '\\\\')
+                    if chars[0] in '!^':
+                        chars = '^' + chars[1:]
+                    results.append(f'[{chars}]')
+                    i = j
+
+            elif c == '\\' and i + 1 < n:
+                i += 1
+                results.append(re.escape(pattern[i]))
+
+            else:
+                results.append(re.escape(c))
+
+            i += 1
+
+        return ''.join(results)
+
+    def add(self, line: str) -> None:
+        """Adds rule from a line in gitignore format"""
+        # trailing spaces are ignored unless escaped
+        pattern: str = line.rstrip('\r\n')
+        while pattern.endswith(' ') and not pattern.endswith('\\ '):
+            pattern = pattern[:-1]
+
+        if not pattern or pattern.startswith('#'):
+            return
+
+        negate = pattern.startswith('!')
+        if negate:
+            pattern = pattern[1:]
+        elif pattern.startswith(('\\!', '\\#')):
+            pattern = pattern[1:]
+
+        dir_only = pattern.endswith('/')
+        if dir_only:
+            pattern = pattern.rstrip('/')
+
+        if not pattern:
+            return
+
+        anchored = '/' in pattern
+        if anchored:
+            pattern = pattern.lstrip('/')
+            expression = f'^{self._translate(pattern)}$'
+        else:
+            expression = f'(?:^|/){self._translate(pattern)}$'
+
+        self.rules.append(IgnoreRule(re.compile(expression, flags=re.IGNORECASE | re.DOTALL), negate, dir_only, anchored))
+
+    def add_file(self, path: str) -> None:
+        """Adds rules from file in gitignore format"""
+        with open(path, encoding='utf-8') as f:
+            for line in f:
+                self.add(line)
+
+    def _relpath(self, path: str, root_path: str) -> tuple:
+        """Returns (relative path with forward slashes, whether relative to base path)"""
+        path = os.path.normpath(path)
+
+        for base_path, is_base in ((self.base_path, True), (root_path, False)):
+            if not base_path:
+                continue
+            try:
+                relpath = os.path.relpath(path, base_path)
+            except ValueError:  # paths on different drives
+                continue
+            if relpath == os.pardir or relpath.startswith(os.pardir + os.sep):
+                continue
+            return relpath.replace(os.sep, '/'), is_base
+
+        return path.replace(os.sep, '/'), False
+
+    def _match(self, relpath: str, is_dir: bool, is_base: bool) -> bool:
+        result = False
+
+        for rule in self.rules:
+            if rule.dir_only and not is_dir:
+                continue
+            if rule.anchored and not is_base:
+                continue
+            if rule.pattern.search(relpath):
+                result = not rule.negate
+
+        return result
+
+    def is_excluded(self, path: str, is_dir: bool, *, root_path: str = '') -> bool:
+        """
+        Returns True if path matches rules without checking parent folders
+
+        Use this method when walking a tree whose ignored folders are pruned before they are entered.
+        Paths outside the base path are matched relative to the root path against unanchored rules only.
+        """
+        if not self.rules:
+            return False
+
+        relpath, is_base = self._relpath(path, root_path)
+
+        if relpath == os.curdir:
+            return False
+
+        return self._match(relpath, is_dir, is_base)
+
+    def is_ignored(self, path: str, is_dir: bool, *, root_path: str = '') -> bool:
+        """Returns True if path or any parent folder of path matches rules"""
+        if not self.rules:
+            return False
+
+        relpath, is_base = self._relpath(path, root_path)
+
+        if relpath == os.curdir:
+            return False
+
+        parts: list = relpath.split('/')
+
+        # files cannot be re-included when a parent folder is ignored
+        for i in range(1, len(parts)):
+            if self._match('/'.join(parts[:i]), True, is_base):
+                return True
+
+        return self._match(relpath, is_dir, is_base)
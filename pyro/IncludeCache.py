@@ -0,0 +1,53 @@
+import os
+import threading
+import typing
+
+
+class IncludeCache:
+    """
+    Stores files matched by include patterns for the length of a build
+
+    Entries are keyed by everything that determines the files a pattern matches, including its root folder.
+    Entries are invalidated when a build phase writes a file into their root folders, and cleared after events,
+    whose commands can add or remove files anywhere.
+    """
+    def __init__(self) -> None:
+        self._results: dict = {}
+        self._generation: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        """Returns number of invalidations, which callers compare to detect writes during a traversal"""
+        with self._lock:
+            return self._generation
+
+    def get(self, key: tuple) -> typing.Optional[list]:
+        """Returns copy of files stored under key, or None"""
+        with self._lock:
+            entry = self._results.get(key)
+            return list(entry[1]) if entry is not None else None
+
+    def put(self, key: tuple, root: str, results: list, generation: int) -> None:
+        """Stores files under key unless any entry was invalidated after generation"""
+        with self._lock:
+            # files written while the folder was walked may be missing from results
+            if generation == self._generation:
+                self._results[key] = (os.path.normcase(root), list(results))
+
+    def clear(self) -> None:
+        """Removes all entries"""
+        with self._lock:
+            self._generation += 1
+            self._results.clear()
+
+    def invalidate(self, path: str) -> None:
+        """Removes entries for root folders containing path or contained by path"""
+        path = os.path.normcase(os.path.abspath(path))
+
+        with self._lock:
+            self._generation += 1
+
+            for key, (root, _) in list(self._results.items()):
+                if path == root or path.startswith(root.rstrip(os.sep) + os.sep) or root.startswith(path + os.sep):
+                    del self._results[key]
@@ -0,0 +1,255 @@
+import os
+import typing
+from dataclasses import (dataclass,
+                         field)
+
+from wcmatch import (fnmatch,
+                     glob)
+
+from pyro.IgnoreRules import IgnoreRules
+from pyro.IncludeCache import IncludeCache
+
+
+@dataclass
+class IncludePattern:
+    """
+    Pattern evaluated against files under its root folder
+
+    Glob patterns match paths relative to the root. Match patterns match file names, like WcMatch.
+    """
+    root: str
+    user_path: str
+    pattern: str
+    is_glob: bool
+    recursive: bool
+    exclude_pattern: str = ''
+    ignore_root: str = ''
+    max_depth: typing.Optional[int] = None
+    allow_hidden: bool = False
+    flags: int = 0
+    results: list = field(default_factory=list)
+
+    @property
+    def key(self) -> tuple:
+        """Returns values that determine the files that pattern matches"""
+        return (os.path.normcase(self.root), self.pattern, self.is_glob, self.recursive, self.exclude_pattern,
+                os.path.normcase(self.ignore_root), self.max_depth, self.allow_hidden, self.flags)
+
+    def match_dir(self, path: str, relpath: str, name: str, ignore_rules: IgnoreRules) -> bool:
+        """Returns True if files in folder at path relative to root can match pattern"""
+        if not self.recursive:
+            return False
+
+        if name.startswith('.') and not self.allow_hidden:
+            return False
+
+        if self.max_depth is not None and relpath.count('/') + 1 > self.max_depth:
+            return False
+
+        if self.exclude_pattern and fnmatch.fnmatch(name, self.exclude_pattern, flags=self.flags):
+            return False
+
+        return not ignore_rules.is_excluded(path, True, root_path=self.ignore_root)
+
+    def match_file(self, path: str, relpath: str, name: str, ignore_rules: IgnoreRules) -> bool:
+        """Returns True if file at path relative to root matches pattern"""
+        if self.is_glob:
+            if not glob.globmatch(relpath, self.pattern, flags=self.flags):
+                return False
+        elif name.startswith('.') or not fnmatch.fnmatch(name, self.pattern, flags=self.flags):
+            return False
+
+        return not ignore_rules.is_excluded(path, False, root_path=self.ignore_root)
+
+
+class IncludeMatcher:
+    """
+    Evaluates all include patterns of a node in one traversal of each folder tree
+
+    Patterns are grouped by root folder. Patterns whose roots are inside another root are evaluated during the
+    traversal of the outer root. Files matched by more than one pattern with the same user path are yielded once.
+
+    Files matched by patterns are stored in the cache, if any, so that other nodes with the same patterns do not walk
+    the same folders again.
+
+    Usage: matcher = IncludeMatcher(ignore_rules, cache); matcher.add_glob(...); matcher.add_match(...); matcher.imatch()
+    """
+    GLOB_FLAGS: int = glob.NODIR | glob.SPLIT | glob.IGNORECASE | glob.MINUSNEGATE
+    MATCH_FLAGS: int = fnmatch.SPLIT | fnmatch.IGNORECASE | fnmatch.NEGATE | fnmatch.MINUSNEGATE
+
+    MAGIC_CHARS: str = '*?[|'
+
+    def __init__(self, ignore_rules: typing.Optional[IgnoreRules] = None, cache: typing.Optional[IncludeCache] = None) -> None:
+        self.ignore_rules: IgnoreRules = ignore_rules or IgnoreRules('')
+        self.cache: typing.Optional[IncludeCache] = cache
+
+        # results depend on ignore rules, so cached results are only shared by matchers with the same rules
+        self.cache_key: tuple = (ignore_rules,)
+
+        # files and patterns in the order that they were added, so that results keep node order
+        self.items: list = []
+
+    def add_file(self, path: str, user_path: str) -> None:
+        """Adds file that is included without matching"""
+        self.items.append((path, user_path))
+
+    def add_glob(self, pattern: str, root_path: str, user_path: str, no_recurse: bool) -> None:
+        """Adds glob pattern with forward slashes that is relative to root path unless absolute"""
+        parts: list = pattern.split('/')
+
+        # folders before the first wildcard become part of the root, so that only matching folders are walked
+        literal_parts: list = []
+        if not pattern.startswith('-') and '|' not in pattern:
+            for part in parts[:-1]:
+                if any(c in part for c in IncludeMatcher.MAGIC_CHARS):
+                    break
+                literal_parts.append(part)
+
+        remainder: str = '/'.join(parts[len(literal_parts):])
+        root: str = os.path.normpath(os.path.join(root_path, '/'.join(literal_parts) or os.curdir))
+
+        flags = IncludeMatcher.GLOB_FLAGS
+        max_depth: typing.Optional[int] = None
+
+        if not no_recurse:
+            flags |= glob.GLOBSTAR
+
+            # patterns without separators match file names at any depth
+            if '/' not in pattern:
+                flags |= glob.MATCHBASE
+
+        if not flags & glob.MATCHBASE and not (flags & glob.GLOBSTAR and '**' in remainder) and '|' not in remainder:
+            max_depth = remainder.count('/')
+
+        self.items.append(IncludePattern(root=root,
+                                         user_path=user_path,
+                                         pattern=remainder,
+                                         is_glob=True,
+                                         recursive=max_depth is None or max_depth > 0,
+                                         ignore_root=root_path,
+                                         max_depth=max_depth,
+                                         allow_hidden='/.' in f'/{remainder}',
+                                         flags=flags))
+
+    def add_match(self, root: str, pattern: str, user_path: str, no_recurse: bool, exclude_pattern: str = '') -> None:
+        """Adds file name pattern matched in root folder and, unless no recurse is set, its subfolders"""
+        self.items.append(IncludePattern(root=os.path.normpath(root),
+                                         user_path=user_path,
+                                         pattern=pattern,
+                                         is_glob=False,
+                                         recursive=not no_recurse,
+                                         exclude_pattern=exclude_pattern,
+                                         ignore_root=os.path.normpath(root),
+                                         flags=IncludeMatcher.MATCH_FLAGS))
+
+    def _walk(self, walk_root: str, patterns: list) -> None:
+        """Traverses folder tree once, adding files matched by patterns whose roots are in tree to their results"""
+        patterns_by_root: dict = {}
+        for pattern in patterns:
+            patterns_by_root.setdefault(os.path.normcase(pattern.root), []).append(pattern)
+
+        stack: list = [(walk_root, [], frozenset())]
+
+        while stack:
+            dir_path, active, parent_paths = stack.pop()
+
+            # symlinked folders are followed, so folders that link to their own parents are skipped to avoid cycles
+            real_path = os.path.realpath(dir_path)
+            if real_path in parent_paths:
+                continue
+            parent_paths |= {real_path}
+
+            active = list(active)
+            for pattern in patterns_by_root.pop(os.path.normcase(dir_path), []):
+                # the root folder itself may be ignored, glob roots relative to the folder that globs are relative to
+                ignore_root = pattern.ignore_root if pattern.is_glob else ''
+                if not self.ignore_rules.is_ignored(dir_path, True, root_path=ignore_root):
+                    active.append((pattern, ''))
+
+            try:
+                with os.scandir(dir_path) as it:
+                    dir_entries: list = sorted(it, key=lambda e: e.name)
+            except OSError:
+                continue
+
+            sub_dirs: list = []
+
+            for dir_entry in dir_entries:
+                try:
+                    is_dir = dir_entry.is_dir()
+                except OSError:
+                    continue
+
+                if is_dir:
+                    sub_dirs.append(dir_entry)
+                    continue
+
+                for pattern, relpath in active:
+                    file_relpath = f'{relpath}/{dir_entry.name}' if relpath else dir_entry.name
+                    if pattern.match_file(dir_entry.path, file_relpath, dir_entry.name, self.ignore_rules):
+                        pattern.results.append(dir_entry.path)
+
+            # subfolders are pushed in reverse, so that they are walked in sorted order
+            for dir_entry in reversed(sub_dirs):
+                child_active: list = []
+                for pattern, relpath in active:
+                    dir_relpath = f'{relpath}/{dir_entry.name}' if relpath else dir_entry.name
+                    if pattern.match_dir(dir_entry.path, dir_relpath, dir_entry.name, self.ignore_rules):
+                        child_active.append((pattern, dir_relpath))
+
+                # folders must also be walked when they contain the roots of patterns that have not started yet
+                prefix = os.path.normcase(dir_entry.path) + os.sep
+                if child_active or any(root.startswith(prefix) for root in patterns_by_root):
+                    stack.append((dir_entry.path, child_active, parent_paths))
+
+    def imatch(self) -> typing.Generator:
+        """Yields (file path, user path) for files and pattern matches in the order that they were added"""
+        patterns: list = [item for item in self.items if isinstance(item, IncludePattern)]
+
+        generation: int = 0
+
+        if self.cache is not None:
+            generation = self.cache.generation
+
+            uncached_patterns: list = []
+
+            for pattern in patterns:
+                cached: typing.Optional[list] = self.cache.get(self.cache_key + pattern.key)
+                if cached is None:
+                    uncached_patterns.append(pattern)
+                else:
+                    pattern.results = cached
+
+            patterns = uncached_patterns
+
+        # roots inside other roots are walked with the outer root
+        roots: list = sorted({os.path.normcase(pattern.root) for pattern in patterns})
+        walk_roots: list = []
+        for root in roots:
+            if not any(root == walk_root or root.startswith(walk_root.rstrip(os.sep) + os.sep) for walk_root in walk_roots):
+                walk_roots.append(root)
+
+        for walk_root in walk_roots:
+            prefix = walk_root.rstrip(os.sep) + os.sep
+            walk_patterns = [p for p in patterns if os.path.normcase(p.root) == walk_root or os.path.normcase(p.root).startswith(prefix)]
+            # the first pattern with this root gives the walk root its original case
+            if os.path.isdir(walk_patterns[0].root):
+                self._walk(walk_patterns[0].root if os.path.normcase(walk_patterns[0].root) == walk_root else walk_root, walk_patterns)
+
+        if self.cache is not None:
+            for pattern in patterns:
+                self.cache.put(self.cache_key + pattern.key, pattern.root, pattern.results, generation)
+
+        results: set = set()
+
+        for item in self.items:
+            matches: typing.Iterator[tuple]
+            if isinstance(item, IncludePattern):
+                matches = ((path, item.user_path) for path in item.results)
+            else:
+                matches = iter((item,))
+
+            for match in matches:
+                if match not in results:
+                    results.add(match)
+                    yield match
@@ -0,0 +1,47 @@
+import contextlib
+import logging
+import threading
+import types
+import typing
+
+
+class LogBuffer(logging.Filter):
+    """
+    Holds records logged by a thread while it captures them, so that output of concurrent tasks is not interleaved
+
+    Usage: with buffer.capture() as records: ...; buffer.flush(records)
+    """
+    def __init__(self, logger: logging.Logger) -> None:
+        super().__init__()
+        self.logger: logging.Logger = logger
+        self._local: threading.local = threading.local()
+
+    def __enter__(self) -> 'LogBuffer':
+        self.logger.addFilter(self)
+        return self
+
+    def __exit__(self, exc_type: typing.Optional[type], exc_value: typing.Optional[BaseException],
+                 traceback: typing.Optional[types.TracebackType]) -> None:
+        self.logger.removeFilter(self)
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        records: typing.Optional[list] = getattr(self._local, 'records', None)
+        if records is None:
+            return True
+        records.append(record)
+        return False
+
+    @contextlib.contextmanager
+    def capture(self) -> typing.Generator:
+        """Holds records logged by current thread until the block exits"""
+        records: list = []
+        self._local.records = records
+        try:
+            yield records
+        finally:
+            self._local.records = None
+
+    def flush(self, records: list) -> None:
+        """Writes held records to the logger handlers"""
+        for record in records:
+            self.logger.handle(record)
@@ -0,0 +1,114 @@
+import hashlib
+import json
+import logging
+import os
+import typing
+
+
+class PackageCache:
+    """
+    Stores manifests of packages keyed by output path, so that packages whose inputs are unchanged are not built again
+
+    A manifest records the package that owns the archive, the archive settings, the archive path, size, and content
+    hash of every include, and the size and modification time of the package that was written.
+    """
+    log: logging.Logger = logging.getLogger('pyro')
+
+    # increment when manifests or the packages they describe change in ways that settings do not capture
+    VERSION: int = 3
+
+    def __init__(self, cache_path: str) -> None:
+        self.cache_path: str = os.path.join(cache_path, 'packages')
+
+    def _get_entry_path(self, file_path: str) -> str:
+        file_name = hashlib.sha1(os.path.normcase(file_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_path, f'{file_name}.json')
+
+    @staticmethod
+    def get_content_hash(path: str) -> str:
+        with open(path, mode='rb') as f:
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+
+    @staticmethod
+    def get_manifest(entries: list, settings: dict, owner: dict, previous: typing.Optional[dict] = None) -> dict:
+        """
+        Returns manifest for entries and archive settings, where owner identifies the project, package, and part
+
+        Content hashes are reused from the previous manifest for files whose source path, size,
+        and modification time are unchanged, so unchanged files are not read again.
+        """
+        known_files: dict = {}
+        if previous:
+            known_files = {(file['source'], file['size'], file['mtime_ns']): file['sha256'] for file in previous.get('files', [])}
+
+        files: list = []
+
+        for entry in sorted(entries, key=lambda e: e.archive_path.casefold()):
+            stat = os.stat(entry.source_path)
+            content_hash = known_files.get((entry.source_path, stat.st_size, stat.st_mtime_ns)) \
+                or PackageCache.get_content_hash(entry.source_path)
+
+            files.append({
+                'path': entry.archive_path,
+                'size': stat.st_size,
+                'sha256': content_hash,
+                'source': entry.source_path,
+                'mtime_ns': stat.st_mtime_ns,
+                'compress': entry.compress
+            })
+
+        return {'version': PackageCache.VERSION, 'owner': owner, 'settings': settings, 'files': files}
+
+    @staticmethod
+    def _get_contents(manifest: dict) -> tuple:
+        """Returns parts of manifest that determine package contents and ownership"""
+        files = tuple((file['path'], file['size'], file['sha256'], file['compress']) for file in manifest.get('files', []))
+        return manifest.get('version'), manifest.get('owner'), manifest.get('settings'), files
+
+    def is_current(self, file_path: str, manifest: dict, previous: typing.Optional[dict]) -> bool:
+        """Returns True if previous manifest describes the same contents and package is unchanged since it was written"""
+        if not previous or self._get_contents(manifest) != self._get_contents(previous):
+            return False
+
+        try:
+            stat = os.stat(file_path)
+        except OSError:
+            return False
+
+        output = previous.get('output', {})
+        return stat.st_size == output.get('size') and stat.st_mtime_ns == output.get('mtime_ns')
+
+    def load(self, file_path: str) -> typing.Optional[dict]:
+        """Returns manifest saved for package, or None if no valid manifest exists"""
+        try:
+            with open(self._get_entry_path(file_path), encoding='utf-8') as f:
+                manifest: dict = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        return manifest if manifest.get('version') == PackageCache.VERSION else None
+
+    def save(self, file_path: str, manifest: dict) -> None:
+        """Stores manifest for package with the size and modification time of the package as written"""
+        entry_path = self._get_entry_path(file_path)
+
+        try:
+            stat = os.stat(file_path)
+            manifest = {**manifest, 'output': {'path': file_path, 'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns}}
+
+            os.makedirs(self.cache_path, exist_ok=True)
+
+            # write to temporary file first so that concurrent builds never read a partial manifest
+            temp_path = f'{entry_path}.{os.getpid()}.tmp'
+            with open(temp_path, mode='w', encoding='utf-8') as f:
+                json.dump(manifest, f)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            PackageCache.log.warning(f'Cannot write package manifest: {e}')
+
+    def remove(self, file_path: str) -> None:
+        """Removes manifest for package, so that the package is rebuilt by the next build"""
+        try:
+            os.remove(self._get_entry_path(file_path))
+        except OSError:
+            pass
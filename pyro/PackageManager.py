@@ -1,14 +1,22 @@
+import concurrent.futures
 import logging
 import os
-import shutil
-import sys
+import re
+import time
 import typing
 import zipfile
 
 from lxml import etree
-from wcmatch import (glob,
-                     wcmatch)
 
+from pyro.Archives.ArchiveContents import ArchiveContents
+from pyro.Archives.ArchiveEntry import ArchiveEntry
+from pyro.Archives.ArchivePart import ArchivePart
+from pyro.Archives.ArchiveReader import ArchiveReader
+from pyro.Archives.Ba2Writer import Ba2Writer
+from pyro.Archives.BsaWriter import BsaWriter
+from pyro.Archives.CompressionPolicy import CompressionPolicy
+from pyro.Archives.ZipWriter import ZipWriter
+from pyro.BuildConfig import BuildConfig
 from pyro.CommandArguments import CommandArguments
 from pyro.Comparators import (endswith,
                               is_include_node,
@@ -19,50 +27,51 @@ from pyro.Comparators import (endswith,
 from pyro.CaseInsensitiveList import CaseInsensitiveList
 from pyro.Constants import (GameType,
                             XmlAttributeName)
+from pyro.Enums.ProcessState import ProcessState
+from pyro.Exceptions import (PackageError,
+                             PyroError)
+from pyro.IgnoreRules import IgnoreRules
+from pyro.IncludeCache import IncludeCache
+from pyro.IncludeMatcher import IncludeMatcher
+from pyro.LogBuffer import LogBuffer
+from pyro.PackageCache import PackageCache
 from pyro.PapyrusProject import PapyrusProject
+from pyro.Performance.CompressionData import CompressionData
+from pyro.Performance.PayloadReport import PayloadReport
 from pyro.ProcessManager import ProcessManager
-from pyro.ProjectOptions import ProjectOptions
+from pyro.StagingFolder import StagingFolder
 
 
 class PackageManager:
     log: logging.Logger = logging.getLogger('pyro')
 
     ppj: PapyrusProject
-    options: ProjectOptions
+    config: BuildConfig
     pak_extension: str = ''
     zip_extension: str = ''
 
-    DEFAULT_GLFLAGS = glob.NODIR | glob.MATCHBASE | glob.SPLIT | glob.REALPATH | glob.FOLLOW | glob.IGNORECASE | glob.MINUSNEGATE
-    DEFAULT_WCFLAGS = wcmatch.SYMLINKS | wcmatch.IGNORECASE | wcmatch.MINUSNEGATE
-
     COMPRESS_TYPE = {'store': 0, 'deflate': 8}
 
+    SIZE_UNITS = {'b': 1, 'kb': 1024, 'mb': 1024 ** 2, 'gb': 1024 ** 3}
+
     includes: int = 0
+    rebuilt_count: int = 0
+    skipped_count: int = 0
 
-    def __init__(self, ppj: PapyrusProject) -> None:
+    def __init__(self, ppj: PapyrusProject, config: BuildConfig, include_cache: typing.Optional[IncludeCache] = None) -> None:
         self.ppj = ppj
-        self.options = ppj.options
+        self.config = config
 
-        self.pak_extension = '.ba2' if self.options.game_type == GameType.FO4 else '.bsa'
-        self.zip_extension = '.zip'
-
-    @staticmethod
-    def _can_compress_package(containing_folder: str) -> bool:
-        flags = wcmatch.RECURSIVE | wcmatch.IGNORECASE
+        # shared between phases, so that packages and zip files with the same includes are resolved once per build
+        self.include_cache = include_cache or IncludeCache()
 
-        # voices bad because bethesda no likey
-        for _ in wcmatch.WcMatch(containing_folder, '*.fuz', flags=flags).imatch():
-            return False
+        self.compression_data = CompressionData()
 
-        # sounds bad because bethesda no likey
-        for _ in wcmatch.WcMatch(containing_folder, '*.wav|*.xwm', flags=flags).imatch():
-            return False
+        # payloads are only analyzed when a report is requested
+        self.reports: list = []
 
-        # strings bad because wrye bash no likey
-        for _ in wcmatch.WcMatch(containing_folder, '*.*strings', flags=flags).imatch():
-            return False
-
-        return True
+        self.pak_extension = '.ba2' if self.config.game_type in (GameType.FO4, GameType.SF1) else '.bsa'
+        self.zip_extension = '.zip'
 
     @staticmethod
     def _check_write_permission(file_path: str) -> None:
@@ -70,41 +79,31 @@ class PackageManager:
             try:
                 open(file_path, 'a').close()
             except PermissionError:
-                PackageManager.log.error(f'Cannot create file without write permission to: "{file_path}"')
-                sys.exit(1)
+                raise PackageError(f'Cannot create file without write permission to: "{file_path}"')
 
     @staticmethod
-    def _match(root_dir: str, file_pattern: str, *, exclude_pattern: str = '', user_path: str = '', no_recurse: bool = False) -> typing.Generator:
-        user_flags = wcmatch.RECURSIVE if not no_recurse else 0x0
-        matcher = wcmatch.WcMatch(root_dir, file_pattern,
-                                  exclude_pattern=exclude_pattern,
-                                  flags=PackageManager.DEFAULT_WCFLAGS | user_flags)
+    def _generate_include_paths(includes_node: etree.ElementBase, root_path: str, zip_mode: bool = False, *,
+                                ignore_rules: typing.Optional[IgnoreRules] = None,
+                                include_cache: typing.Optional[IncludeCache] = None) -> typing.Generator:
+        # all patterns are evaluated together, so each folder is walked once and duplicate matches are yielded once
+        matcher = IncludeMatcher(ignore_rules, include_cache)
 
-        matcher.on_reset()
-        matcher._skipped = 0
-        for file_path in matcher._walk():
-            yield file_path, user_path
-
-    @staticmethod
-    def _generate_include_paths(includes_node: etree.ElementBase, root_path: str, zip_mode: bool = False) -> typing.Generator:
         for include_node in filter(is_include_node, includes_node):
             attr_no_recurse: bool = include_node.get(XmlAttributeName.NO_RECURSE) == 'True'
             attr_path: str = include_node.get(XmlAttributeName.PATH).strip()
             search_path: str = include_node.text
 
             if not search_path:
-                PackageManager.log.error(f'Include path at line {include_node.sourceline} in project file is empty')
-                sys.exit(1)
+                raise PackageError(f'Include path at line {include_node.sourceline} in project file is empty')
 
             if not zip_mode and startswith(search_path, os.pardir):
-                PackageManager.log.error(f'Include paths cannot start with "{os.pardir}"')
-                sys.exit(1)
+                raise PackageError(f'Include paths cannot start with "{os.pardir}"')
 
             if startswith(search_path, os.curdir):
                 search_path = search_path.replace(os.curdir, root_path, 1)
 
             # fix invalid pattern with leading separator
-            if not zip_mode and startswith(search_path, (os.path.sep, os.path.altsep)):
+            if not zip_mode and startswith(search_path, (os.path.sep, os.path.altsep or os.path.sep)):
                 search_path = '**' + search_path
 
             if '\\' in search_path:
@@ -112,39 +111,28 @@ class PackageManager:
 
             # populate files list using glob patterns or relative paths
             if '*' in search_path:
-                for include_path in glob.iglob(search_path,
-                                               root_dir=root_path,
-                                               flags=PackageManager.DEFAULT_GLFLAGS | glob.GLOBSTAR if not attr_no_recurse else 0x0):
-                    yield os.path.join(root_path, include_path), attr_path
+                matcher.add_glob(search_path, root_path, attr_path, attr_no_recurse)
 
             elif not os.path.isabs(search_path):
                 test_path = os.path.normpath(os.path.join(root_path, search_path))
                 if os.path.isfile(test_path):
-                    yield test_path, attr_path
+                    matcher.add_file(test_path, attr_path)
                 elif os.path.isdir(test_path):
-                    yield from PackageManager._match(test_path, '*.*',
-                                                     user_path=attr_path,
-                                                     no_recurse=attr_no_recurse)
+                    matcher.add_match(test_path, '*.*', attr_path, attr_no_recurse)
                 else:
-                    for include_path in glob.iglob(search_path,
-                                                   root_dir=root_path,
-                                                   flags=PackageManager.DEFAULT_GLFLAGS | glob.GLOBSTAR if not attr_no_recurse else 0x0):
-                        yield os.path.join(root_path, include_path), attr_path
+                    matcher.add_glob(search_path, root_path, attr_path, attr_no_recurse)
 
             # populate files list using absolute paths
             else:
                 if not zip_mode and root_path not in search_path:
-                    PackageManager.log.error(f'Cannot include path outside RootDir: "{search_path}"')
-                    sys.exit(1)
+                    raise PackageError(f'Cannot include path outside RootDir: "{search_path}"')
 
                 search_path = os.path.abspath(os.path.normpath(search_path))
 
                 if os.path.isfile(search_path):
-                    yield search_path, attr_path
+                    matcher.add_file(search_path, attr_path)
                 else:
-                    yield from PackageManager._match(search_path, '*.*',
-                                                     user_path=attr_path,
-                                                     no_recurse=attr_no_recurse)
+                    matcher.add_match(search_path, '*.*', attr_path, attr_no_recurse)
 
         for match_node in filter(is_match_node, includes_node):
             attr_in: str = match_node.get(XmlAttributeName.IN).strip()
@@ -162,23 +150,19 @@ class PackageManager:
             if not os.path.isabs(in_path):
                 in_path = os.path.join(root_path, in_path)
             elif zip_mode and root_path not in in_path:
-                PackageManager.log.error(f'Cannot match path outside RootDir: "{in_path}"')
-                sys.exit(1)
+                raise PackageError(f'Cannot match path outside RootDir: "{in_path}"')
 
             if not os.path.isdir(in_path):
-                PackageManager.log.error(f'Cannot match path that does not exist or is not a directory: "{in_path}"')
-                sys.exit(1)
+                raise PackageError(f'Cannot match path that does not exist or is not a directory: "{in_path}"')
 
             match_text: str = match_node.text
 
             if startswith(match_text, '.'):
-                PackageManager.log.error(f'Match pattern at line {match_node.sourceline} in project file is not a valid wildcard pattern')
-                sys.exit(1)
+                raise PackageError(f'Match pattern at line {match_node.sourceline} in project file is not a valid wildcard pattern')
 
-            yield from PackageManager._match(in_path, match_text,
-                                             exclude_pattern=attr_exclude,
-                                             user_path=attr_path,
-                                             no_recurse=attr_no_recurse)
+            matcher.add_match(in_path, match_text, attr_path, attr_no_recurse, attr_exclude)
+
+        yield from matcher.imatch()
 
     def _fix_package_extension(self, package_name: str) -> str:
         if not endswith(package_name, ('.ba2', '.bsa'), ignorecase=True):
@@ -198,57 +182,161 @@ class PackageManager:
 
         return test_path if os.path.isdir(test_path) else ''
 
-    def build_commands(self, containing_folder: str, output_path: str) -> str:
+    def build_commands(self, containing_folder: str, output_path: str, settings: dict) -> str:
         """
-        Builds command for creating package with BSArch
+        Builds command for creating package with BSArch from archive settings
         """
         arguments = CommandArguments()
 
-        arguments.append(self.options.bsarch_path, enquote_value=True)
+        arguments.append(self.config.bsarch_path, enquote_value=True)
         arguments.append('pack')
         arguments.append(containing_folder, enquote_value=True)
         arguments.append(output_path, enquote_value=True)
 
-        compressed_package = PackageManager._can_compress_package(containing_folder)
-
-        flags = wcmatch.RECURSIVE | wcmatch.IGNORECASE
-
-        if self.options.game_type == GameType.FO4 or self.options.game_type == GameType.SF1:
-            for _ in wcmatch.WcMatch(containing_folder, '!*.dds', flags=flags).imatch():
-                arguments.append('-fo4')
-                break
-            else:
-                arguments.append('-fo4dds')
-        elif self.options.game_type == GameType.SSE:
+        if self.config.game_type == GameType.FO4 or self.config.game_type == GameType.SF1:
+            arguments.append('-fo4dds' if settings['textures'] else '-fo4')
+        elif self.config.game_type == GameType.SSE:
             arguments.append('-sse')
 
-            if not compressed_package:
-                # SSE crashes when uncompressed BSA has Embed Filenames flag and contains textures
-                for _ in wcmatch.WcMatch(containing_folder, '*.dds', flags=flags).imatch():
-                    arguments.append('-af:0x3')
-                    break
+            # SSE crashes when uncompressed BSA has Embed Filenames flag and contains textures
+            if not settings['embed_names']:
+                arguments.append('-af:0x3')
         else:
             arguments.append('-tes5')
 
         # binary identical files share same data to preserve space
         arguments.append('-share')
 
-        if compressed_package:
+        if settings['compressed']:
             arguments.append('-z')
 
         return arguments.join()
 
+    def _generate_package_entries(self, package_node: etree.ElementBase, root_dir: str) -> tuple:
+        """
+        Returns (entries, contents) for package where later includes replace earlier includes with the same archive path
+
+        Entries are classified as they are generated, so the package is not walked again to decide archive flags.
+        """
+        entries: dict = {}
+        contents = ArchiveContents()
+
+        policy = CompressionPolicy(package_node.get(XmlAttributeName.NO_COMPRESS, CompressionPolicy.DEFAULT_PATTERNS))
+
+        for source_path, attr_path in self._generate_include_paths(package_node, root_dir,
+                                                                   ignore_rules=self.ppj.ignore_rules,
+                                                                   include_cache=self.include_cache):
+            if os.path.isabs(source_path):
+                relpath: str = os.path.relpath(source_path, root_dir)
+            else:
+                relpath: str = source_path  # type: ignore
+                source_path = os.path.join(self.ppj.project_path, source_path)
+
+            archive_path: str = os.path.join(attr_path, relpath)
+
+            # fix archive path if user passes a deeper package root (RootDir)
+            if endswith(source_path, '.pex', ignorecase=True) and not startswith(relpath, 'scripts', ignorecase=True):
+                archive_path = os.path.join('Scripts', relpath)
+
+            entry = ArchiveEntry.create(source_path, archive_path, policy.should_compress(archive_path))
+
+            PackageManager.log.debug(f'+ "{entry.archive_path.casefold()}"')
+
+            key = entry.archive_path.casefold()
+
+            # replaced entries have the same extension, so they are only classified once
+            if key not in entries:
+                contents.add(entry)
+
+            entries[key] = entry
+
+        return list(entries.values()), contents
+
+    def _get_archive_settings(self, contents: ArchiveContents) -> dict:
+        """Returns settings that determine how package is written by native writers and BSArch"""
+        settings: dict = {
+            'packager': 'native' if self.config.native_packager else 'bsarch',
+            'game_type': self.config.game_type,
+            # BSArch compresses all files or none, so packages with stored files are not compressed
+            'compressed': contents.can_compress if self.config.native_packager else contents.can_compress_all
+        }
+
+        if self.config.game_type in (GameType.FO4, GameType.SF1):
+            settings['textures'] = contents.is_textures_only
+        else:
+            # SSE crashes when uncompressed BSA has Embed Filenames flag and contains textures
+            settings['embed_names'] = self.config.game_type != GameType.SSE or contents.can_compress \
+                or not contents.has_textures
+
+        return settings
+
+    def _write_package(self, file_path: str, entries: list, settings: dict, worker_limit: int) -> CompressionData:
+        """Writes package with native archive writers and returns sizes and compression times of written files"""
+        if 'textures' in settings:
+            writer = Ba2Writer(self.config.game_type, compressed=settings['compressed'], textures=settings['textures'],
+                               worker_limit=worker_limit)
+        else:
+            writer = BsaWriter(self.config.game_type, compressed=settings['compressed'],  # type: ignore
+                               embed_names=settings['embed_names'], worker_limit=worker_limit)
+
+        # write to temporary file first so that a failed build never leaves a partial package
+        temp_file_path = f'{file_path}.{os.getpid()}.tmp'
+
+        try:
+            writer.write(temp_file_path, entries)
+            os.replace(temp_file_path, file_path)
+        except OSError as e:
+            raise PackageError(f'Cannot write package: {e}')
+        finally:
+            if os.path.isfile(temp_file_path):
+                os.remove(temp_file_path)
+
+        PackageManager.log.info(f'Wrote package: "{file_path}"')
+
+        return writer.compression_data
+
+    @staticmethod
+    def _verify_package(file_path: str, entries: list) -> None:
+        """Raises PackageError if package does not contain exactly the entries it was built from"""
+        with ArchiveReader(file_path) as archive:
+            problems: list = archive.verify(entries)
+
+        for problem in problems:
+            PackageManager.log.error(problem)
+
+        if problems:
+            raise PackageError(f'Package failed verification with {len(problems)} problems: "{file_path}"')
+
+        PackageManager.log.info(f'Verified {len(entries)} files in package: "{file_path}"')
+
+    def _stage_package(self, entries: list) -> StagingFolder:
+        """Returns unique staging folder mirroring entries for BSArch"""
+        staging = StagingFolder(self.config.temp_path)
+
+        try:
+            for entry in entries:
+                staging.add(entry.source_path, entry.archive_path.replace('\\', os.sep))
+        except OSError as e:
+            staging.remove()
+            raise PackageError(f'Cannot stage files for package: {e}')
+
+        return staging
+
     def create_packages(self) -> None:
-        # clear temporary data
-        if os.path.isdir(self.options.temp_path):
-            shutil.rmtree(self.options.temp_path, ignore_errors=True)
+        # clear temporary data left behind by builds that did not finish
+        if not self.config.native_packager:
+            StagingFolder.remove_stale(self.config.temp_path)
 
         # ensure package path exists
-        if not os.path.isdir(self.options.package_path):
-            os.makedirs(self.options.package_path, exist_ok=True)
+        if not os.path.isdir(self.config.package_path):
+            os.makedirs(self.config.package_path, exist_ok=True)
+
+        package_cache = PackageCache(self.config.cache_path)
 
         file_names = CaseInsensitiveList()
 
+        jobs: list = []
+
         for i, package_node in enumerate(filter(is_package_node, self.ppj.packages_node)):
             attr_file_name: str = package_node.get(XmlAttributeName.NAME)
 
@@ -266,49 +354,280 @@ class PackageManager:
 
             attr_file_name = self._fix_package_extension(attr_file_name)
 
-            file_path: str = os.path.join(self.options.package_path, attr_file_name)
+            file_path: str = os.path.join(self.config.package_path, attr_file_name)
 
-            self._check_write_permission(file_path)
+            jobs.append((package_node, root_dir, file_path))
 
-            PackageManager.log.info(f'Creating "{attr_file_name}"...')
+        if not jobs:
+            return
 
-            for source_path, attr_path in self._generate_include_paths(package_node, root_dir):
-                if os.path.isabs(source_path):
-                    relpath: str = os.path.relpath(source_path, root_dir)
-                else:
-                    relpath: str = source_path  # type: ignore
-                    source_path = os.path.join(self.ppj.project_path, source_path)
+        # packages write separate files from separate staging folders, so they can be built concurrently
+        worker_limit = 1 if self.config.no_parallel else max(1, self.config.worker_limit)
 
-                adj_relpath = os.path.normpath(os.path.join(attr_path, relpath))
+        # (package file path, error) where parts of split packages are reported under their package
+        errors: list = []
 
-                PackageManager.log.debug(f'+ "{adj_relpath.casefold()}"')
+        # package file paths by part file path
+        package_paths: dict = {}
 
-                target_path: str = os.path.join(self.options.temp_path, adj_relpath)
+        def _run(log_buffer: LogBuffer, function: typing.Callable, function_jobs: list, max_workers: int,
+                 path_index: int) -> typing.Generator:
+            def _call(job: tuple) -> tuple:
+                with log_buffer.capture() as records:
+                    try:
+                        return records, function(*job), None
+                    except Exception as e:
+                        return records, None, e
 
-                # fix target path if user passes a deeper package root (RootDir)
-                if endswith(source_path, '.pex', ignorecase=True) and not startswith(relpath, 'scripts', ignorecase=True):
-                    target_path = os.path.join(self.options.temp_path, 'Scripts', relpath)
+            with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+                for job, (records, result, error) in zip(function_jobs, executor.map(_call, function_jobs)):
+                    log_buffer.flush(records)
 
-                os.makedirs(os.path.dirname(target_path), exist_ok=True)
-                shutil.copy2(source_path, target_path)
+                    # unexpected errors are not reported as package errors
+                    if error is not None and not isinstance(error, PyroError):
+                        raise error
 
-                self.includes += 1
+                    if error is not None:
+                        PackageManager.log.error(error)
+                        errors.append((package_paths.get(job[path_index], job[path_index]), error))
+                        continue
 
-            # run bsarch
-            command: str = self.build_commands(self.options.temp_path, file_path)
-            ProcessManager.run_bsarch(command)
+                    yield job, result
 
-            # clear temporary data
-            if os.path.isdir(self.options.temp_path):
-                shutil.rmtree(self.options.temp_path, ignore_errors=True)
+        with LogBuffer(PackageManager.log) as log_buffer:
+            parts: list = []
+
+            for (_, _, package_path), node_parts in _run(log_buffer, self._plan_package, jobs, min(worker_limit, len(jobs)), 2):
+                parts.extend(node_parts)
+                for part_path, *_ in node_parts:
+                    package_paths[part_path] = package_path
+
+            # parts of split packages are named after their package, so they can collide with other packages
+            part_paths = CaseInsensitiveList()
+            for file_path, *_ in parts:
+                if file_path in part_paths:
+                    raise PackageError(f'Cannot create more than one package with the same name: "{file_path}"')
+                part_paths.append(file_path)
+
+            for file_path, *_ in parts:
+                self._check_write_permission(file_path)
+
+            self._remove_stale_parts(jobs, part_paths, package_cache)
+
+            if parts:
+                package_worker_limit = min(worker_limit, len(parts))
+
+                # workers are shared between packages and the compression of each package
+                compression_worker_limit = max(1, worker_limit // package_worker_limit)
+
+                build_jobs = [(*part, package_cache, compression_worker_limit) for part in parts]
+
+                for job, (include_count, rebuilt, compression_data) in _run(log_buffer, self._build_package, build_jobs, package_worker_limit, 0):
+                    self.includes += include_count
+                    report = job[3]
+                    if report is not None:
+                        self.reports.append(report)
+                    if compression_data is not None:
+                        self.compression_data.update(compression_data)
+                    if rebuilt is True:
+                        self.rebuilt_count += 1
+                    elif rebuilt is False:
+                        self.skipped_count += 1
+
+        if errors:
+            failed_count = len({file_path for file_path, _ in errors})
+            raise PackageError(f'Cannot create {failed_count} of {len(jobs)} packages')
+
+    @staticmethod
+    def _parse_size(text: str) -> int:
+        """Returns number of bytes from size with optional KB, MB, or GB unit, or 0 if text is empty"""
+        match = re.fullmatch(r'(\d+)\s*([kmg]?b)?', text.strip(), flags=re.IGNORECASE)
+
+        if match is None:
+            raise PackageError(f'Cannot parse size: "{text}"')
+
+        number, unit = match.groups()
+
+        return int(number) * PackageManager.SIZE_UNITS[(unit or 'b').casefold()]
+
+    def _create_report(self, kind: str, file_path: str) -> typing.Optional[PayloadReport]:
+        """Returns report for package or zip file if reports were requested, otherwise None"""
+        return PayloadReport(kind, file_path) if self.config.report_path else None
+
+    def _plan_package(self, package_node: etree.ElementBase, root_dir: str, file_path: str) -> list:
+        """
+        Returns list of (file path, entries, contents, report, owner) for each archive that package is written to
+
+        Packages are only written to more than one archive when the Split or MaxSize attributes are set.
+        Includes are resolved once for all parts, so each part reports the same time for resolving includes.
+        """
+        start_time = time.perf_counter()
+        entries, contents = self._generate_package_entries(package_node, root_dir)
+        resolve_time = time.perf_counter() - start_time
+
+        def _with_report(part_path: str, part_entries: list, part_contents: ArchiveContents, part_index: int) -> tuple:
+            report = self._create_report('package', part_path)
+            if report is not None:
+                report.add_stage('resolve', resolve_time)
+            return part_path, part_entries, part_contents, report, self._get_owner(file_path, part_index)
+
+        split: bool = package_node.get(XmlAttributeName.SPLIT) == 'True'
+        max_size: int = self._parse_size(package_node.get(XmlAttributeName.MAX_SIZE) or '0')
+
+        if not split and not max_size:
+            return [_with_report(file_path, entries, contents, 0)]
+
+        texture_suffix: typing.Optional[str] = None
+        main_suffix: str = ''
+
+        if split:
+            # FO4 and SF1 load " - Main" and " - Textures" archives, while TES5 and SSE load "<plugin>.bsa" and " - Textures"
+            texture_suffix = ' - Textures'
+            if self.config.game_type in (GameType.FO4, GameType.SF1):
+                main_suffix = ' - Main'
+
+        parts: list = ArchivePart.split(entries, texture_suffix=texture_suffix, main_suffix=main_suffix, max_size=max_size)
+
+        name, extension = os.path.splitext(file_path)
+
+        if len(parts) > 1 or parts and parts[0].suffix:
+            PackageManager.log.info(f'Splitting "{os.path.basename(file_path)}" into {len(parts)} packages...')
+
+        return [_with_report(part.get_file_name(name, extension), part.entries, part.contents, i) for i, part in enumerate(parts)]
+
+    def _get_owner(self, file_path: str, part_index: int) -> dict:
+        """Returns owner recorded in manifests of parts of package, where file path is the path of the unsplit package"""
+        return {
+            'project': os.path.normcase(os.path.abspath(self.config.input_path)),
+            'package': os.path.normcase(os.path.abspath(file_path)),
+            'part': part_index
+        }
+
+    def _remove_stale_parts(self, jobs: list, part_paths: CaseInsensitiveList, package_cache: PackageCache) -> None:
+        """Removes parts of split packages left behind by previous builds that split packages into more parts"""
+        # packages that could not be resolved are never removed
+        job_paths = CaseInsensitiveList(file_path for _, _, file_path in jobs)
+
+        for _, _, file_path in jobs:
+            name, extension = os.path.splitext(os.path.basename(file_path))
+            part_pattern = re.compile(rf'{re.escape(name)}( - (Main|Textures))?(\d+)?{re.escape(extension)}', flags=re.IGNORECASE)
+
+            owner: dict = self._get_owner(file_path, 0)
+
+            for file_name in sorted(os.listdir(self.config.package_path)):
+                stale_path = os.path.join(self.config.package_path, file_name)
+
+                if not part_pattern.fullmatch(file_name) or stale_path in part_paths or stale_path in job_paths:
+                    continue
+
+                # output folders are shared with other packages and projects, and the pattern also matches their
+                # packages (Mod2.bsa for Mod.bsa), so only parts that this package wrote are removed
+                manifest = package_cache.load(stale_path)
+                stale_owner: dict = (manifest or {}).get('owner') or {}
+                if stale_owner.get('project') != owner['project'] or stale_owner.get('package') != owner['package']:
+                    continue
+
+                PackageManager.log.info(f'Removing stale package: "{stale_path}"')
+
+                try:
+                    os.remove(stale_path)
+                except FileNotFoundError:
+                    pass
+                except OSError as e:
+                    raise PackageError(f'Cannot remove stale package: {e}')
+
+                package_cache.remove(stale_path)
+                self.include_cache.invalidate(stale_path)
+
+    def _build_package(self, file_path: str, entries: list, contents: ArchiveContents, report: typing.Optional[PayloadReport],
+                       owner: dict, package_cache: PackageCache, worker_limit: int) -> tuple:
+        """
+        Builds package and returns (number of includes, whether package was rebuilt, compression data)
+
+        Whether package was rebuilt is None when BSArch fails. Compression data is None unless a native writer wrote
+        the package. The report, if any, is filled in as the package is built.
+        """
+        PackageManager.log.info(f'Creating "{os.path.basename(file_path)}"...')
+
+        start_time = time.perf_counter()
+
+        settings: dict = self._get_archive_settings(contents)
+
+        previous_manifest = package_cache.load(file_path)
+        manifest = PackageCache.get_manifest(entries, settings, owner, previous_manifest)
+
+        if report is not None:
+            # manifests hash every include, so duplicate content is found without reading files again
+            report.files = [(file['path'], file['size'], file['sha256']) for file in manifest['files']]
+
+        is_current = not self.config.no_incremental_build and package_cache.is_current(file_path, manifest, previous_manifest)
+
+        if report is not None:
+            report.add_stage('manifest', time.perf_counter() - start_time)
+
+        if is_current:
+            PackageManager.log.info(f'Skipped unchanged package: "{file_path}"')
+            if report is not None:
+                report.skipped = True
+            return len(entries), False, None
+
+        # a package that fails to build must not be skipped by the next build
+        package_cache.remove(file_path)
+
+        compression_data: typing.Optional[CompressionData] = None
+
+        start_time = time.perf_counter()
+
+        # native writers read files from their include paths, so no staging copy is needed
+        if self.config.native_packager:
+            try:
+                compression_data = self._write_package(file_path, entries, settings, worker_limit)
+            finally:
+                self.include_cache.invalidate(file_path)
+        else:
+            staging = self._stage_package(entries)
+
+            try:
+                # run bsarch
+                command: str = self.build_commands(staging.path, file_path, settings)
+                state = ProcessManager.run_bsarch(command)
+            finally:
+                # clear temporary data without waiting for removal
+                staging.remove()
+                self.include_cache.invalidate(file_path)
+
+            if state != ProcessState.SUCCESS:
+                return len(entries), None, None
+
+        if report is not None:
+            report.add_stage('write', time.perf_counter() - start_time)
+            if compression_data is not None:
+                report.compression.update(compression_data)
+
+        if self.config.verify_packages:
+            start_time = time.perf_counter()
+            self._verify_package(file_path, entries)
+            if report is not None:
+                report.add_stage('verify', time.perf_counter() - start_time)
+
+        package_cache.save(file_path, manifest)
+
+        return len(entries), True, compression_data
+
+    @staticmethod
+    def _add_zip_member(report: PayloadReport, info: zipfile.ZipInfo, source_path: str) -> None:
+        """Adds zip member to report"""
+        report.files.append((info.filename, info.file_size, PackageCache.get_content_hash(source_path)))
 
     def create_zip(self) -> None:
         # ensure zip output path exists
-        if not os.path.isdir(self.options.zip_output_path):
-            os.makedirs(self.options.zip_output_path, exist_ok=True)
+        if not os.path.isdir(self.config.zip_output_path):
+            os.makedirs(self.config.zip_output_path, exist_ok=True)
 
         file_names = CaseInsensitiveList()
 
+        worker_limit = 1 if self.config.no_parallel else max(1, self.config.worker_limit)
+
         for i, zip_node in enumerate(filter(is_zipfile_node, self.ppj.zip_files_node)):
             attr_file_name: str = zip_node.get(XmlAttributeName.NAME)
 
@@ -321,11 +640,11 @@ class PackageManager:
 
             attr_file_name = self._fix_zip_extension(attr_file_name)
 
-            file_path: str = os.path.join(self.options.zip_output_path, attr_file_name)
+            file_path: str = os.path.join(self.config.zip_output_path, attr_file_name)
 
             self._check_write_permission(file_path)
 
-            compress_str: str = self.options.zip_compression or zip_node.get(XmlAttributeName.COMPRESSION)
+            compress_str: str = self.config.zip_compression or zip_node.get(XmlAttributeName.COMPRESSION)
 
             try:
                 compress_type = self.COMPRESS_TYPE[compress_str.casefold()]
@@ -340,28 +659,68 @@ class PackageManager:
             if root_dir:
                 PackageManager.log.info(f'Creating "{attr_file_name}"...')
 
+                report = self._create_report('zip', file_path)
+
+                start_time = time.perf_counter()
+
+                include_paths: list = list(self._generate_include_paths(zip_node, root_dir, True,
+                                                                        ignore_rules=self.ppj.ignore_rules,
+                                                                        include_cache=self.include_cache))
+
+                if report is not None:
+                    report.add_stage('resolve', time.perf_counter() - start_time)
+
+                start_time = time.perf_counter()
+
+                members: list = []
+
+                for include_path, attr_path in include_paths:
+                    if not attr_path:
+                        if root_dir in include_path:
+                            arcname = os.path.relpath(include_path, root_dir)
+                        else:
+                            # just add file to zip root
+                            arcname = os.path.basename(include_path)
+                    else:
+                        _, attr_file_name = os.path.split(include_path)
+                        arcname = attr_file_name if attr_path == os.curdir else os.path.join(attr_path, attr_file_name)
+
+                    PackageManager.log.debug('+ "{}"'.format(arcname))
+
+                    members.append((include_path, arcname))
+
+                writer = ZipWriter(compress_type, worker_limit=worker_limit)
+
+                # write to temporary file first so that a failed build never leaves a partial zip file
+                temp_file_path = f'{file_path}.{os.getpid()}.tmp'
+
                 try:
-                    with zipfile.ZipFile(file_path, mode='w', compression=compress_type) as z:
-                        for include_path, attr_path in self._generate_include_paths(zip_node, root_dir, True):
-                            if not attr_path:
-                                if root_dir in include_path:
-                                    arcname = os.path.relpath(include_path, root_dir)
-                                else:
-                                    # just add file to zip root
-                                    arcname = os.path.basename(include_path)
-                            else:
-                                _, attr_file_name = os.path.split(include_path)
-                                arcname = attr_file_name if attr_path == os.curdir else os.path.join(attr_path, attr_file_name)
-
-                            PackageManager.log.debug('+ "{}"'.format(arcname))
-                            z.write(include_path, arcname, compress_type=compress_type)
-
-                            self.includes += 1
+                    # unchanged members are copied from the zip file written by the previous build
+                    previous_path = '' if self.config.no_incremental_build else file_path
+
+                    infos: list = writer.write(temp_file_path, members, previous_path=previous_path)
+                    os.replace(temp_file_path, file_path)
+
+                    self.includes += len(infos)
+
+                    if writer.reused_count:
+                        PackageManager.log.info(f'Reused {writer.reused_count} unchanged of {len(infos)} files from previous ZIP file')
 
                     PackageManager.log.info(f'Wrote ZIP file: "{file_path}"')
+
+                    if report is not None:
+                        for info, (include_path, _) in zip(infos, members):
+                            self._add_zip_member(report, info, include_path)
+                        report.compression.update(writer.compression_data)
+                        report.add_stage('write', time.perf_counter() - start_time)
+                        self.reports.append(report)
                 except PermissionError:
-                    PackageManager.log.error(f'Cannot open ZIP file for writing: "{file_path}"')
-                    sys.exit(1)
+                    raise PackageError(f'Cannot open ZIP file for writing: "{file_path}"')
+                except OSError as e:
+                    raise PackageError(f'Cannot write ZIP file: {e}')
+                finally:
+                    if os.path.isfile(temp_file_path):
+                        os.remove(temp_file_path)
+                    self.include_cache.invalidate(file_path)
             else:
-                PackageManager.log.error(f'Cannot resolve RootDir path to existing folder: "{root_dir}"')
-                sys.exit(1)
+                raise PackageError(f'Cannot resolve RootDir path to existing folder: "{root_dir}"')
@@ -1,8 +1,9 @@
 import configparser
+import graphlib
 import hashlib
 import io
 import os
-import sys
+import subprocess
 import time
 import typing
 
@@ -16,8 +17,10 @@ from pyro.Enums.Event import (Event,
                               AnonymizeEvent,
                               PackageEvent,
                               ZipEvent)
+from pyro.BuildConfig import BuildConfig
 from pyro.CommandArguments import CommandArguments
 from pyro.Comparators import (endswith,
+                              is_exclude_node,
                               is_folder_node,
                               is_import_node,
                               is_script_node,
@@ -26,21 +29,29 @@ from pyro.Comparators import (endswith,
                               startswith)
 from pyro.Constants import (GameName,
                             GameType,
+                            ProgramInfo,
                             XmlAttributeName,
                             XmlTagName)
+from pyro.Exceptions import (ProjectError,
+                             RemoteError)
+from pyro.GitHelper import GitHelper
+from pyro.IgnoreMatcher import IgnoreMatcher
+from pyro.IgnoreRules import IgnoreRules
 from pyro.PathHelper import PathHelper
 from pyro.PexReader import PexReader
 from pyro.ProcessManager import ProcessManager
+from pyro.ProjectCache import ProjectCache
 from pyro.ProjectBase import ProjectBase
 from pyro.ProjectOptions import ProjectOptions
 from pyro.Remotes.RemoteBase import RemoteBase
-from pyro.Remotes.GenericRemote import GenericRemote
+from pyro.VariableResolver import VariableResolver
 from pyro.XmlHelper import XmlHelper
 from pyro.XmlRoot import XmlRoot
 
 
 class PapyrusProject(ProjectBase):
     ppj_root: XmlRoot
+    excludes_node: etree.ElementBase = None
     folders_node: etree.ElementBase = None
     imports_node: etree.ElementBase = None
     packages_node: etree.ElementBase = None
@@ -62,53 +73,94 @@ class PapyrusProject(ProjectBase):
     remote: RemoteBase
     remote_schemas: tuple = ('https:', 'http:')
 
+    ignore_file_name: str = '.pyroignore'
+    ignore_rules: IgnoreRules
+
     zip_file_name: str = ''
     zip_root_path: str = ''
 
-    missing_scripts: dict = {}
-    pex_paths: list = []
-    psc_paths: dict = {}
+    changed_paths: typing.Optional[dict] = None
+    missing_scripts: dict
+    pex_paths: list
+    psc_paths: dict
 
     def __init__(self, options: ProjectOptions) -> None:
         super(PapyrusProject, self).__init__(options)
 
+        self.missing_scripts = {}
+        self.pex_paths = []
+        self.psc_paths = {}
+
         xml_parser: etree.XMLParser = etree.XMLParser(remove_blank_text=True, remove_comments=True)
 
         if self.options.create_project:
-            sys.exit(1)
+            raise ProjectError('Cannot create project because this feature is not implemented')
 
-        # strip comments from raw text because lxml.etree.XMLParser does not remove XML-unsupported comments
-        # e.g., '<PapyrusProject <!-- xmlns="PapyrusProject.xsd" -->>'
-        xml_document: io.StringIO = XmlHelper.strip_xml_comments(self.options.input_path)
+        with open(self.options.input_path, mode='rb') as f:
+            project_data: bytes = f.read()
 
-        project_xml: etree.ElementTree = etree.parse(xml_document, xml_parser)
+        # resolved projects can be reused when nothing that affects resolution has changed
+        project_cache: typing.Optional[ProjectCache] = None
+        cache_key: str = ''
+        cached_project: typing.Optional[dict] = None
 
-        self.ppj_root = XmlRoot(project_xml)
+        if not self.options.no_cache:
+            project_cache = ProjectCache(self.get_cache_path())
 
-        schema: etree.XMLSchema = XmlHelper.validate_schema(self.ppj_root.ns, self.program_path)
+            if ProjectCache.is_cacheable(project_data.decode('utf-8', errors='replace')):
+                cache_key = ProjectCache.get_key(project_data, self._get_cache_values())
+                cached_project = project_cache.load(self.options.input_path, cache_key)
 
-        if schema:
-            try:
-                schema.assertValid(project_xml)
-            except etree.DocumentInvalid as e:
-                PapyrusProject.log.error(f'Failed to validate XML Schema.{os.linesep}\t{e}')
-                sys.exit(1)
-            else:
-                PapyrusProject.log.info('Successfully validated XML Schema.')
+        if cached_project is not None:
+            # the cached tree has already been validated and resolved
+            self.ppj_root = XmlRoot(etree.ElementTree(etree.fromstring(cached_project['xml'], xml_parser)))
+            self.variables = cached_project['variables']
+            PapyrusProject.log.info('Loaded resolved project from cache.')
+        else:
+            # strip comments from raw text because lxml.etree.XMLParser does not remove XML-unsupported comments
+            # e.g., '<PapyrusProject <!-- xmlns="PapyrusProject.xsd" -->>'
+            xml_document: io.StringIO = XmlHelper.strip_xml_comments(self.options.input_path)
+
+            project_xml: etree.ElementTree = etree.parse(xml_document, xml_parser)
+
+            self.ppj_root = XmlRoot(project_xml)
+
+            schema_path: str = XmlHelper.get_schema_path(self.ppj_root.ns, self.program_path)
+
+            if schema_path:
+                # validation depends only on the project file and the schema file
+                validation_stamp = ProjectCache.get_stamp(project_data, schema_path)
+
+                if project_cache is not None and not self.options.force_validation \
+                        and project_cache.has_stamp(self.options.input_path, validation_stamp):
+                    PapyrusProject.log.info('Skipped validating XML Schema because project is unchanged.')
+                else:
+                    schema: etree.XMLSchema = XmlHelper.validate_schema(self.ppj_root.ns, self.program_path)
 
-        # variables need to be parsed before nodes are updated
-        variables_node = self.ppj_root.find(XmlTagName.VARIABLES)
-        if variables_node is not None:
-            self._parse_variables(variables_node)
+                    try:
+                        schema.assertValid(project_xml)
+                    except etree.DocumentInvalid as e:
+                        raise ProjectError(f'Failed to validate XML Schema.{os.linesep}\t{e}')
+                    else:
+                        PapyrusProject.log.info('Successfully validated XML Schema.')
 
-        # we need to parse all attributes after validating and before we do anything else
-        # options can be overridden by arguments when the BuildFacade is initialized
-        self._update_attributes(self.ppj_root.node)
+                    if project_cache is not None:
+                        project_cache.save_stamp(self.options.input_path, validation_stamp)
 
-        if self.options.resolve_project:
-            xml_output = etree.tostring(self.ppj_root.node, encoding='utf-8', xml_declaration=True, pretty_print=True)
-            PapyrusProject.log.debug(f'Resolved PPJ. Text output:{os.linesep * 2}{xml_output.decode()}')
-            sys.exit(1)
+            # variables need to be parsed before nodes are updated
+            variables_node = self.ppj_root.find(XmlTagName.VARIABLES)
+            if variables_node is not None:
+                self._parse_variables(variables_node)
+
+            # we need to parse all attributes after validating and before we do anything else
+            # options can be overridden by arguments when the BuildFacade is initialized
+            self._update_attributes(self.ppj_root.node)
+
+            if cache_key:
+                project_cache.save(self.options.input_path, cache_key, {  # type: ignore
+                    'xml': etree.tostring(self.ppj_root.node, encoding='unicode'),
+                    'variables': self.variables
+                })
 
         self.options.flags_path = self.ppj_root.get(XmlAttributeName.FLAGS)
         self.options.output_path = self.ppj_root.get(XmlAttributeName.OUTPUT)
@@ -132,6 +184,9 @@ class PapyrusProject(ProjectBase):
         self.folders_node = self.ppj_root.find(XmlTagName.FOLDERS)
         self.packages_node = self.ppj_root.find(XmlTagName.PACKAGES)
         self.zip_files_node = self.ppj_root.find(XmlTagName.ZIP_FILES)
+        self.excludes_node = self.ppj_root.find(XmlTagName.EXCLUDES)
+
+        self.ignore_rules = self._get_ignore_rules()
 
         self.pre_build_node = self.ppj_root.find(XmlTagName.PRE_BUILD_EVENT)
         self.use_pre_build_event = bool_attr(self.pre_build_node, XmlAttributeName.USE_IN_BUILD)
@@ -177,6 +232,43 @@ class PapyrusProject(ProjectBase):
             if not self.options.zip_output_path:
                 self.options.zip_output_path = self.zip_files_node.get(XmlAttributeName.OUTPUT)
 
+    def get_resolved_text(self) -> str:
+        """Returns project file with variables resolved and default attribute values added"""
+        xml_output = etree.tostring(self.ppj_root.node, encoding='utf-8', xml_declaration=True, pretty_print=True)
+        return xml_output.decode()
+
+    def _get_cache_values(self) -> dict:
+        """Returns values other than the project file itself that affect how the project resolves"""
+        values: dict = {
+            'version': ProgramInfo.VERSION,
+            'program_path': self.program_path,
+            'project_path': self.project_path
+        }
+
+        # path options are exposed to projects as O_* variables and used as default attribute values
+        for key, value in self.options.__dict__.items():
+            if endswith(key, 'path') and isinstance(value, str):
+                values[key] = value
+
+        return values
+
+    def _get_ignore_rules(self) -> IgnoreRules:
+        """Returns ignore rules from ignore file in project folder and Excludes node"""
+        ignore_rules = IgnoreRules(self.project_path)
+
+        ignore_file_path = os.path.join(self.project_path, self.ignore_file_name)
+        if os.path.isfile(ignore_file_path):
+            ignore_rules.add_file(ignore_file_path)
+
+        if self.excludes_node is not None:
+            for exclude_node in filter(is_exclude_node, self.excludes_node):
+                ignore_rules.add(exclude_node.text)
+
+        if ignore_rules:
+            PapyrusProject.log.info(f'Using {len(ignore_rules)} ignore rules.')
+
+        return ignore_rules
+
     def try_initialize_remotes(self) -> None:
         # initialize remote if needed
         if self.remote_paths:
@@ -186,6 +278,9 @@ class PapyrusProject(ProjectBase):
             if self.options.worker_limit == 0:
                 self.options.worker_limit = self.get_worker_limit()
 
+            # remotes pull in urllib.request and http.client, so only import them when a project needs them
+            from pyro.Remotes.GenericRemote import GenericRemote
+
             self.remote = GenericRemote(access_token=self.options.access_token,
                                         worker_limit=self.options.worker_limit,
                                         force_overwrite=self.options.force_overwrite)
@@ -197,11 +292,9 @@ class PapyrusProject(ProjectBase):
                 try:
                     parsed_files = cfg_parser.read(cfg_path)
                 except configparser.DuplicateSectionError:
-                    PapyrusProject.log.error('Cannot proceed while ".secrets" contains duplicate sections')
-                    sys.exit(1)
+                    raise RemoteError('Cannot proceed while ".secrets" contains duplicate sections')
                 except configparser.MissingSectionHeaderError:
-                    PapyrusProject.log.error('Cannot proceed while ".secrets" contains no sections')
-                    sys.exit(1)
+                    raise RemoteError('Cannot proceed while ".secrets" contains no sections')
 
                 if cfg_path in parsed_files:
                     self.remote = GenericRemote(config=cfg_parser,
@@ -211,16 +304,14 @@ class PapyrusProject(ProjectBase):
             # validate remote paths
             for path in self.remote_paths:
                 if not self.remote.validate_url(path):
-                    PapyrusProject.log.error(f'Cannot proceed while node contains invalid URL: "{path}"')
-                    sys.exit(1)
+                    raise RemoteError(f'Cannot proceed while node contains invalid URL: "{path}"')
 
     def try_populate_imports(self) -> None:
         # we need to populate the list of import paths before we try to determine the game type
         # because the game type can be determined from import paths
         self.import_paths = self._get_import_paths()
         if not self.import_paths:
-            PapyrusProject.log.error('Failed to build list of import paths')
-            sys.exit(1)
+            raise ProjectError('Failed to build list of import paths')
 
         # remove project path, if added by user
         self.import_paths = [p for p in self.import_paths if not startswith(p, self.project_path, ignorecase=True)]
@@ -228,10 +319,33 @@ class PapyrusProject(ProjectBase):
         # prepend project path
         self.import_paths.insert(0, self.project_path)
 
+        # remove aliases of the same physical folder (e.g., symbolic links)
+        self.import_paths = PathHelper.uniqify_paths(self.import_paths)
+
+        if self.options.changed_since:
+            self.changed_paths = self._get_changed_paths(self.options.changed_since)
+
         self.psc_paths = self._get_psc_paths()
         if not self.psc_paths:
-            PapyrusProject.log.error('Failed to build list of script paths')
-            sys.exit(1)
+            if self.changed_paths is not None:
+                PapyrusProject.log.info(f'No scripts were changed since "{self.options.changed_since}"')
+                return
+            raise ProjectError('Failed to build list of script paths')
+
+    def _get_changed_paths(self, ref: str) -> typing.Optional[dict]:
+        """Returns paths to scripts changed since git ref keyed by canonical path, or None if git cannot determine changes"""
+        try:
+            changed_paths = GitHelper.get_changed_paths(self.project_path, ref)
+        except (OSError, subprocess.CalledProcessError) as e:
+            stderr = getattr(e, 'stderr', '') or str(e)
+            PapyrusProject.log.warning(f'Cannot determine files changed since "{ref}", scanning all folders: {stderr.strip()}')
+            return None
+
+        results = {PathHelper.get_canonical_path(path): path for path in changed_paths if endswith(path, '.psc', ignorecase=True)}
+
+        PapyrusProject.log.info(f'{len(results)} scripts changed since "{ref}".')
+
+        return results
 
     def try_set_game_type(self) -> None:
         # we need to set the game type after imports are populated but before pex paths are populated
@@ -247,8 +361,7 @@ class PapyrusProject(ProjectBase):
             self.options.game_type = self.get_game_type()
 
         if not self.options.game_type:
-            PapyrusProject.log.error('Cannot determine game type from arguments or Papyrus Project')
-            sys.exit(1)
+            raise ProjectError('Cannot determine game type from arguments or Papyrus Project')
 
     def find_missing_scripts(self) -> None:
         # get expected pex paths - these paths may not exist and that is okay!
@@ -289,12 +402,10 @@ class PapyrusProject(ProjectBase):
                 continue
 
             if not key.isalnum():
-                PapyrusProject.log.error(f'The name of the variable "{key}" must be an alphanumeric string.')
-                sys.exit(1)
+                raise ProjectError(f'The name of the variable "{key}" must be an alphanumeric string.')
 
             if any(c in reserved_characters for c in value):
-                PapyrusProject.log.error(f'The value of the variable "{key}" contains a reserved character.')
-                sys.exit(1)
+                raise ProjectError(f'The value of the variable "{key}" contains a reserved character.')
 
             self.variables.update({key: value})
 
@@ -316,14 +427,14 @@ class PapyrusProject(ProjectBase):
             'O_ZIP_OUTPUT_PATH': self.options.zip_output_path
         })
 
-        # allow variables to reference other variables
-        for key, value in self.variables.items():
-            self.variables.update({key: self.parse(value)})
+        # allow variables to reference other variables, resolving each variable after the variables it references
+        try:
+            variable_order: list = VariableResolver.get_order(self.variables)
+        except graphlib.CycleError as e:
+            raise ProjectError(f'Cannot resolve variables that reference each other: {" -> ".join(reversed(e.args[1]))}')
 
-        # complete round trip so that order does not matter
-        for key in reversed(self.variables.keys()):
-            value = self.variables[key]
-            self.variables.update({key: self.parse(value)})
+        for key in variable_order:
+            self.variables[key] = self.parse(self.variables[key])
 
     def _update_attributes(self, parent_node: etree.ElementBase) -> None:
         """Updates attributes of element tree with missing attributes and default values"""
@@ -338,12 +449,23 @@ class PapyrusProject(ProjectBase):
 
         other_bool_keys = [
             XmlAttributeName.NO_RECURSE,
+            XmlAttributeName.SPLIT,
             XmlAttributeName.USE_IN_BUILD
         ]
 
+        bool_keys = ppj_bool_keys + other_bool_keys
+
+        # variables are resolved, so each distinct value needs to be parsed only once
+        parsed_values: dict = {}
+
+        def parse(value: str) -> str:
+            if value not in parsed_values:
+                parsed_values[value] = self.parse(value)
+            return parsed_values[value]
+
         for node in parent_node.getiterator():
             if node.text:
-                node.text = self.parse(node.text.strip())
+                node.text = parse(node.text.strip())
 
             tag = node.tag.replace('{%s}' % self.ppj_root.ns, '')
 
@@ -367,6 +489,10 @@ class PapyrusProject(ProjectBase):
                     node.set(XmlAttributeName.NAME, self.project_name)
                 if XmlAttributeName.ROOT_DIR not in node.attrib:
                     node.set(XmlAttributeName.ROOT_DIR, self.project_path)
+                if XmlAttributeName.SPLIT not in node.attrib:
+                    node.set(XmlAttributeName.SPLIT, 'False')
+                if XmlAttributeName.MAX_SIZE not in node.attrib:
+                    node.set(XmlAttributeName.MAX_SIZE, '')
 
             elif tag in (XmlTagName.FOLDER, XmlTagName.INCLUDE, XmlTagName.MATCH):
                 if XmlAttributeName.NO_RECURSE not in node.attrib:
@@ -403,7 +529,7 @@ class PapyrusProject(ProjectBase):
 
             # parse values
             for key, value in node.attrib.items():
-                value = value.casefold() in ('true', '1') if key in ppj_bool_keys + other_bool_keys else self.parse(value)
+                value = value.casefold() in ('true', '1') if key in bool_keys else parse(value)
                 node.set(key, str(value))
 
     def _calculate_object_name(self, psc_path: str) -> str:
@@ -413,13 +539,15 @@ class PapyrusProject(ProjectBase):
         """Returns list of script paths for compiled scripts that do not exist"""
         results: dict = {}
 
+        output_path: str = self.get_output_path()
+
         for object_name, script_path in self.psc_paths.items():
             if endswith(object_name, '.pex', ignorecase=True):
-                pex_path = os.path.join(self.get_output_path(), object_name)
+                pex_path = os.path.join(output_path, object_name)
             elif endswith(object_name, '.psc', ignorecase=True):
-                pex_path = os.path.join(self.get_output_path(), object_name.replace('.psc', '.pex'))
+                pex_path = os.path.join(output_path, object_name.replace('.psc', '.pex'))
             else:
-                pex_path = os.path.join(self.get_output_path(), object_name + '.pex')
+                pex_path = os.path.join(output_path, object_name + '.pex')
 
             if not os.path.isfile(pex_path) and script_path not in results:
                 results[object_name] = script_path
@@ -456,10 +584,9 @@ class PapyrusProject(ProjectBase):
             if os.path.isdir(import_path):
                 results.append(import_path)
             else:
-                PapyrusProject.log.error(f'Import path does not exist: "{import_path}"')
-                sys.exit(1)
+                raise ProjectError(f'Import path does not exist: "{import_path}"')
 
-        return PathHelper.uniqify(results)
+        return PathHelper.uniqify_paths(results)
 
     def _get_pex_paths(self) -> list:
         """
@@ -481,20 +608,49 @@ class PapyrusProject(ProjectBase):
         object_path = path if endswith(path, '.psc', ignorecase=True) else f'{path}.psc'
         return object_name, object_path
 
+    def get_object_items(self, paths: typing.Iterable) -> dict:
+        """Returns object paths keyed by object name, resolving all absolute paths in one call"""
+        # folder scans can add remote import paths, so collect all paths before resolving any
+        paths = list(paths)
+
+        object_names: dict = PathHelper.calculate_relative_object_names((path for path in paths if os.path.isabs(path)),
+                                                                        self.import_paths)
+
+        results: dict = {}
+
+        for path in paths:
+            object_path = path if endswith(path, '.psc', ignorecase=True) else f'{path}.psc'
+            results[object_names.get(path, path)] = object_path
+
+        return results
+
     def _get_psc_paths(self) -> dict:
         """Returns script paths from Folders and Scripts nodes"""
         object_names: dict = {}
 
         # populate object names dictionary
         if self.folders_node is not None:
-            for path in self._get_script_paths_from_folders_node():
-                k, v = self.get_object_item(path)
-                object_names[k] = v
+            object_names.update(self.get_object_items(self._get_script_paths_from_folders_node()))
 
         if self.scripts_node is not None:
-            for path in self._get_script_paths_from_scripts_node():
-                k, v = self.get_object_item(path)
-                object_names[k] = v
+            object_names.update(self.get_object_items(self._get_script_paths_from_scripts_node()))
+
+        import_paths: list = []
+        canonical_import_paths: list = []
+
+        for import_path in self.import_paths:
+            if not os.path.isabs(import_path):
+                import_path = os.path.join(self.project_path, import_path)
+
+            # scripts not found in an import path will not be found in any folder it contains
+            canonical_import_path = PathHelper.get_canonical_path(import_path)
+            is_nested = any(PathHelper.is_contained_in(canonical_import_path, p) for p in canonical_import_paths)
+            canonical_import_paths.append(canonical_import_path)
+
+            import_paths.append((import_path, is_nested))
+
+        # each import path is walked at most once, and only if a script cannot be found otherwise
+        import_indexes: dict = {}
 
         # convert user paths to absolute paths
         for k, v in object_names.items():
@@ -503,34 +659,47 @@ class PapyrusProject(ProjectBase):
                 continue
 
             # try to add existing import-relative paths
-            for import_path in self.import_paths:
-                if not os.path.isabs(import_path):
-                    import_path = os.path.join(self.project_path, import_path)
-
+            for import_path, is_nested in import_paths:
                 # test for shallow matches
                 test_path = os.path.join(import_path, v)
                 if os.path.isfile(test_path):
                     object_names[k] = test_path
                     break
 
-                # go deep
-                matcher = wcmatch.WcMatch(import_path, '*.psc', flags=wcmatch.IGNORECASE | wcmatch.RECURSIVE)
-
-                flag = False
+                if is_nested:
+                    continue
 
-                for f in matcher.imatch():
-                    if endswith(f, os.path.basename(v), ignorecase=True):
-                        object_names[k] = f
-                        flag = True
-                        break
+                # go deep
+                if import_path not in import_indexes:
+                    import_indexes[import_path] = self._index_script_paths(import_path)
 
-                if flag:
+                deep_path = import_indexes[import_path].get(os.path.basename(v).casefold())
+                if deep_path:
+                    object_names[k] = deep_path
                     break
 
+        # scripts node entries are not scanned, so unchanged scripts are removed after resolving paths
+        if self.changed_paths is not None:
+            object_names = {k: v for k, v in object_names.items()
+                            if PathHelper.get_canonical_path(v) in self.changed_paths}
+
         PapyrusProject.log.info(f'{len(object_names)} unique script paths resolved to absolute paths.')
 
         return object_names
 
+    def _index_script_paths(self, import_path: str) -> dict:
+        """Returns dictionary of script paths in import path keyed by case-folded file name"""
+        results: dict = {}
+
+        matcher = IgnoreMatcher(import_path, '*.psc',
+                                flags=wcmatch.IGNORECASE | wcmatch.RECURSIVE,
+                                ignore_rules=self.ignore_rules)
+
+        for script_path in matcher.imatch():
+            results.setdefault(os.path.basename(script_path).casefold(), script_path)
+
+        return results
+
     def _get_remote_path(self, node: etree.ElementBase) -> str:
         import_path: str = node.text
 
@@ -544,11 +713,9 @@ class PapyrusProject(ProjectBase):
                         if not startswith(message, 'Failed to load'):
                             PapyrusProject.log.info(message)
                         else:
-                            PapyrusProject.log.error(message)
-                            sys.exit(1)
+                            raise RemoteError(message)
             except PermissionError as e:
-                PapyrusProject.log.error(e)
-                sys.exit(1)
+                raise RemoteError(str(e)) from e
 
         if endswith(import_path, '.git', ignorecase=True):
             url_path = self.remote.create_local_path(import_path[:-4])
@@ -569,9 +736,61 @@ class PapyrusProject(ProjectBase):
         if is_namespace_path(node):
             node.text = node.text.replace(':', os.sep)
 
+    def _find_script_paths_once(self, folder_path: str, no_recurse: bool, scanned_roots: dict, seen_paths: set) -> typing.Generator:
+        """Yields script paths from folder unless the physical folder or script was already scanned"""
+        canonical_root = PathHelper.get_canonical_path(folder_path)
+
+        for scanned_root, scanned_no_recurse in scanned_roots.items():
+            if scanned_root == canonical_root and no_recurse:
+                return
+            if not scanned_no_recurse and PathHelper.is_contained_in(canonical_root, scanned_root):
+                return
+
+        scanned_roots[canonical_root] = no_recurse
+
+        canonical_dirs: dict = {}
+
+        if self.changed_paths is not None:
+            script_paths: typing.Iterable = self._filter_changed_paths(canonical_root, no_recurse)
+        else:
+            script_paths = PathHelper.find_script_paths_from_folder(folder_path,
+                                                                    no_recurse=no_recurse,
+                                                                    ignore_rules=self.ignore_rules)
+
+        for script_path in script_paths:
+            dir_path, file_name = os.path.split(script_path)
+
+            if dir_path not in canonical_dirs:
+                canonical_dirs[dir_path] = PathHelper.get_canonical_path(dir_path)
+
+            key = os.path.join(canonical_dirs[dir_path], os.path.normcase(file_name))
+            if key in seen_paths:
+                continue
+            seen_paths.add(key)
+
+            yield script_path
+
+    def _filter_changed_paths(self, canonical_root: str, no_recurse: bool) -> typing.Generator:
+        """Yields changed script paths in folder without scanning folder"""
+        for canonical_path, changed_path in self.changed_paths.items():  # type: ignore
+            if no_recurse:
+                if os.path.dirname(canonical_path) != canonical_root:
+                    continue
+            elif not PathHelper.is_contained_in(canonical_path, canonical_root):
+                continue
+
+            if self.ignore_rules.is_ignored(changed_path, False, root_path=canonical_root):
+                continue
+
+            yield changed_path
+
     # noinspection DuplicatedCode
     def _get_script_paths_from_folders_node(self) -> typing.Generator:
         """Returns script paths from the Folders element array"""
+        # physical folders scanned so far, mapped to whether they were scanned without recursion
+        scanned_roots: dict = {}
+        seen_paths: set = set()
+
         for folder_node in filter(is_folder_node, self.folders_node):
             self.try_fix_namespace_path(folder_node)
 
@@ -582,14 +801,12 @@ class PapyrusProject(ProjectBase):
             # handle . and .. in path
             if folder_path == os.pardir or startswith(folder_path, os.pardir):
                 folder_path = folder_path.replace(os.pardir, os.path.normpath(os.path.join(self.project_path, os.pardir)), 1)
-                yield from PathHelper.find_script_paths_from_folder(folder_path,
-                                                                    no_recurse=attr_no_recurse)
+                yield from self._find_script_paths_once(folder_path, attr_no_recurse, scanned_roots, seen_paths)
                 continue
 
             if folder_path == os.curdir or startswith(folder_path, os.curdir):
                 folder_path = folder_path.replace(os.curdir, self.project_path, 1)
-                yield from PathHelper.find_script_paths_from_folder(folder_path,
-                                                                    no_recurse=attr_no_recurse)
+                yield from self._find_script_paths_once(folder_path, attr_no_recurse, scanned_roots, seen_paths)
                 continue
 
             if startswith(folder_path, self.remote_schemas, ignorecase=True):
@@ -597,24 +814,21 @@ class PapyrusProject(ProjectBase):
                 PapyrusProject.log.info(f'Adding import path from remote: "{local_path}"...')
                 self.import_paths.insert(0, local_path)
                 PapyrusProject.log.info(f'Adding folder path from remote: "{local_path}"...')
-                yield from PathHelper.find_script_paths_from_folder(local_path,
-                                                                    no_recurse=attr_no_recurse)
+                yield from self._find_script_paths_once(local_path, attr_no_recurse, scanned_roots, seen_paths)
                 continue
 
             folder_path = os.path.normpath(folder_path)
 
             # try to add absolute path
             if os.path.isabs(folder_path) and os.path.isdir(folder_path):
-                yield from PathHelper.find_script_paths_from_folder(folder_path,
-                                                                    no_recurse=attr_no_recurse)
+                yield from self._find_script_paths_once(folder_path, attr_no_recurse, scanned_roots, seen_paths)
                 continue
 
             # try to add import-relative folder path
             for import_path in self.import_paths:
                 test_path = os.path.join(import_path, folder_path)
                 if os.path.isdir(test_path):
-                    yield from PathHelper.find_script_paths_from_folder(test_path,
-                                                                        no_recurse=attr_no_recurse)
+                    yield from self._find_script_paths_once(test_path, attr_no_recurse, scanned_roots, seen_paths)
 
     # noinspection DuplicatedCode
     def _get_script_paths_from_scripts_node(self) -> typing.Generator:
@@ -625,8 +839,7 @@ class PapyrusProject(ProjectBase):
             script_path: str = script_node.text
 
             if script_path == os.pardir or script_path == os.curdir:
-                PapyrusProject.log.error(f'Script path at line {script_node.sourceline} in project file is not a file path')
-                sys.exit(1)
+                raise ProjectError(f'Script path at line {script_node.sourceline} in project file is not a file path')
 
             # handle . and .. in path
             if startswith(script_path, os.pardir):
@@ -635,8 +848,7 @@ class PapyrusProject(ProjectBase):
                 script_path = script_path.replace(os.curdir, self.project_path, 1)
 
             if os.path.isdir(script_path):
-                PapyrusProject.log.error(f'Script path at line {script_node.sourceline} in project file is not a file path')
-                sys.exit(1)
+                raise ProjectError(f'Script path at line {script_node.sourceline} in project file is not a file path')
 
             yield os.path.normpath(script_path)
 
@@ -664,8 +876,7 @@ class PapyrusProject(ProjectBase):
             try:
                 header = PexReader.get_header(matching_path)
             except ValueError:
-                PapyrusProject.log.error(f'Cannot determine compilation time due to unknown magic: "{matching_path}"')
-                sys.exit(1)
+                raise ProjectError(f'Cannot determine compilation time due to unknown magic: "{matching_path}"')
 
             compiled_time: int = header.compilation_time.value
             if os.path.getmtime(script_path) < compiled_time:
@@ -676,7 +887,7 @@ class PapyrusProject(ProjectBase):
 
         return psc_paths
 
-    def build_commands(self) -> tuple[int, list]:
+    def build_commands(self, config: BuildConfig) -> tuple[int, list]:
         """
         Builds list of commands for compiling scripts
         """
@@ -684,7 +895,7 @@ class PapyrusProject(ProjectBase):
 
         arguments = CommandArguments()
 
-        if self.options.no_incremental_build:
+        if config.no_incremental_build:
             psc_paths: dict = self.psc_paths
         else:
             psc_paths = self._try_exclude_unmodified_scripts()
@@ -698,16 +909,18 @@ class PapyrusProject(ProjectBase):
         if psc_paths is None or psc_paths == {}:
             return 0, []
 
-        if endswith(self.get_compiler_path(), 'Caprica.exe', ignorecase=True):
-            arguments.append(self.get_compiler_path(), enquote_value=True)
+        import_paths: str = ';'.join(config.import_paths)
+
+        if config.using_caprica:
+            arguments.append(config.compiler_path, enquote_value=True)
 
             object_names = ';'.join(psc_paths.keys())
 
-            with open(self.get_compiler_config_path(), encoding='utf-8') as f:
+            with open(config.compiler_config_path, encoding='utf-8') as f:
                 options = f.read().splitlines()
 
             # disable parallel compilation if the user overrides the default
-            if self.options.no_parallel and 'parallel-compile=1' in options:
+            if config.no_parallel and 'parallel-compile=1' in options:
                 for i, option in enumerate(options):
                     if startswith(option, 'parallel-compile', ignorecase=True):
                         options.pop(i)
@@ -719,7 +932,7 @@ class PapyrusProject(ProjectBase):
                 use_config_file_for_input_paths = True
                 options.append(f'input-file={object_names.strip()}\n')
 
-            config_dir_path = os.path.dirname(self.get_compiler_config_path())
+            config_dir_path = os.path.dirname(config.compiler_config_path)
             config_file_path = os.path.join(config_dir_path, f'caprica_{str(int(time.time()))}.cfg')
 
             with open(config_file_path, mode='w', encoding='utf-8') as f:
@@ -729,41 +942,42 @@ class PapyrusProject(ProjectBase):
 
             # caprica defaults to starfield
             game_name = 'starfield'
-            if self.options.game_type == GameType.FO4:
+            if config.game_type == GameType.FO4:
                 game_name = 'fallout4'
-            elif self.options.game_type in [GameType.TES5, GameType.SSE]:
+            elif config.game_type in [GameType.TES5, GameType.SSE]:
                 game_name = 'skyrim'
 
             arguments.append(game_name, key='g', enquote_value=True)
 
-            arguments.append(self.get_flags_path(), key='f', enquote_value=True)
-            arguments.append(';'.join(self.import_paths), key='i', enquote_value=True)
-            arguments.append(self.get_output_path(), key='o', enquote_value=True)
+            arguments.append(config.flags_path, key='f', enquote_value=True)
+            arguments.append(import_paths, key='i', enquote_value=True)
+            arguments.append(config.output_path, key='o', enquote_value=True)
 
             if not use_config_file_for_input_paths:
                 arguments.append(object_names, enquote_value=True)
 
+            commands.append(arguments.join())
+
         else:
             for object_name, script_path in psc_paths.items():
                 arguments.clear()
-                arguments.append(self.get_compiler_path(), enquote_value=True)
-                arguments.append(object_name if self.options.game_type == GameType.FO4 else script_path, enquote_value=True)
-                arguments.append(self.get_flags_path(), key='f', enquote_value=True)
-                arguments.append(';'.join(self.import_paths), key='i', enquote_value=True)
-                arguments.append(self.get_output_path(), key='o', enquote_value=True)
-
-                if self.options.game_type in [GameType.FO4, GameType.SF1]:
-                    if self.release:
+                arguments.append(config.compiler_path, enquote_value=True)
+                arguments.append(object_name if config.game_type == GameType.FO4 else script_path, enquote_value=True)
+                arguments.append(config.flags_path, key='f', enquote_value=True)
+                arguments.append(import_paths, key='i', enquote_value=True)
+                arguments.append(config.output_path, key='o', enquote_value=True)
+
+                if config.game_type in [GameType.FO4, GameType.SF1]:
+                    if config.release:
                         arguments.append('-release')
 
-                    if self.final:
+                    if config.final:
                         arguments.append('-final')
 
-                if self.optimize:
+                if config.optimize:
                     arguments.append('-op')
 
-        arg_s = arguments.join()
-        commands.append(arg_s)
+                commands.append(arguments.join())
 
         return len(psc_paths.keys()), commands
 
@@ -1,3 +1,4 @@
+import functools
 import os
 from typing import (Generator,
                     Iterable,
@@ -9,6 +10,9 @@ from wcmatch import wcmatch
 
 from pyro.Comparators import (endswith,
                               startswith)
+from pyro.IgnoreMatcher import IgnoreMatcher
+from pyro.IgnoreRules import IgnoreRules
+from pyro.PathTrie import PathTrie
 
 
 class PathHelper:
@@ -33,29 +37,65 @@ class PathHelper:
     @staticmethod
     def calculate_relative_object_name(script_path: str, import_paths: list) -> str:
         """Returns import-relative path from absolute path"""
-        # reverse the list to find the best import path
-        file_name = os.path.basename(script_path)
+        return PathHelper.calculate_relative_object_names([script_path], import_paths)[script_path]
 
-        for import_path in reversed(PathHelper.uniqify(import_paths)):
-            if not os.path.isabs(import_path):
-                import_path = os.path.join(os.getcwd(), import_path)
+    @staticmethod
+    def calculate_relative_object_names(script_paths: Iterable, import_paths: list) -> dict:
+        """Returns import-relative paths from absolute paths, keyed by absolute path"""
+        trie: PathTrie = PathHelper._get_import_path_trie(tuple(import_paths), os.getcwd())
 
-            import_path = os.path.normpath(import_path)
+        results: dict = {}
 
-            if len(script_path) > len(import_path) and startswith(script_path, import_path, ignorecase=True):
-                file_name = script_path[len(import_path):]
-                if file_name[0] == '\\' or file_name[0] == '/':
-                    file_name = file_name[1:]
-                break
+        for script_path in script_paths:
+            # the deepest import path containing the script is the best import path
+            import_path, object_name = trie.find_longest_prefix(script_path)
+            results[script_path] = object_name if import_path else os.path.basename(script_path)
 
-        return file_name
+        return results
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _get_import_path_trie(import_paths: tuple, cwd: str) -> PathTrie:
+        """Returns trie of absolute import paths (cached because import paths rarely change during a build)"""
+        return PathTrie(os.path.join(cwd, import_path) if not os.path.isabs(import_path) else import_path
+                        for import_path in import_paths)
+
+    @staticmethod
+    def get_canonical_path(path: str) -> str:
+        """Returns case-normalized real path with symbolic links resolved"""
+        return os.path.normcase(os.path.realpath(path))
 
     @staticmethod
-    def find_script_paths_from_folder(root_dir: str, *, no_recurse: bool, matcher: Optional[wcmatch.WcMatch] = None) -> Generator:
+    def get_physical_key(path: str) -> tuple:
+        """Returns key identifying the physical file or directory at path"""
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return PathHelper.get_canonical_path(path), 0
+
+        # some file systems do not report inode numbers
+        if not stat.st_ino:
+            return PathHelper.get_canonical_path(path), 0
+
+        return stat.st_dev, stat.st_ino
+
+    @staticmethod
+    def is_contained_in(canonical_path: str, canonical_root: str) -> bool:
+        """Returns True if canonical path is the canonical root or a descendant of the canonical root"""
+        if canonical_path == canonical_root:
+            return True
+        try:
+            return os.path.commonpath([canonical_path, canonical_root]) == canonical_root
+        except ValueError:  # paths on different drives
+            return False
+
+    @staticmethod
+    def find_script_paths_from_folder(root_dir: str, *, no_recurse: bool, matcher: Optional[wcmatch.WcMatch] = None,
+                                      ignore_rules: Optional[IgnoreRules] = None) -> Generator:
         """Yields existing script paths starting from absolute folder path"""
         if not matcher:
             user_flags = wcmatch.RECURSIVE if not no_recurse else 0x0
-            matcher = wcmatch.WcMatch(root_dir, '*.psc', flags=wcmatch.IGNORECASE | user_flags)
+            matcher = IgnoreMatcher(root_dir, '*.psc', flags=wcmatch.IGNORECASE | user_flags, ignore_rules=ignore_rules)
         for script_path in matcher.imatch():
             yield script_path
 
@@ -64,6 +104,21 @@ class PathHelper:
         """Returns ordered list without duplicates"""
         return list(dict.fromkeys(items))
 
+    @staticmethod
+    def uniqify_paths(paths: Iterable) -> list:
+        """Returns ordered list of paths without paths that resolve to the same physical directory"""
+        results: list = []
+        keys: set = set()
+
+        for path in paths:
+            key = PathHelper.get_physical_key(path)
+            if key in keys:
+                continue
+            keys.add(key)
+            results.append(path)
+
+        return results
+
     @staticmethod
     def url2pathname(url_path: str) -> str:
         """Returns normalized unquoted path from URL"""
@@ -0,0 +1,49 @@
+import os
+from typing import Iterable, Optional
+
+
+class PathTrie:
+    """
+    Case-insensitive trie of path components for longest-prefix lookups
+    """
+    def __init__(self, paths: Iterable = ()) -> None:
+        self._root: dict = {}
+
+        for path in paths:
+            self.insert(path)
+
+    @staticmethod
+    def _split(path: str) -> list:
+        return os.path.normpath(path).split(os.sep)
+
+    def insert(self, path: str) -> None:
+        """Adds path to trie"""
+        node = self._root
+        for part in self._split(path):
+            node = node.setdefault(part.casefold(), {})
+        # None cannot collide with a path component
+        node[None] = path
+
+    def find_longest_prefix(self, path: str) -> tuple:
+        """
+        Returns (prefix, remainder) where prefix is the longest path in trie containing path
+
+        Returns empty prefix and path if no path in trie contains path. The remainder is never empty.
+        """
+        parts: list = self._split(path)
+
+        node = self._root
+        prefix, depth = '', 0
+
+        for i, part in enumerate(parts[:-1], 1):
+            child: Optional[dict] = node.get(part.casefold())
+            if child is None:
+                break
+            node = child
+            if None in node:
+                prefix, depth = node[None], i
+
+        if not prefix:
+            return '', path
+
+        return prefix, os.sep.join(parts[depth:])
@@ -0,0 +1,60 @@
+from dataclasses import (dataclass,
+                         field)
+
+
+@dataclass
+class CompressionTypeData:
+    file_count: int = 0
+    stored_count: int = 0
+    size: int = 0
+    written_size: int = 0
+    time: float = 0.0
+
+
+@dataclass
+class CompressionData:
+    """
+    Sizes and compression times of file data written to packages, grouped by file type
+
+    Files whose data is shared with another file in the same package are not counted.
+    """
+    types: dict = field(init=False, default_factory=dict)
+
+    def add(self, extension: str, size: int, written_size: int, time: float, *, stored: bool, new_file: bool = True) -> None:
+        """Adds block of file data, where new file is False for later chunks of a file"""
+        data = self.types.setdefault(extension or '(none)', CompressionTypeData())
+
+        if new_file:
+            data.file_count += 1
+            data.stored_count += int(stored)
+
+        data.size += size
+        data.written_size += written_size
+        data.time += time
+
+    def update(self, other: 'CompressionData') -> None:
+        for extension, other_data in other.types.items():
+            data = self.types.setdefault(extension, CompressionTypeData())
+            data.file_count += other_data.file_count
+            data.stored_count += other_data.stored_count
+            data.size += other_data.size
+            data.written_size += other_data.written_size
+            data.time += other_data.time
+
+    @staticmethod
+    def format_size(size: int) -> str:
+        return f'{size / 1024 / 1024:.2f} MiB' if size >= 1024 * 1024 else f'{size / 1024:.1f} KiB'
+
+    def to_strings(self) -> list:
+        results: list = ['Compression by file type:']
+
+        # types that take longest to compress are listed first
+        for extension, data in sorted(self.types.items(), key=lambda item: (-item[1].time, item[0])):
+            ratio = data.written_size / data.size if data.size else 1.0
+            saved = data.size - data.written_size
+
+            results.append(f'  {extension}: {data.file_count} files ({data.stored_count} stored), '
+                           f'{self.format_size(data.size)} -> {self.format_size(data.written_size)} ({ratio:.1%}), '
+                           f'saved {self.format_size(saved)} in {data.time:.3f}s')
+
+        return results
@@ -1,6 +1,7 @@
 from dataclasses import (dataclass,
                          field)
 
+from pyro.Performance.CompressionData import CompressionData
 from pyro.TimeElapsed import TimeElapsed
 
 
@@ -8,6 +9,9 @@ from pyro.TimeElapsed import TimeElapsed
 class PackageData:
     time: TimeElapsed = field(init=False, default_factory=TimeElapsed)
     file_count: int = field(init=False, default_factory=int)
+    rebuilt_count: int = field(init=False, default_factory=int)
+    skipped_count: int = field(init=False, default_factory=int)
+    compression: CompressionData = field(init=False, default_factory=CompressionData)
 
     def __post_init__(self) -> None:
         self.time = TimeElapsed()
@@ -17,4 +21,5 @@ class PackageData:
                               for t in (self.time.value(), self.time.average(self.file_count)))
 
         return f'Package time: ' \
-               f'{raw_time} ({avg_time}/file, {self.file_count} files)'
+               f'{raw_time} ({avg_time}/file, {self.file_count} files, ' \
+               f'{self.rebuilt_count} packages rebuilt, {self.skipped_count} skipped)'
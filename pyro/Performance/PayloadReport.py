@@ -0,0 +1,123 @@
+import json
+import os
+import typing
+from dataclasses import (dataclass,
+                         field)
+
+from pyro.Performance.CompressionData import CompressionData
+
+
+@dataclass
+class PayloadReport:
+    """
+    Analysis of the files written to a package or zip file
+
+    Files are recorded as (archive path, size, content hash). Compression data is only available for archives
+    that were written in this build by native writers or zip files, so skipped and BSArch packages report sizes only.
+    """
+    kind: str
+    path: str
+    files: list = field(init=False, default_factory=list)
+    stages: dict = field(init=False, default_factory=dict)
+    compression: CompressionData = field(init=False, default_factory=CompressionData)
+    skipped: bool = field(init=False, default_factory=bool)
+
+    LARGEST_FILE_COUNT: typing.ClassVar[int] = 10
+
+    def add_stage(self, name: str, seconds: float) -> None:
+        self.stages[name] = self.stages.get(name, 0.0) + seconds
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size, _ in self.files)
+
+    @property
+    def output_size(self) -> int:
+        try:
+            return os.path.getsize(self.path)
+        except OSError:
+            return 0
+
+    def get_largest_files(self) -> list:
+        """Returns (archive path, size) of the largest files, largest first"""
+        files = sorted(self.files, key=lambda file: (-file[1], file[0].casefold()))
+        return [(path, size) for path, size, _ in files[:PayloadReport.LARGEST_FILE_COUNT]]
+
+    def get_duplicates(self) -> list:
+        """Returns (size, archive paths) for each group of files with identical content, largest waste first"""
+        groups: dict = {}
+        for path, size, content_hash in self.files:
+            if content_hash:
+                groups.setdefault(content_hash, (size, []))[1].append(path)
+
+        duplicates = [(size, sorted(paths, key=str.casefold)) for size, paths in groups.values() if len(paths) > 1]
+        return sorted(duplicates, key=lambda group: (-group[0] * (len(group[1]) - 1), group[1][0].casefold()))
+
+    def get_extensions(self) -> dict:
+        """Returns file count and size by extension, with written size and time where compression data exists"""
+        results: dict = {}
+
+        for path, size, _ in self.files:
+            extension = os.path.splitext(path.replace('\\', '/'))[1].casefold() or '(none)'
+            data = results.setdefault(extension, {'files': 0, 'size': 0})
+            data['files'] += 1
+            data['size'] += size
+
+        for extension, data in self.compression.types.items():
+            if extension in results:
+                results[extension].update({
+                    'stored': data.stored_count,
+                    'written_size': data.written_size,
+                    'ratio': round(data.written_size / data.size, 4) if data.size else 1.0,
+                    'time': round(data.time, 6)
+                })
+
+        return dict(sorted(results.items(), key=lambda item: (-item[1]['size'], item[0])))
+
+    def to_dict(self) -> dict:
+        return {
+            'kind': self.kind,
+            'path': self.path,
+            'skipped': self.skipped,
+            'file_count': len(self.files),
+            'size': self.size,
+            'output_size': self.output_size,
+            'stages': {name: round(seconds, 6) for name, seconds in self.stages.items()},
+            'largest_files': [{'path': path, 'size': size} for path, size in self.get_largest_files()],
+            'extensions': self.get_extensions(),
+            'duplicates': [{'size': size, 'paths': paths} for size, paths in self.get_duplicates()]
+        }
+
+    def to_strings(self) -> list:
+        format_size = CompressionData.format_size
+
+        status = ', skipped' if self.skipped else ''
+        results: list = [f'Payload of "{os.path.basename(self.path)}" ({self.kind}, {len(self.files)} files, '
+                         f'{format_size(self.size)} -> {format_size(self.output_size)}{status}):']
+
+        results.append('  Stages: ' + ', '.join(f'{name} {seconds:.3f}s' for name, seconds in self.stages.items()))
+
+        results.append('  Largest files:')
+        for path, size in self.get_largest_files():
+            results.append(f'    {format_size(size):>12}  {path}')
+
+        results.append('  Extensions:')
+        for extension, data in self.get_extensions().items():
+            line = f'    {extension:<12} {data["files"]:>6} files {format_size(data["size"]):>12}'
+            if 'written_size' in data:
+                line += f' -> {format_size(data["written_size"]):>12} ({data["ratio"]:.1%}, {data["stored"]} stored) in {data["time"]:.3f}s'
+            results.append(line)
+
+        duplicates: list = self.get_duplicates()
+        if duplicates:
+            results.append('  Duplicate content:')
+            for size, paths in duplicates:
+                results.append(f'    {len(paths)} files of {format_size(size)}: ' + ', '.join(f'"{path}"' for path in paths))
+
+        return results
+
+    @staticmethod
+    def dump(reports: list, path: str) -> None:
+        """Writes reports to path as JSON"""
+        with open(path, mode='w', encoding='utf-8') as f:
+            json.dump({'reports': [report.to_dict() for report in reports]}, f, indent=2)
@@ -1,12 +1,24 @@
 import binascii
+import datetime
+import glob
 import json
 import os
+from typing import (Generator,
+                    Iterable)
 
+from pyro.Constants import GameType
 from pyro.PexHeader import PexHeader
 from pyro.PexTypes import PexInt, PexStr
 
 
 class PexReader:
+    # game ids written by the compilers
+    game_types: dict = {
+        1: GameType.TES5,
+        2: GameType.FO4,
+        4: GameType.SF1
+    }
+
     @staticmethod
     def get_header(path: str) -> PexHeader:
         header = PexHeader()
@@ -55,3 +67,59 @@ class PexReader:
                 header[key][k] = ' '.join(bytes2hex[i:i + 2] for i in range(0, len(bytes2hex), 2))
 
         return json.dumps(header, indent=4)
+
+    @staticmethod
+    def get_record(path: str) -> dict:
+        """Returns header fields as plain values, or path and error if the header cannot be read"""
+        try:
+            header = PexReader.get_header(path)
+
+            # fields past the end of a truncated file are read as empty, so the header is shorter than its sizes add up to
+            expected_size = 22 + header.script_path_size.value + header.user_name_size.value + header.computer_name_size.value
+            if header.size < expected_size:
+                raise ValueError(f'Cannot read truncated header in "{path}"')
+
+            compilation_time = datetime.datetime.fromtimestamp(header.compilation_time.value, datetime.timezone.utc)
+        except (OSError, ValueError, OverflowError) as e:
+            return {'path': path, 'error': str(e)}
+
+        return {
+            'path': path,
+            'game': PexReader.game_types.get(header.game_id.value, None),
+            'game_id': header.game_id.value,
+            'major_version': header.major_version.value,
+            'minor_version': header.minor_version.value,
+            'compilation_time': compilation_time.strftime('%Y-%m-%dT%H:%M:%SZ'),
+            'script_path': header.script_path.value,
+            'user_name': header.user_name.value,
+            'computer_name': header.computer_name.value
+        }
+
+    @staticmethod
+    def find_pex_paths(path: str) -> Generator:
+        """Yields paths to pex files in folder and subfolders, or matching glob pattern"""
+        if os.path.isdir(path):
+            for dir_path, dir_names, file_names in os.walk(path):
+                dir_names.sort()
+                for file_name in sorted(file_names):
+                    if file_name.casefold().endswith('.pex'):
+                        yield os.path.join(dir_path, file_name)
+            return
+
+        for file_path in glob.iglob(path, recursive=True):
+            if file_path.casefold().endswith('.pex') and os.path.isfile(file_path):
+                yield file_path
+
+    @staticmethod
+    def iter_records(paths: Iterable, worker_limit: int) -> Generator:
+        """Yields records for paths in order, reading headers in parallel when worker limit is greater than 1"""
+        if worker_limit <= 1:
+            yield from map(PexReader.get_record, paths)
+            return
+
+        # imported here because projects read pex headers without ever needing a pool
+        import multiprocessing
+
+        # headers are tiny, so large chunks keep inter-process overhead below the cost of opening files
+        with multiprocessing.Pool(processes=worker_limit) as pool:
+            yield from pool.imap(PexReader.get_record, paths, chunksize=64)
@@ -55,7 +55,7 @@ class ProcessManager:
                                        shell=True,
                                        cwd=cwd,
                                        env=env)
-        except WindowsError as e:
+        except OSError as e:
             ProcessManager.log.error(f'Cannot create process because: {e.strerror}')
             return ProcessState.FAILURE
 
@@ -86,7 +86,7 @@ class ProcessManager:
                                        stdout=subprocess.PIPE,
                                        stderr=subprocess.STDOUT,
                                        universal_newlines=True)
-        except WindowsError as e:
+        except OSError as e:
             ProcessManager.log.error(f'Cannot create process because: {e.strerror}')
             return ProcessState.FAILURE
 
@@ -155,7 +155,7 @@ class ProcessManager:
                                        stdout=subprocess.PIPE,
                                        stderr=subprocess.STDOUT,
                                        universal_newlines=True)
-        except WindowsError as e:
+        except OSError as e:
             ProcessManager.log.error(f'Cannot create process because: {e.strerror}')
             return ProcessState.FAILURE
 
@@ -3,11 +3,13 @@ import os
 import sys
 from typing import Union
 
+from pyro.BuildConfig import BuildConfig
 from pyro.Comparators import (endswith,
                               startswith)
 from pyro.Constants import (FlagsName,
                             GameName,
                             GameType)
+from pyro.Exceptions import ProjectError
 from pyro.ProjectOptions import ProjectOptions
 from pyro.StringTemplate import StringTemplate
 
@@ -17,13 +19,13 @@ class ProjectBase:
 
     options: ProjectOptions
 
-    variables: dict = {}
+    variables: dict
 
     program_path: str = ''
     project_name: str = ''
     project_path: str = ''
 
-    import_paths: list = []
+    import_paths: list
 
     final: bool = False
     optimize: bool = False
@@ -32,6 +34,9 @@ class ProjectBase:
     def __init__(self, options: ProjectOptions) -> None:
         self.options = options
 
+        self.variables = {}
+        self.import_paths = []
+
         self.program_path = os.path.dirname(__file__)
         if endswith(sys.argv[0], ('pyro', '.exe')):
             self.program_path = os.path.abspath(os.path.join(self.program_path, os.pardir))
@@ -42,7 +47,7 @@ class ProjectBase:
 
     def __setattr__(self, key: str, value: object) -> None:
         if isinstance(value, str) and endswith(key, 'path'):
-            if os.altsep in value:
+            if os.altsep and os.altsep in value:
                 value = os.path.normpath(value)
         elif isinstance(value, list) and endswith(key, 'paths'):
             value = [os.path.normpath(path) if path != os.curdir else path for path in value]
@@ -73,8 +78,7 @@ class ProjectBase:
                 retval = os.path.normpath(retval)
             return retval
         except KeyError as e:
-            ProjectBase.log.error(f'Failed to parse variable "{e.args[0]}" in "{value}". Is the variable name correct?')
-            sys.exit(1)
+            raise ProjectError(f'Failed to parse variable "{e.args[0]}" in "{value}". Is the variable name correct?')
 
     # build arguments
     def get_worker_limit(self) -> int:
@@ -200,15 +204,13 @@ class ProjectBase:
             registry_key = winreg.OpenKey(registry_type, key_head, 0, winreg.KEY_READ)
             reg_value, _ = winreg.QueryValueEx(registry_key, key_tail)
             winreg.CloseKey(registry_key)
-        except WindowsError:
-            ProjectBase.log.error(f'Installed Path for {game_type} '
-                                  f'does not exist in Windows Registry. Run the game launcher once, then try again.')
-            sys.exit(1)
+        except OSError:
+            raise ProjectError(f'Installed Path for {game_type} '
+                               f'does not exist in Windows Registry. Run the game launcher once, then try again.')
 
         # noinspection PyUnboundLocalVariable
         if not os.path.isdir(reg_value):
-            ProjectBase.log.error(f'Installed Path for {game_type} does not exist: {reg_value}')
-            sys.exit(1)
+            raise ProjectError(f'Installed Path for {game_type} does not exist: {reg_value}')
 
         return reg_value
 
@@ -307,8 +309,79 @@ class ProjectBase:
 
         raise AssertionError('Cannot determine game type from game path, registry path, import paths, or flags path')
 
+    def get_cache_path(self) -> str:
+        """Returns absolute cache path from arguments"""
+        return self._get_path(self.options.cache_path,
+                              relative_root_path=os.getcwd(),
+                              fallback_path=[self.program_path, 'cache'])
+
     def get_log_path(self) -> str:
         """Returns absolute log path from arguments"""
         return self._get_path(self.options.log_path,
                               relative_root_path=os.getcwd(),
                               fallback_path=[self.program_path, 'logs'])
+
+    def get_build_config(self) -> BuildConfig:
+        """
+        Resolves paths and settings from arguments and returns them as an immutable snapshot
+
+        Options are updated with the resolved values. Later values can depend on earlier ones (e.g., the default
+        compiler path depends on the game path), so the order of resolution matters.
+        """
+        options = self.options
+
+        options.worker_limit = self.get_worker_limit()
+        options.game_type = self.get_game_type()
+
+        try:
+            options.game_path = self.get_game_path(options.game_type)
+        except FileNotFoundError:
+            # projects that only create packages or zip files do not need a game path
+            options.game_path = ''
+
+        options.registry_path = self.get_registry_path()
+        options.compiler_path = self.get_compiler_path()
+        options.compiler_config_path = self.get_compiler_config_path()
+        options.flags_path = self.get_flags_path()
+        options.output_path = self.get_output_path()
+        options.bsarch_path = self.get_bsarch_path()
+        options.package_path = self.get_package_path()
+        options.temp_path = self.get_temp_path()
+        options.zip_output_path = self.get_zip_output_path()
+        options.remote_temp_path = self.get_remote_temp_path()
+        options.cache_path = self.get_cache_path()
+        options.log_path = self.get_log_path()
+
+        return BuildConfig(input_path=options.input_path,
+                           project_path=self.project_path,
+                           program_path=self.program_path,
+                           game_type=options.game_type,
+                           game_path=options.game_path,
+                           registry_path=options.registry_path,
+                           compiler_path=options.compiler_path,
+                           compiler_config_path=options.compiler_config_path,
+                           flags_path=options.flags_path,
+                           output_path=options.output_path,
+                           import_paths=tuple(self.import_paths),
+                           using_caprica=endswith(options.compiler_path, 'Caprica.exe', ignorecase=True),
+                           optimize=self.optimize,
+                           release=self.release,
+                           final=self.final,
+                           worker_limit=options.worker_limit,
+                           ignore_errors=options.ignore_errors,
+                           no_incremental_build=options.no_incremental_build,
+                           no_parallel=options.no_parallel,
+                           anonymize=options.anonymize,
+                           package=options.package,
+                           zip=options.zip,
+                           bsarch_path=options.bsarch_path,
+                           native_packager=options.native_packager or sys.platform != 'win32',
+                           verify_packages=options.verify_packages,
+                           package_path=options.package_path,
+                           temp_path=options.temp_path,
+                           zip_compression=options.zip_compression,
+                           zip_output_path=options.zip_output_path,
+                           remote_temp_path=options.remote_temp_path,
+                           cache_path=options.cache_path,
+                           log_path=options.log_path,
+                           report_path=options.report_path)
@@ -0,0 +1,224 @@
+import logging
+import os
+
+from pyro.BuildFacade import BuildFacade
+from pyro.BuildResult import BuildResult
+from pyro.Enums.Event import (Event,
+                              BuildEvent,
+                              ImportEvent,
+                              CompileEvent,
+                              AnonymizeEvent,
+                              PackageEvent,
+                              ZipEvent)
+from pyro.Exceptions import (CompileError,
+                             PackageError,
+                             ProjectError)
+from pyro.PapyrusProject import PapyrusProject
+from pyro.Performance.PayloadReport import PayloadReport
+from pyro.ProjectOptions import ProjectOptions
+
+
+class ProjectBuilder:
+    """
+    Runs every build phase for one project and returns the result
+
+    Builders hold no state between builds, so one process can build any number of projects in sequence.
+    Options are updated while building, so each build needs its own ProjectOptions.
+    Errors are raised as PyroError subclasses instead of exiting the process.
+    """
+    log: logging.Logger = logging.getLogger('pyro')
+
+    def __init__(self, options: ProjectOptions) -> None:
+        self.options = options
+        self.options.input_path = os.path.abspath(self.options.input_path)
+
+        # projects change the working directory, so relative paths from the caller are resolved now
+        if self.options.dump_config_path:
+            self.options.dump_config_path = os.path.abspath(self.options.dump_config_path)
+
+        if self.options.report_path:
+            self.options.report_path = os.path.abspath(self.options.report_path)
+
+    @staticmethod
+    def _validate_project_file(ppj: PapyrusProject) -> None:
+        if ppj.imports_node is None and \
+                (ppj.scripts_node is not None or ppj.folders_node is not None):
+            raise ProjectError('Cannot proceed without imports defined in project')
+
+        if ppj.options.package and ppj.packages_node is None:
+            raise ProjectError('Cannot proceed with Package enabled without Packages defined in project')
+
+        if ppj.options.zip and ppj.zip_files_node is None:
+            raise ProjectError('Cannot proceed with Zip enabled without ZipFile defined in project')
+
+    @staticmethod
+    def _validate_project_paths(ppj: PapyrusProject) -> None:
+        compiler_path = ppj.get_compiler_path()
+        if not compiler_path or not os.path.isfile(compiler_path):
+            raise ProjectError('Cannot proceed without compiler path')
+
+        flags_path = ppj.get_flags_path()
+        if not flags_path:
+            raise ProjectError('Cannot proceed without flags path')
+
+        if not ppj.options.game_type:
+            raise ProjectError('Cannot determine game type from arguments or Papyrus Project')
+
+        if not os.path.isabs(flags_path) and \
+                not any([os.path.isfile(os.path.join(import_path, flags_path)) for import_path in ppj.import_paths]):
+            raise ProjectError('Cannot proceed without flags file in any import folder')
+
+    def build(self) -> BuildResult:
+        """
+        Builds project and returns the result
+
+        The working directory is restored afterward because projects resolve relative paths against their own folder.
+        """
+        working_path = os.getcwd()
+
+        try:
+            return self._build()
+        finally:
+            os.chdir(working_path)
+
+    @staticmethod
+    def _run_event(ppj: PapyrusProject, build: BuildFacade, event: Event) -> None:
+        """Runs event and clears matched includes, since event commands can add or remove included files"""
+        ppj.try_run_event(event)
+        build.include_cache.clear()
+
+    def _build(self) -> BuildResult:
+        ppj = PapyrusProject(self.options)
+
+        self._validate_project_file(ppj)
+
+        if ppj.scripts_node is not None or ppj.folders_node is not None or ppj.remote_paths:
+            ppj.try_initialize_remotes()
+
+            if ppj.use_pre_import_event:
+                ppj.try_run_event(ImportEvent.PRE)
+
+            ppj.try_populate_imports()
+
+            if ppj.use_post_import_event:
+                ppj.try_run_event(ImportEvent.POST)
+
+            ppj.try_set_game_type()
+            ppj.find_missing_scripts()
+            ppj.try_set_game_path()
+
+            self._validate_project_paths(ppj)
+
+            ProjectBuilder.log.info('Imports found:')
+            for path in ppj.import_paths:
+                ProjectBuilder.log.info(f'+ "{path}"')
+
+            ProjectBuilder.log.info('Scripts found:')
+            for _, path in ppj.psc_paths.items():
+                ProjectBuilder.log.info(f'+ "{path}"')
+
+        build = BuildFacade(ppj)
+
+        if self.options.dump_config_path:
+            build.config.dump(self.options.dump_config_path)
+            ProjectBuilder.log.info(f'Wrote resolved configuration: "{self.options.dump_config_path}"')
+
+        # bsarch path is not resolved until BuildFacade initializes
+        if build.config.package and not build.config.native_packager and not os.path.isfile(build.config.bsarch_path):
+            raise PackageError('Cannot proceed with Package enabled without valid BSArch path')
+
+        if ppj.use_pre_build_event:
+            self._run_event(ppj, build, BuildEvent.PRE)
+
+        if build.scripts_count > 0:
+            if ppj.use_pre_compile_event:
+                self._run_event(ppj, build, CompileEvent.PRE)
+
+            build.try_compile()
+
+            if ppj.use_post_compile_event:
+                self._run_event(ppj, build, CompileEvent.POST)
+
+            if ppj.options.anonymize:
+                if build.get_compile_data().failed_count == 0 or ppj.options.ignore_errors:
+                    if ppj.use_pre_anonymize_event:
+                        self._run_event(ppj, build, AnonymizeEvent.PRE)
+
+                    build.try_anonymize()
+
+                    if ppj.use_post_anonymize_event:
+                        self._run_event(ppj, build, AnonymizeEvent.POST)
+                else:
+                    raise CompileError(f'Cannot anonymize scripts because {build.get_compile_data().failed_count} scripts failed to compile',
+                                       exit_code=build.get_compile_data().failed_count)
+            else:
+                ProjectBuilder.log.info('Cannot anonymize scripts because Anonymize is disabled in project')
+
+        if ppj.options.package:
+            if build.get_compile_data().failed_count == 0 or ppj.options.ignore_errors:
+                if ppj.use_pre_package_event:
+                    self._run_event(ppj, build, PackageEvent.PRE)
+
+                build.try_pack()
+
+                if ppj.use_post_package_event:
+                    self._run_event(ppj, build, PackageEvent.POST)
+            else:
+                raise CompileError(f'Cannot create Packages because {build.get_compile_data().failed_count} scripts failed to compile',
+                                   exit_code=build.get_compile_data().failed_count)
+        elif ppj.packages_node is not None:
+            ProjectBuilder.log.info('Cannot create Packages because Package is disabled in project')
+
+        if ppj.options.zip:
+            if build.get_compile_data().failed_count == 0 or ppj.options.ignore_errors:
+                if ppj.use_pre_zip_event:
+                    self._run_event(ppj, build, ZipEvent.PRE)
+
+                build.try_zip()
+
+                if ppj.use_post_zip_event:
+                    self._run_event(ppj, build, ZipEvent.POST)
+            else:
+                raise CompileError(f'Cannot create ZipFile because {build.get_compile_data().failed_count} scripts failed to compile',
+                                   exit_code=build.get_compile_data().failed_count)
+        elif ppj.zip_files_node is not None:
+            ProjectBuilder.log.info('Cannot create ZipFile because Zip is disabled in project')
+
+        if build.scripts_count > 0:
+            ProjectBuilder.log.info(build.get_compile_data().to_string() if build.get_compile_data().success_count > 0 else 'No scripts were compiled.')
+
+        if ppj.packages_node is not None:
+            ProjectBuilder.log.info(build.package_data.to_string() if build.package_data.file_count > 0 else 'No files were packaged.')
+
+            # only packages written by native writers report compression
+            if build.package_data.compression.types:
+                for line in build.package_data.compression.to_strings():
+                    ProjectBuilder.log.info(line)
+
+        if ppj.zip_files_node is not None:
+            ProjectBuilder.log.info(build.zipping_data.to_string() if build.zipping_data.file_count > 0 else 'No files were zipped.')
+
+        if build.config.report_path:
+            for report in build.reports:
+                for line in report.to_strings():
+                    ProjectBuilder.log.info(line)
+
+            try:
+                PayloadReport.dump(build.reports, build.config.report_path)
+                ProjectBuilder.log.info(f'Wrote payload report: "{build.config.report_path}"')
+            except OSError as e:
+                ProjectBuilder.log.error(f'Cannot write payload report: {e}')
+
+        ProjectBuilder.log.info('DONE!')
+
+        if ppj.use_post_build_event and build.get_compile_data().failed_count == 0:
+            self._run_event(ppj, build, BuildEvent.POST)
+
+        result = BuildResult(self.options.input_path)
+        result.config = build.config
+        result.scripts_count = build.scripts_count
+        result.compile_data = build.get_compile_data()
+        result.package_data = build.package_data
+        result.zipping_data = build.zipping_data
+
+        return result
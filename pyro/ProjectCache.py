@@ -0,0 +1,107 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import typing
+
+
+class ProjectCache:
+    """
+    Stores fully resolved projects keyed by everything that can change how a project resolves
+    """
+    log: logging.Logger = logging.getLogger('pyro')
+
+    # references expanded by os.path.expandvars on any platform
+    env_var_pattern: re.Pattern = re.compile(r'\$(\w+)|\$\{([^}]*)\}|%([^%]*)%')
+
+    # references whose values change on every run
+    volatile_var_pattern: re.Pattern = re.compile(r'@\{?UNIXTIME\b', flags=re.IGNORECASE)
+
+    def __init__(self, cache_path: str) -> None:
+        self.cache_path: str = os.path.join(cache_path, 'projects')
+
+    @staticmethod
+    def is_cacheable(text: str) -> bool:
+        """Returns False if text references variables whose values change on every run"""
+        return ProjectCache.volatile_var_pattern.search(text) is None
+
+    @staticmethod
+    def get_key(data: bytes, values: dict) -> str:
+        """Returns key from raw project data, the environment variables it references, and other values"""
+        text: str = data.decode('utf-8', errors='replace')
+
+        env_vars: dict = {}
+
+        for source in (text, *values.values()):
+            for match in ProjectCache.env_var_pattern.finditer(source):
+                name = next(group for group in match.groups() if group is not None)
+                env_vars[name] = os.environ.get(name, '')
+
+        if '~' in text or any('~' in value for value in values.values()):
+            env_vars['~'] = os.path.expanduser('~')
+
+        key_data = json.dumps({'values': values, 'env': env_vars}, sort_keys=True).encode('utf-8')
+
+        return hashlib.sha256(data + b'\0' + key_data).hexdigest()
+
+    @staticmethod
+    def get_stamp(data: bytes, schema_path: str) -> str:
+        """Returns stamp identifying raw project data and the schema it is validated against"""
+        schema_stat = os.stat(schema_path)
+        schema_data = f'{schema_path}|{schema_stat.st_size}|{schema_stat.st_mtime_ns}'.encode('utf-8')
+        return hashlib.sha256(data + b'\0' + schema_data).hexdigest()
+
+    def _get_entry_path(self, input_path: str, extension: str = '.json') -> str:
+        file_name = hashlib.sha1(os.path.normcase(input_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_path, f'{file_name}{extension}')
+
+    def has_stamp(self, input_path: str, stamp: str) -> bool:
+        """Returns True if stamp matches the last stamp saved for project"""
+        try:
+            with open(self._get_entry_path(input_path, '.validated'), encoding='utf-8') as f:
+                return f.read().strip() == stamp
+        except OSError:
+            return False
+
+    def save_stamp(self, input_path: str, stamp: str) -> None:
+        """Saves stamp for project, replacing any existing stamp"""
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+            with open(self._get_entry_path(input_path, '.validated'), mode='w', encoding='utf-8') as f:
+                f.write(stamp)
+        except OSError as e:
+            ProjectCache.log.warning(f'Cannot write validation stamp: {e}')
+
+    def load(self, input_path: str, key: str) -> typing.Optional[dict]:
+        """Returns cached data for project if key matches, otherwise None"""
+        entry_path = self._get_entry_path(input_path)
+
+        if not os.path.isfile(entry_path):
+            return None
+
+        try:
+            with open(entry_path, encoding='utf-8') as f:
+                entry: dict = json.load(f)
+        except (OSError, ValueError):
+            return None
+
+        if entry.get('key') != key:
+            return None
+
+        return entry.get('data')
+
+    def save(self, input_path: str, key: str, data: dict) -> None:
+        """Stores data for project under key, replacing any existing data for project"""
+        entry_path = self._get_entry_path(input_path)
+
+        try:
+            os.makedirs(self.cache_path, exist_ok=True)
+
+            # write to temporary file first so that concurrent builds never read a partial entry
+            temp_path = f'{entry_path}.{os.getpid()}.tmp'
+            with open(temp_path, mode='w', encoding='utf-8') as f:
+                json.dump({'key': key, 'data': data}, f)
+            os.replace(temp_path, entry_path)
+        except OSError as e:
+            ProjectCache.log.warning(f'Cannot write project cache: {e}')
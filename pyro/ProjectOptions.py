@@ -16,6 +16,7 @@ class ProjectOptions:
     input_path: str = field(init=False, default_factory=str)
 
     # build arguments
+    changed_since: str = field(init=False, default_factory=str)
     ignore_errors: bool = field(init=False, default_factory=bool)
     no_implicit_imports: bool = field(init=False, default_factory=bool)
     no_incremental_build: bool = field(init=False, default_factory=bool)
@@ -29,11 +30,14 @@ class ProjectOptions:
 
     # compiler arguments
     compiler_path: str = field(init=False, default_factory=str)
+    compiler_config_path: str = field(init=False, default_factory=str)
     flags_path: str = field(init=False, default_factory=str)
     output_path: str = field(init=False, default_factory=str)
 
     # bsarch arguments
     bsarch_path: str = field(init=False, default_factory=str)
+    native_packager: bool = field(init=False, default_factory=bool)
+    verify_packages: bool = field(init=False, default_factory=bool)
     package_path: str = field(init=False, default_factory=str)
     temp_path: str = field(init=False, default_factory=str)
 
@@ -47,8 +51,13 @@ class ProjectOptions:
     remote_temp_path: str = field(init=False, default_factory=str)
 
     # program arguments
+    cache_path: str = field(init=False, default_factory=str)
+    dump_config_path: str = field(init=False, default_factory=str)
+    report_path: str = field(init=False, default_factory=str)
     log_path: str = field(init=False, default_factory=str)
+    no_cache: bool = field(init=False, default_factory=bool)
     create_project: bool = field(init=False, default_factory=bool)
+    force_validation: bool = field(init=False, default_factory=bool)
     resolve_project: bool = field(init=False, default_factory=bool)
 
     def __post_init__(self) -> None:
@@ -62,7 +71,7 @@ class ProjectOptions:
     def __setattr__(self, key: str, value: object) -> None:
         if value and isinstance(value, str):
             # sanitize paths
-            if endswith(key, 'path', ignorecase=True) and os.altsep in value:
+            if endswith(key, 'path', ignorecase=True) and os.altsep and os.altsep in value:
                 value = os.path.normpath(value)
             if key in ('game_type', 'zip_compression'):
                 value = value.casefold()
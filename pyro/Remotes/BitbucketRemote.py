@@ -1,6 +1,5 @@
 import json
 import os
-import sys
 import urllib.error
 from http import HTTPStatus
 from typing import Generator
@@ -23,12 +22,12 @@ class BitbucketRemote(RemoteBase):
         except urllib.error.HTTPError as e:
             status: HTTPStatus = HTTPStatus(e.code)
             yield 'Failed to load remote: "%s" (%s %s)' % (request_url, e.code, status.phrase)
-            sys.exit(1)
+            return
 
         if response.status != 200:
             status: HTTPStatus = HTTPStatus(response.status)  # type: ignore
             yield 'Failed to load remote: "%s" (%s %s)' % (request_url, response.status, status.phrase)
-            sys.exit(1)
+            return
 
         payload: dict = json.loads(response.read().decode('utf-8'))
 
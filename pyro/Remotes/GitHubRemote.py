@@ -2,7 +2,6 @@ import hashlib
 import json
 import multiprocessing
 import os
-import sys
 import urllib.error
 from http import HTTPStatus
 from typing import (Generator,
@@ -46,12 +45,12 @@ class GitHubRemote(RemoteBase):
         except urllib.error.HTTPError as e:
             status: HTTPStatus = HTTPStatus(e.code)
             yield 'Failed to load remote: "%s" (%s %s)' % (request_url.url, e.code, status.phrase)
-            sys.exit(1)
+            return
 
         if response.status != 200:
             status: HTTPStatus = HTTPStatus(response.status)  # type: ignore
             yield 'Failed to load remote: "%s" (%s %s)' % (request_url.url, response.status, status.phrase)
-            sys.exit(1)
+            return
 
         payload_objects: Union[dict, list] = json.loads(response.read().decode('utf-8'))
 
@@ -0,0 +1,139 @@
+import errno
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+
+import psutil
+
+
+class StagingFolder:
+    """
+    Unique temporary folder that mirrors files for external tools without copying them where possible
+
+    Files are hard linked, cloned (reflinks on filesystems that support FICLONE), or symlinked before
+    falling back to copying. A method that fails because the filesystem does not support it is not tried again.
+
+    Usage: staging = StagingFolder(temp_path); staging.add(source_path, relpath); ...; staging.remove()
+    """
+    log: logging.Logger = logging.getLogger('pyro')
+
+    PREFIX: str = 'pyro-'
+
+    HARDLINK: str = 'hardlink'
+    REFLINK: str = 'reflink'
+    SYMLINK: str = 'symlink'
+    COPY: str = 'copy'
+
+    # linux/fs.h: _IOW(0x94, 9, int)
+    FICLONE: int = 0x40049409
+
+    # errors that mean a method is unsupported for this pair of folders, rather than for one file
+    UNSUPPORTED_ERRNOS: tuple = (errno.EXDEV, errno.EPERM, errno.EACCES, errno.ENOTSUP, errno.EOPNOTSUPP,
+                                 errno.EINVAL, errno.ENOTTY, errno.EMLINK)
+
+    def __init__(self, parent_path: str) -> None:
+        os.makedirs(parent_path, exist_ok=True)
+
+        # process id in the name lets later builds remove folders left behind by builds that were killed
+        self.path: str = tempfile.mkdtemp(prefix=f'{StagingFolder.PREFIX}{os.getpid()}-', dir=parent_path)
+
+        self.methods: list = [StagingFolder.HARDLINK, StagingFolder.SYMLINK, StagingFolder.COPY]
+        if sys.platform.startswith('linux'):
+            self.methods.insert(1, StagingFolder.REFLINK)
+
+        self.counts: dict = dict.fromkeys(self.methods, 0)
+
+    @staticmethod
+    def _reflink(source_path: str, target_path: str) -> None:
+        if sys.platform != 'win32':
+            import fcntl
+
+            with open(source_path, mode='rb') as source, open(target_path, mode='wb') as target:
+                try:
+                    fcntl.ioctl(target.fileno(), StagingFolder.FICLONE, source.fileno())
+                except OSError:
+                    target.close()
+                    os.remove(target_path)
+                    raise
+
+            shutil.copystat(source_path, target_path)
+        else:
+            raise NotImplementedError('Cannot clone files on Windows')
+
+    def _stage(self, method: str, source_path: str, target_path: str) -> None:
+        if method == StagingFolder.HARDLINK:
+            os.link(source_path, target_path)
+        elif method == StagingFolder.REFLINK:
+            self._reflink(source_path, target_path)
+        elif method == StagingFolder.SYMLINK:
+            os.symlink(source_path, target_path)
+        else:
+            shutil.copy2(source_path, target_path)
+
+    def add(self, source_path: str, relpath: str) -> str:
+        """Mirrors source file at relative path in staging folder and returns method used"""
+        target_path = os.path.join(self.path, relpath)
+        os.makedirs(os.path.dirname(target_path), exist_ok=True)
+
+        # later includes replace earlier includes with the same path
+        if os.path.lexists(target_path):
+            os.remove(target_path)
+
+        source_path = os.path.abspath(source_path)
+
+        for method in list(self.methods):
+            if method == StagingFolder.COPY:
+                break
+
+            try:
+                self._stage(method, source_path, target_path)
+            except (OSError, NotImplementedError) as e:
+                if getattr(e, 'errno', None) in (None, *StagingFolder.UNSUPPORTED_ERRNOS):
+                    StagingFolder.log.debug(f'Cannot stage files with {method}, trying next method: {e}')
+                    self.methods.remove(method)
+                continue
+
+            self.counts[method] += 1
+            return method
+
+        shutil.copy2(source_path, target_path)
+        self.counts[StagingFolder.COPY] += 1
+        return StagingFolder.COPY
+
+    def remove(self) -> threading.Thread:
+        """Removes staging folder in a background thread, which finishes before the interpreter exits"""
+        StagingFolder.log.debug(f'Staged files: {", ".join(f"{k}={v}" for k, v in self.counts.items() if v)}')
+        return StagingFolder.remove_paths([self.path])
+
+    @staticmethod
+    def remove_paths(paths: list) -> threading.Thread:
+        """Removes folders in a background thread"""
+        def _remove() -> None:
+            for path in paths:
+                shutil.rmtree(path, ignore_errors=True)
+
+        thread = threading.Thread(target=_remove, name='pyro-staging-cleanup')
+        thread.start()
+        return thread
+
+    @staticmethod
+    def remove_stale(parent_path: str) -> None:
+        """Removes staging folders left behind by processes that are no longer running, in a background thread"""
+        if not os.path.isdir(parent_path):
+            return
+
+        stale_paths: list = []
+
+        for entry in os.scandir(parent_path):
+            if not entry.is_dir(follow_symlinks=False) or not entry.name.startswith(StagingFolder.PREFIX):
+                continue
+
+            pid = entry.name[len(StagingFolder.PREFIX):].split('-', 1)[0]
+            if pid.isdigit() and int(pid) != os.getpid() and not psutil.pid_exists(int(pid)):
+                stale_paths.append(entry.path)
+
+        if stale_paths:
+            StagingFolder.remove_paths(stale_paths)
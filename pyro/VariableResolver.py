@@ -0,0 +1,32 @@
+import graphlib
+
+from pyro.StringTemplate import StringTemplate
+
+
+class VariableResolver:
+    @staticmethod
+    def get_references(value: str) -> list:
+        """Returns names of variables referenced in value"""
+        results: list = []
+
+        for match in StringTemplate.pattern.finditer(value):
+            name = match.group('named') or match.group('braced')
+            if name and name not in results:
+                results.append(name)
+
+        return results
+
+    @staticmethod
+    def get_order(variables: dict) -> list:
+        """
+        Returns names of variables ordered so that each variable follows the variables it references
+
+        References to names that are not variables are ignored. Raises graphlib.CycleError if variables
+        reference each other in a cycle, where the second argument of the error is the list of names in the cycle.
+        """
+        graph: dict = {}
+
+        for key, value in variables.items():
+            graph[key] = [name for name in VariableResolver.get_references(value) if name in variables]
+
+        return list(graphlib.TopologicalSorter(graph).static_order())
@@ -7,6 +7,9 @@ from lxml import etree
 
 
 class XmlHelper:
+    # compiled schemas keyed by (schema path, last modified time) for reuse within the process
+    _schemas: dict = {}
+
     @staticmethod
     def strip_xml_comments(path: str) -> io.StringIO:
         with open(path, encoding='utf-8') as f:
@@ -16,13 +19,26 @@ class XmlHelper:
         return io.StringIO(xml_document)
 
     @staticmethod
-    def validate_schema(namespace: str, program_path: str) -> typing.Optional[etree.XMLSchema]:
+    def get_schema_path(namespace: str, program_path: str) -> str:
         if not namespace:
-            return None
+            return ''
 
         schema_path = os.path.join(program_path, namespace)
         if not os.path.isfile(schema_path):
             raise FileExistsError(f'Schema file does not exist: "{schema_path}"')
 
-        schema = etree.parse(schema_path)
-        return etree.XMLSchema(schema)
+        return schema_path
+
+    @staticmethod
+    def validate_schema(namespace: str, program_path: str) -> typing.Optional[etree.XMLSchema]:
+        schema_path = XmlHelper.get_schema_path(namespace, program_path)
+        if not schema_path:
+            return None
+
+        key = (schema_path, os.stat(schema_path).st_mtime_ns)
+
+        if key not in XmlHelper._schemas:
+            schema = etree.parse(schema_path)
+            XmlHelper._schemas[key] = etree.XMLSchema(schema)
+
+        return XmlHelper._schemas[key]
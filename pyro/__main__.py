@@ -21,13 +21,19 @@ if __name__ == '__main__':
     _required_arguments_flex.add_argument('input_path', nargs='?',
                                           action='store', type=str,
                                           help='relative or absolute path to file\n'
-                                               '(if relative, must be relative to current working directory)')
+                                               '(if relative, must be relative to current working directory)\n'
+                                               '(folders and glob patterns dump pex files as JSON Lines)\n'
+                                               '(bsa and ba2 files dump file tables as JSON Lines)')
     # deprecated argument format (retained to avoid breaking change)
     _required_arguments_flex.add_argument('-i', '--input-path', dest='input_path_deprecated',
                                           action='store', type=str,
                                           help=SUPPRESS)
 
     _build_arguments = _parser.add_argument_group('build arguments')
+    _build_arguments.add_argument('--changed-since',
+                                  action='store', type=str,
+                                  help='only build scripts changed since git ref\n'
+                                       '(skips scanning folders for unchanged scripts)')
     _build_arguments.add_argument('--ignore-errors',
                                   action='store_true', default=False,
                                   help='ignore compiler errors during build')
@@ -85,6 +91,13 @@ if __name__ == '__main__':
                                    action='store', type=str,
                                    help='relative or absolute path to bsarch.exe\n'
                                         '(if relative, must be relative to current working directory)')
+    _bsarch_arguments.add_argument('--native-packager',
+                                   action='store_true', default=False,
+                                   help='create packages without bsarch.exe\n'
+                                        '(default on platforms other than Windows)')
+    _bsarch_arguments.add_argument('--verify-packages',
+                                   action='store_true', default=False,
+                                   help='verify package contents against includes after packaging')
     _bsarch_arguments.add_argument('--package-path',
                                    action='store', type=str,
                                    help='relative or absolute path to bsa/ba2 output folder\n'
@@ -121,11 +134,29 @@ if __name__ == '__main__':
     _project_arguments.add_argument('--create-project',
                                     action='store_true',
                                     help='generate project from current directory')
+    _project_arguments.add_argument('--force-validation',
+                                    action='store_true',
+                                    help='validate project file against schema even if unchanged')
     _project_arguments.add_argument('--resolve-project',
                                     action='store_true',
                                     help='resolve variables and paths in project file')
 
     _program_arguments = _parser.add_argument_group('program arguments')
+    _program_arguments.add_argument('--cache-path',
+                                    action='store', type=str,
+                                    help='relative or absolute path to cache folder\n'
+                                         '(if relative, must be relative to current working directory)')
+    _program_arguments.add_argument('--no-cache',
+                                    action='store_true', default=False,
+                                    help='do not read or write cached project data')
+    _program_arguments.add_argument('--dump-config', dest='dump_config_path',
+                                    action='store', type=str,
+                                    help='write resolved build configuration to JSON file\n'
+                                         '(if relative, must be relative to current working directory)')
+    _program_arguments.add_argument('--payload-report', dest='report_path',
+                                    action='store', type=str,
+                                    help='write analysis of package and zip file contents to JSON file\n'
+                                         '(if relative, must be relative to current working directory)')
     _program_arguments.add_argument('--log-level', dest='log_level',
                                     action='store', type=str, default='debug',
                                     choices=('all', 'debug', 'info', 'warn', 'error', 'fatal'),